@@ -4,9 +4,19 @@ from unrealsdk import *
 from Mods import ModMenu
 from Mods.ModMenu import ClientMethod, ServerMethod
 
-from random import getrandbits
-
-from typing import Dict, Generator, Iterable, List, Optional, Tuple, Union
+import cProfile
+import csv
+import hashlib
+import json
+import os
+from collections import defaultdict, deque
+from itertools import islice
+from pstats import Stats
+from random import Random
+from time import perf_counter, strftime
+from types import GeneratorType
+
+from typing import Dict, Generator, Iterable, List, Optional, Set, TextIO, Tuple, Union
 
 try:
     from Mods import CommandExtensions
@@ -14,6 +24,16 @@ except ImportError:
     CommandExtensions = None
 
 
+_timings: Dict[str, float] = {"import": 0.0, "Enable": 0.0, "loot": 0.0, "Disable": 0.0, "restore": 0.0}
+"""
+The time in seconds spent importing the mod, in its most recent Enable, in constructing our loot
+behavior, in its most recent Disable, and in restoring pawns after it, for reporting how long our
+startup and teardown work takes.
+"""
+_import_started: float = perf_counter()
+"""When the import of the mod began."""
+
+
 """
 TODO: Consistent Giant health scaling
     Check pawn balance aiclass overrides?
@@ -125,14 +145,245 @@ _ai_badass_overrides: Dict[str, bool] = {
     "CharClass_Darkness": True, # The Darkness
     "CharClass_Mimic": True, # Mimic
 }
-""" """
+"""
+AIClassDefinition names whose pawns should (or should not) be deemed badasses, regardless of whether
+their balance definition says they are champions.
+"""
 
-_ai_attributes: Tuple[UObject] = (
-    FindObject("AttributeDefinition", "GD_Balance_HealthAndDamage.AIParameters.Attribute_HealthMultiplier"),
-    FindObject("AttributeDefinition", "GD_Balance_HealthAndDamage.AIParameters.Attribute_EnemyShieldMaxValueMultiplier"),
-    FindObject("AttributeDefinition", "GD_Balance_Experience.Attributes.Attribute_ExperienceMultiplier"),
-)
-"""A list of AttributeDefinitions that key starting values we modify on Giants' AI classes."""
+
+class rollstream:
+    """
+    The source of our rolls for Gigantism. It is seeded on its own rather than sharing the `random`
+    module's state, such that other mods drawing from that cannot sway our rolls, and such that the
+    same seed yields the same rolls for the same pawns. Random bytes are drawn _ROLL_BUFFER_SIZE at
+    a time, and each roll takes the next of them.
+    """
+
+    __slots__ = ("seed", "generator", "buffer", "position")
+
+    seed: int
+    """The seed the stream was last started from."""
+    generator: Random
+    """The generator the stream draws its bytes from."""
+    buffer: bytes
+    """The bytes drawn from the generator."""
+    position: int
+    """The position in the buffer of the next roll."""
+
+    def __init__(self) -> None:
+        self.reseed(None)
+
+
+    def reseed(self, seed: Optional[int]) -> None:
+        """Start the stream over from the given seed, or from a fresh one if none is given."""
+        self.seed = int.from_bytes(os.urandom(4), "little") if seed is None else seed
+        self.generator = Random(self.seed)
+        self.buffer = b""
+        self.position = 0
+
+
+    def roll(self) -> int:
+        """Return the next random byte, drawing more from the generator if we have used them all."""
+        position = self.position
+        if position == len(self.buffer):
+            self.buffer = self.generator.getrandbits(8 * _ROLL_BUFFER_SIZE).to_bytes(_ROLL_BUFFER_SIZE, "little")
+            position = 0
+        self.position = position + 1
+        return self.buffer[position]
+
+
+_ROLL_BUFFER_SIZE: int = 256
+"""The number of random bytes our roll stream draws at a time."""
+
+_rolls: rollstream = rollstream()
+"""The source of our rolls for Gigantism."""
+
+
+class aiclass:
+    """
+    The decisions we make for pawns of a given AIClassDefinition, compiled from the above lists, so
+    that each can be made with a single lookup of the AIClassDefinition's name.
+    """
+
+    __slots__ = ("rolls", "bequeaths", "drops_loot", "badass", "floor", "ceiling", "badass_favored")
+
+    rolls: bool
+    """Whether the class's pawns may roll as Giants."""
+    bequeaths: bool
+    """Whether the class's pawns pass on Gigantism to their child pawns."""
+    drops_loot: bool
+    """Whether the class's pawns drop loot on death."""
+    badass: Optional[bool]
+    """Whether the class's pawns are deemed badasses, or None to go by their balance definitions."""
+    floor: int
+    """Rolls below this select the class's pawns as Giants, badass or not."""
+    ceiling: int
+    """Rolls at or above this select none of the class's pawns."""
+    badass_favored: bool
+    """
+    Whether the rolls between the floor and ceiling select the class's badass pawns, rather than
+    the rest of its pawns.
+    """
+
+    def __init__(self, name: Optional[str]):
+        self.rolls = name not in _ai_roll_blacklist
+        self.bequeaths = name in _ai_bequeath_whitelist
+        self.drops_loot = name not in _ai_loot_blacklist
+        self.badass = _ai_badass_overrides.get(name)
+
+        # Should the class's pawns all be deemed badasses or not, only one of its thresholds applies.
+        threshold, badass_threshold = _odds.thresholds(name)
+        if self.badass is not None:
+            threshold = badass_threshold = badass_threshold if self.badass else threshold
+        self.floor = min(threshold, badass_threshold)
+        self.ceiling = max(threshold, badass_threshold)
+        self.badass_favored = badass_threshold > threshold
+
+
+    @classmethod
+    def named(cls, name: Optional[str]) -> aiclass:
+        """Return the record for the given AIClassDefinition name, compiling it on first sight."""
+        record = _ai_classes.get(name)
+        if record is None:
+            record = _ai_classes[name] = cls(name)
+        return record
+
+
+    @staticmethod
+    def compile() -> None:
+        """
+        Compile the records for every AIClassDefinition name in the above lists, and in our odds
+        table, afresh.
+        """
+        _ai_classes.clear()
+        for name in (*_ai_roll_blacklist, *_ai_bequeath_whitelist, *_ai_loot_blacklist, *_ai_badass_overrides, *_odds.names()):
+            aiclass.named(name)
+
+
+_ai_classes: Dict[Optional[str], aiclass] = {}
+"""The compiled records for each AIClassDefinition name we have encountered."""
+
+
+class oddstable:
+    """
+    The odds of pawns rolling as Giants, as configured in the file at _odds_path, should it exist.
+    Odds are given as the chance of a pawn being selected, along with the chance of a badass pawn
+    being selected, either of which may be given for every pawn, for the pawns of an AIClass, for
+    the pawns of a map, or for the pawns of an AIClass in a map, the more specific taking precedence:
+
+        {
+            "chance": 0.0039, "badass_chance": 0.0156,
+            "classes": {"CharClass_Bugmorph": {"chance": 0.01}},
+            "maps": {"Grass_P": {"badass_chance": 0.05, "classes": {"CharClass_Bullymong": {"chance": 0.1}}}}
+        }
+
+    Rolls being a single byte, chances are rounded to the nearest 1/256, into thresholds that rolls
+    must fall below. The file is read when we are enabled, and read again on level changes should
+    it have been modified since; the odds for the current map are then compiled into the records
+    for each AIClass, such that rolls need not consult this table.
+    """
+
+    __slots__ = ("modified", "entries", "map_name")
+
+    modified: Optional[float]
+    """The modification time of the file when we last read it, or None if there was no file."""
+    entries: Dict[str, Any]
+    """The contents of the file."""
+    map_name: str
+    """The lowercase name of the map we are compiling odds for."""
+
+    def __init__(self) -> None:
+        self.modified = None
+        self.entries = {"maps": {}}
+        self.map_name = ""
+
+
+    def update(self, map_name: str) -> bool:
+        """
+        Note the map being played, and read the file again should it have been modified since we last
+        did. Returns whether the odds for the map may differ from those last compiled.
+        """
+        map_name = map_name.lower()
+        refreshed = self.refresh()
+        maps = self.entries["maps"]
+        changed = map_name != self.map_name and (map_name in maps or self.map_name in maps)
+        self.map_name = map_name
+        return refreshed or changed
+
+
+    def refresh(self) -> bool:
+        """Read the file again should it have been modified since we last did, returning whether it was."""
+        try:
+            modified = os.stat(_odds_path).st_mtime
+        except OSError:
+            modified = None
+        if modified == self.modified:
+            return False
+
+        if modified is None:
+            self.modified = None
+            self.entries = {"maps": {}}
+            return True
+
+        def check(entry: Any, allowed: Tuple[str, ...]) -> None:
+            if not isinstance(entry, dict):
+                raise ValueError(f"expected an object, not {entry!r}")
+            for key, value in entry.items():
+                if key not in allowed:
+                    raise ValueError(f"unexpected key {key!r}")
+                if key in ("chance", "badass_chance") and (not isinstance(value, (int, float)) or not 0 <= value <= 1):
+                    raise ValueError(f"{key} must be a number from 0 to 1, not {value!r}")
+            for name in ("classes", "maps"):
+                nested_entries = entry.get(name, {})
+                if not isinstance(nested_entries, dict):
+                    raise ValueError(f"{name} must be an object, not {nested_entries!r}")
+                for nested in nested_entries.values():
+                    check(nested, ("chance", "badass_chance", "classes") if name == "maps" else ("chance", "badass_chance"))
+
+        try:
+            with open(_odds_path) as file:
+                entries = json.load(file)
+            check(entries, ("chance", "badass_chance", "classes", "maps"))
+        except (OSError, ValueError) as error:
+            # Leave the modification time as it was, so that we try the file again next time.
+            Log(f"Reign Of Giants Odds: Could not read {_odds_path}, keeping the previous odds: {error}")
+            return False
+
+        self.modified = modified
+        entries["maps"] = {name.lower(): entry for name, entry in entries.get("maps", {}).items()}
+        self.entries = entries
+        return True
+
+
+    def names(self) -> Tuple[str, ...]:
+        """The names of the AIClasses we have odds for in the current map."""
+        map_entry = self.entries["maps"].get(self.map_name, {})
+        return (*self.entries.get("classes", ()), *map_entry.get("classes", ()))
+
+
+    def thresholds(self, name: Optional[str]) -> Tuple[int, int]:
+        """Return the thresholds for pawns of the given AIClass, and for its badass pawns, in the current map."""
+        chance, badass_chance = _ODDS_DEFAULT
+        map_entry = self.entries["maps"].get(self.map_name, {})
+        for entry in (
+            self.entries,
+            self.entries.get("classes", {}).get(name, {}),
+            map_entry,
+            map_entry.get("classes", {}).get(name, {}),
+        ):
+            chance = entry.get("chance", chance)
+            badass_chance = entry.get("badass_chance", badass_chance)
+        return round(chance * 256), round(badass_chance * 256)
+
+
+_ODDS_DEFAULT: Tuple[float, float] = (1 / 256, 4 / 256)
+"""The chances of a pawn, and of a badass pawn, being selected as a Giant, unless configured otherwise."""
+
+_odds_path: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "giantsodds.json")
+"""The file in which the odds of pawns rolling as Giants may be configured."""
+
+_odds: oddstable = oddstable()
+"""The odds of pawns rolling as Giants."""
 
 
 """
@@ -168,12 +419,18 @@ class aipawn:
         # All pawns currently spawned on the map form a linked list with one another, the start of
         # which is accessible from the current world info object.
         pawn = GetEngine().GetCurrentWorldInfo().PawnList
-        while pawn is not None:
-            # If the pawn has an AIClass, we can be sure it is a WillowAIPawn that is of use to us.
-            if pawn.AIClass is not None:
-                yield cls(pawn)
-            # Continue to the next item in the linked list, if any.
-            pawn = pawn.NextPawn
+        visited = 0
+        try:
+            while pawn is not None:
+                visited += 1
+                # If the pawn has an AIClass, we can be sure it is a WillowAIPawn that is of use to us.
+                if pawn.AIClass is not None:
+                    yield cls(pawn)
+                # Continue to the next item in the linked list, if any.
+                pawn = pawn.NextPawn
+        finally:
+            if _stats.enabled:
+                _stats.record("pawns visited per walk", visited)
 
 
     @property
@@ -186,6 +443,12 @@ class aipawn:
         return None if ai_class is None else ai_class.Name
 
 
+    @property
+    def ai_class_record(self) -> aiclass:
+        """The decisions we make for pawns of this pawn's AIClassDefinition."""
+        return aiclass.named(self.ai_class)
+
+
     @property
     def grade_index(self) -> int:
         """
@@ -213,10 +476,13 @@ class aipawn:
     def is_badass(self) -> bool:
         """Whether we deem the pawn to be a badass."""
 
-        # If the pawn has a balance, default to its value; otherwise, default to false. Use the
-        # default if we don't have a specific override for the pawn's AI class.
-        is_champion = False if self.balance is None else self.balance.Champion
-        return _ai_badass_overrides.get(self.ai_class, is_champion)
+        # Use the override for the pawn's AI class if there is one. Otherwise, if the pawn has a
+        # balance, default to its value; otherwise, default to false.
+        badass = self.ai_class_record.badass
+        if badass is not None:
+            return badass
+        balance = self.balance
+        return False if balance is None else balance.Champion
 
 
     def encode_ID(self, ID: int) -> None:
@@ -252,8 +518,8 @@ class aipawn:
     def is_giant(self):
         """Whether the pawn has been selected for Gigantism."""
         record = self.uobject.DebugPawnMarkerInst
-        return record is not None and record.Name == "ReignOfGiants"
-    
+        return record is not None and record.Name.startswith("ReignOfGiants")
+
 
     def initialize_giant(self) -> None:
         """Configure our custom storage object on a WillowAIPawn that was selected for Gigantism."""
@@ -261,10 +527,20 @@ class aipawn:
         # The DebugPawnMarkerInst property on WillowAIPawns takes a UObject, and is not utilized
         # anywhere in the vanilla game. Since it's not utilized in vanilla, We may set it to an
         # object of our own creation, and use that to store data relevant to the Giant.
-        self.uobject.DebugPawnMarkerInst = ConstructObject("KnowledgeRecord", self.uobject, "ReignOfGiants")
+        self.uobject.DebugPawnMarkerInst = _markers.acquire()
         self.should_drop_loot = True
 
 
+    @property
+    def name_list_index(self) -> int:
+        """The index in the name list of the name the pawn displays, or -1 for its default name."""
+        return self.uobject.NameListIndex
+
+    @name_list_index.setter
+    def name_list_index(self, index: int) -> None:
+        self.uobject.NameListIndex = index
+
+
     def roll_gigantism(self, force: bool = False) -> bool:
         """
         Roll whether the given pawn should be a Giant. If so, apply the server-only modifications to
@@ -272,7 +548,7 @@ class aipawn:
         """
 
         # If we are currently a client, do not perform a roll.
-        if GetEngine().GetCurrentWorldInfo().NetMode == 3:
+        if _level.is_client:
             return False
 
         # If the pawn is already selected as a Giant, return it.
@@ -283,37 +559,24 @@ class aipawn:
         mind = self.uobject.MyWillowMind
 
         # If the pawn's AI class is in our blacklist, don't roll gigantism for it.
-        if mind is None or self.ai_class in _ai_roll_blacklist:
+        record = self.ai_class_record
+        if mind is None or not record.rolls:
             return False
 
-        # Unless we are in cheat mode or were told to force a giant, We roll 8 bits (1 in 256) to
-        # determine whether the pawn will be a giant or not.
-        if force or CheatMode.CurrentValue:
-            roll = 0
-        else:
-            roll = getrandbits(8)
-            # No pawns that don't roll 0 through 3 will be selected for gigantism.
-            if roll > 3:
+        # Unless we are in cheat mode or were told to force a giant, We roll a byte to determine
+        # whether the pawn will be a giant or not, against the thresholds for its AI class.
+        if not force and not CheatMode.CurrentValue:
+            roll = _rolls.roll()
+            if roll >= record.ceiling:
+                return False
+            # Rolls between the thresholds select only badasses, or only the rest, as configured.
+            if roll >= record.floor and self.is_badass != record.badass_favored:
                 return False
-
-        # Pawns that roll a zero are eligible for gigantism no matter who they are. Ones who roll a
-        # 0 through 3 are selected if they are a badass enemy.
-        if roll != 0 and not self.is_badass:
-            return False
 
         self.initialize_giant()
 
-        # Clone the pawn's AI class, and update the pawn and its controller with the clone.
-        self.uobject.AIClass = mind.AIClass = mind.CharacterClass = ConstructObject(
-            self.uobject.AIClass.Class, self.uobject, self.uobject.AIClass.Name,
-            Template = self.uobject.AIClass
-        )
-
-        # Iterate over each of the AI class's starting values so that we may modify them.
-        for attribute_starting_value in self.uobject.AIClass.AttributeStartingValues:
-            if attribute_starting_value.Attribute in _ai_attributes:
-                # Each of the starting vales we modify on the AI class, we quadruple.
-                attribute_starting_value.BaseValue.BaseValueScaleConstant *= 4
+        # Update the pawn and its controller with the Giant version of its AI class.
+        self.uobject.AIClass = mind.AIClass = mind.CharacterClass = _level.giant_ai_class(self.uobject)
 
         # Tell our controller to apply the values from the modified class.
         mind.bCharacterClassInitialized = False
@@ -331,6 +594,26 @@ class aipawn:
         self.uobject.MovementSpeedModifier *= 1 + (GiantScale.CurrentValue - 1) * 0.67
 
 
+    @property
+    def is_giant_sized(self) -> bool:
+        """Whether the pawn's mesh is at the size we Gigantize pawns to."""
+        mesh = self.uobject.Mesh
+        return mesh is not None and abs(mesh.Scale3D.X - GiantScale.CurrentValue) < 1e-3
+
+
+    def ungigantize(self):
+        """Shrink the pawn back down from whatever size it was Gigantized to, if any."""
+        mesh = self.uobject.Mesh
+        if mesh is None:
+            return
+
+        scale = mesh.Scale3D.X
+        if scale == 1.0:
+            return
+        mesh.Scale3D = (1.0, 1.0, 1.0)
+        self.uobject.MovementSpeedModifier /= 1 + (scale - 1) * 0.67
+
+
     @property
     def vanilla_name_list_index(self) -> int:
         """
@@ -359,31 +642,61 @@ class aipawn:
             self.uobject.DebugPawnMarkerInst.Active = should
 
 
-    def giant_name(self) -> str:
+    def giant_name(self) -> Optional[str]:
         """Generate the Giant-ized name based on the current vanilla name."""
+        giant_name = self.giant_name_entry()
+        return None if giant_name is None else giant_name[0]
 
-        # If this pawn's balance has not yet been applied, skip it.
-        if self.balance is None:
-            return None
 
-        # The following is a port of GetTargetName.
-        name = None
+    def giant_name_string(self) -> str:
+        """The Giant-ized name in the format of `_array_string`, for placement in a name list."""
+        giant_name = self.giant_name_entry()
+        return _array_string("") if giant_name is None else giant_name[1]
 
-        if -1 < self.vanilla_name_list_index < _vanilla_name_list_length:
-            name = list(_name_list.Names)[self.vanilla_name_list_index]
 
-        # If the pawn is set to display it's parent's name, do so without giant-izing it.
-        elif self.uobject.DisplayParentInfo() and self.uobject.GetParent() is not None:
-            return self.uobject.GetParent().GetTargetName()
+    def giant_name_entry(self) -> Optional[Tuple[str, str]]:
+        """
+        Return the Giant-ized name along with its `_array_string` format. Names are remembered by the
+        values they are generated from, so that Giants sharing those values reuse the same strings.
+        """
+        balance = self.balance
+
+        # If this pawn's balance has not yet been applied, skip it.
+        if balance is None:
+            return None
 
+        uobject = self.uobject
+        index = self.vanilla_name_list_index
+        if not -1 < index < _level.vanilla_name_list_length:
+            index = -1
+
+            # If the pawn is set to display it's parent's name, do so without giant-izing it.
+            if uobject.DisplayParentInfo() and uobject.GetParent() is not None:
+                name = uobject.GetParent().GetTargetName()
+                return None if name is None else (name, _array_string(name))
+
+        master = uobject.PlayerMasterPRI
+        master_name = "" if master is None else master.GetHumanReadableName()
+        transform_type = uobject.TransformType
+
+        key = (index, balance.GetAddress(), transform_type, master_name, GiantPrefix.CurrentValue)
+        giant_name = _level.giant_names.get(key)
+        if giant_name is not None:
+            return giant_name
+
+        # The following is a port of GetTargetName. Our name list may have a write pending, which
+        # must be performed before we read from it.
+        if index != -1:
+            _commands.settle(_name_list, "Names")
+            name = _name_list.Names[index]
         else:
-            if self.uobject.TransformType != 0:
-                name = self.uobject.GetTransformedName()
+            if transform_type != 0:
+                name = uobject.GetTransformedName()
             else:
-                name = self.balance.GetDisplayNameAtGrade(-1)
+                name = balance.GetDisplayNameAtGrade(-1)
 
-            if name is None and self.uobject.AIClass is not None:
-                name = self.uobject.AIClass.DefaultDisplayName
+            if name is None and uobject.AIClass is not None:
+                name = uobject.AIClass.DefaultDisplayName
 
         if name is None:
             return None
@@ -391,12 +704,11 @@ class aipawn:
         # Before we potentially format this name for a pet presentation, prefix it.
         name = f"{GiantPrefix.CurrentValue} {name}"
 
-        if self.uobject.PlayerMasterPRI is not None:
-            masterName = self.uobject.PlayerMasterPRI.GetHumanReadableName()
-            if len(masterName) > 0:
-                name = self.uobject.MasteredDisplayName.replace("%s", masterName).replace("%n", name)
+        if len(master_name) > 0:
+            name = uobject.MasteredDisplayName.replace("%s", master_name).replace("%n", name)
 
-        return name
+        giant_name = _level.giant_names[key] = (name, _array_string(name))
+        return giant_name
 
 
     def bequeath_gigantism(self, child: UObject):
@@ -405,324 +717,2232 @@ class aipawn:
         then dying, ensure the child pawn inherits its Gigantism, and that this pawn won't drop loot
         when it "dies."
         """
-        if self.is_giant and self.ai_class in _ai_bequeath_whitelist:
+        if self.is_giant and self.ai_class_record.bequeaths:
             self.should_drop_loot = False
             type(self)(child).roll_gigantism(force=True)
 
 
     def drop_loot(self) -> None:
         """
-        Drop loot, assuming the pawn is marked to do so, and its AI class is not in our list of ones
-        whose pawns should not.
+        Queue a drop of loot where the pawn is, assuming the pawn is marked to do so, and its AI class
+        is not in our list of ones whose pawns should not.
         """
-        if self.should_drop_loot and self.ai_class not in _ai_loot_blacklist:
-            # Invoke our loot spawning behavior with our UObject as the context.
-            LootBehavior.ApplyBehaviorToContext(self.uobject, (), None, None, None, ())
+        if self.should_drop_loot and self.ai_class_record.drops_loot:
+            _loot_queue.add(self.uobject)
 
 
-"""
-A significant aspect of Reign Of Giants is the adjusting of individual WillowAIPawns to include
-"Giant" in the name displayed to the player. To determine what name is displayed, the game invokes
-GetTargetName on its WillowAIPawn. This function accepts an `out` parameter through which it passes
-the final name. The SDK cannot alter `out` parameters, so instead we must hijack the mechanisms
-accessed in GetTargetName.
+class pawnsnapshot(aipawn):
+    """
+    An aipawn that remembers each field it reads from its WillowAIPawn, so that a pass over the
+    pawns reads each field of each pawn at most once, no matter how many times the pass needs it.
+    Fields are read on first use rather than all up front, as most pawns in a pass are passed over
+    after a read or two. The setters here write through to the WillowAIPawn as well as updating the
+    remembered values; anything else that modifies the pawn leaves the snapshot out of date, so a
+    snapshot should not be kept beyond the pass it was taken for.
+    """
 
-GetTargetName checks a series of conditionals to determine the pawn's name, so we must use the first
-one to ensure our altered name is chosen. Each WillowAIPawn has a NameListIndex property, an integer
-that refers to an entry in the current GameReplicationInfo's NameListDefinition. We can add strings
-to this list, and individually set pawn's NameListIndex to point to those new strings.
-"""
-_name_list: Optional[UObject]
-"""A persistent NameListDefinition to which we copy vanilla fixup names, then append our custom
-giant names. This will be assigned as the GameReplicationInfo's NameListDef in every map."""
+    __slots__ = "fields"
+    fields: Dict[str, Any]
+    """The values of the fields read so far, keyed by their path from the WillowAIPawn."""
 
-_vanilla_name_list_length: int
-"""The original length of the GameReplicationInfo's NameListDefinition for the current map."""
+    def __init__(self, uobject: UObject):
+        super().__init__(uobject)
+        self.fields = {}
 
-_vanilla_name_list_names: str
-"""
-The items of the vanilla name list for the current map, in a format suitable for insertion into a
-set console command.
-"""
 
-_level_address: int = 0
-""" """
+    @classmethod
+    def all(cls) -> Generator[pawnsnapshot, None, None]:
+        """Yield a snapshot of every WillowAIPawn (and subclass) that has an AIClass."""
+        _snapshot_stats["walks"] += 1
+        return super().all()
 
 
-"""
-In co-op play, WillowAIPawns are represented on clients as their own WillowAIPawn instances, that
-have various attributes replicated from the host's instance. In Reign Of Giants, we need clients'
-instances to be Gigantized when they are Gigantized on the server.
+    def read(self, path: str, source: Union[UObject, FStruct], name: str) -> Any:
+        """Read the named field from the pawn or one of its members, unless it was already read."""
+        value = self.fields.get(path, _unread)
+        if value is _unread:
+            value = self.fields[path] = getattr(source, name)
+        else:
+            _snapshot_stats["reads_saved"] += 1
+        return value
 
-Unfortunately there is no apparent way of easily identifying which WillowAIPawn instances on clients
-correspond to ones on host. We solve this by generating an ID number for each pawn, and encoding it
-into a property which the game replicates between host and client instances.
-"""
-_giant_IDs: List[int] = []
-"""The IDs for pawns that the server has reported as Giants, in order of their NameListIndex."""
 
+    @property
+    def ai_class(self) -> Optional[str]:
+        ai_class = self.read("AIClass", self.uobject, "AIClass")
+        return None if ai_class is None else self.read("AIClass.Name", ai_class, "Name")
 
-_package: Optional[UPackage]
-"""A custom UPackage used to maintain a persistent namespace for our custom UObjects."""
 
-"""
-We must ensure we can drop loot for every single variation of enemy in the game, without in any way
-altering the enemy's vanilla loot mechanics. To do so, we use a Behavior_SpawnLootAroundPoint to
-generate loot from a list of pools at the location where the enemy dies.
-"""
-LootBehavior: Optional[UObject]
-"""The Behavior_SpawnLootAroundPoint object which spawns loot on Giants' death."""
+    @property
+    def balance_state(self) -> FStruct:
+        """The pawn's balance definition state."""
+        return self.read("BalanceDefinitionState", self.uobject, "BalanceDefinitionState")
 
 
-GiantPrefix: ModMenu.Options.Hidden = ModMenu.Options.Hidden(
-    Caption="GiantPrefix",
-    StartingValue="Giant"
-)
-"""The SDK Options object that stores the string which is prepended to each Giants' name."""
+    @property
+    def grade_index(self) -> int:
+        return self.read("BalanceDefinitionState.GradeIndex", self.balance_state, "GradeIndex")
 
-GiantScale: ModMenu.Options.Hidden = ModMenu.Options.Hidden(
-    Caption="GiantScale",
-    StartingValue=2.25
-)
-"""The SDK Options object that stores the float used to scale Giants' meshes."""
+    @grade_index.setter
+    def grade_index(self, grade_index: int) -> None:
+        self.balance_state.GradeIndex = self.fields["BalanceDefinitionState.GradeIndex"] = grade_index
 
 
-CheatMode: ModMenu.Options.Hidden = ModMenu.Options.Hidden(
-    Caption="CheatMode",
-    StartingValue=False
-)
-"""The SDK Options object that stores whether to use cheat mode."""
+    @property
+    def balance(self) -> Optional[UObject]:
+        return self.read("BalanceDefinitionState.BalanceDefinition", self.balance_state, "BalanceDefinition")
 
 
-"""
-The SDK has difficulties with certain things; namely, strings allocated by the SDK currently cause a
-crash when deallocated by Unreal Engine. Also, it rejects tuples being assigned to FStructs if we
-attempt to pass None when the field expects a UObject. Both of these issues can be worked around by
-using a `set` console command to apply these "problematic" values to properties.
-"""
-def _set_command(obj: UObject, property: str, value: Union[str, Iterable[str]]) -> None:
-    """Perform a console command to set the given object's property to the specified value(s)."""
+    @property
+    def record(self) -> Optional[UObject]:
+        """The object set as the pawn's DebugPawnMarkerInst, which is our storage object for Giants."""
+        return self.read("DebugPawnMarkerInst", self.uobject, "DebugPawnMarkerInst")
 
-    if isinstance(value, str):
-        command = f"set {UObject.PathName(obj)} {property} {value}"
-    else:
-        command = f"set {UObject.PathName(obj)} {property} ({','.join(value)})"
 
-    GetEngine().GamePlayers[0].Actor.ConsoleCommand(command, False)
+    @property
+    def is_giant(self) -> bool:
+        record = self.record
+        return record is not None and self.read("DebugPawnMarkerInst.Name", record, "Name").startswith("ReignOfGiants")
 
 
-def _array_string(string: str) -> str:
-    """
-    Return the string with its quotes escaped, enclosed in quotes, followed by a comma. This format
-    is suitable for concatenation into an array as the value for a `set` console command.
-    """
-    string = string.replace('"', '\\"')
-    return f"\"{string}\","
+    def initialize_giant(self) -> None:
+        super().initialize_giant()
+        self.fields.pop("DebugPawnMarkerInst", None)
+        self.fields.pop("DebugPawnMarkerInst.Name", None)
 
 
-def _defer_to_tick(name: str, callable: Callable[[], Optional[bool]]) -> None:
-    """Schedule a routine to be invoked each game tick until it returns True."""
+    @property
+    def name_list_index(self) -> int:
+        return self.read("NameListIndex", self.uobject, "NameListIndex")
 
-    # Create a wrapper to call the routine that is suitable to be passed to RunHook.
-    def tick(caller: UObject, function: UFunction, params: FStruct) -> bool:
-        # Invoke the routine. If it returns False, unregister its tick hook.
-        if not callable():
-            RemoveHook("WillowGame.WillowGameViewportClient.Tick", "ReignOfGiants." + name)
+    @name_list_index.setter
+    def name_list_index(self, index: int) -> None:
+        self.uobject.NameListIndex = self.fields["NameListIndex"] = index
 
-    # Hook the wrapper.
-    RunHook("WillowGame.WillowGameViewportClient.Tick", "ReignOfGiants." + name, tick)
 
+    @property
+    def vanilla_name_list_index(self) -> int:
+        if self.is_giant:
+            return self.read("DebugPawnMarkerInst.FlagIndex", self.record, "FlagIndex")
+        return self.name_list_index
 
-def _request_giants() -> Optional[bool]:
-    """
-    If we currently have both a GRI and a PRI, initialize our names list and request the current
-    Giants from the server.
-    """
+    @vanilla_name_list_index.setter
+    def vanilla_name_list_index(self, index: int) -> None:
+        if self.is_giant:
+            self.record.FlagIndex = self.fields["DebugPawnMarkerInst.FlagIndex"] = index
 
-    # If we do not yet have both a GRI and a PRI, we must keep ticking until we do.
-    GRI = GetEngine().GetCurrentWorldInfo().GRI
-    if GRI is None or GetEngine().GamePlayers[0].Actor.PlayerReplicationInfo is None:
-        return True
 
-    # With the GRI, set up our name list, and initialize its names.
-    GRI.NameListDef = _name_list
-    _set_command(_name_list, "Names", "()")
+_unread: object = object()
+"""Stands in for the value of a field a pawn snapshot has not yet read."""
 
-    # Send the Giants request to the server, and we may stop ticking.
-    _mod_instance.ServerRequestGiants()
-    
+_snapshot_stats: Dict[str, int] = {"walks": 0, "reads_saved": 0}
+"""
+The number of walks of the pawn list taken with snapshots, and the number of reads of pawns' fields
+their snapshots saved us from making.
+"""
 
-def _prepare_lists() -> Optional[bool]:
+
+class markerpool:
     """
-    If it has not yet been done in the current map, prepare the name list variables and set of
-    WillowAIPawn subclasses.
+    The KnowledgeRecords we mark Giants with. Rather than constructing a record for each Giant, to
+    be left for garbage collection after it dies, records are taken back as Giants die and as levels
+    change, and handed out again to new Giants. Records live in our package and are kept alive
+    while they are ours, up to _MARKER_POOL_SIZE of them being held for reuse at once.
     """
-    global _level_address
 
-    # Get the current world info, and the address of the current level object.
-    world_info = GetEngine().GetCurrentWorldInfo()
-    current_level_address = world_info.CommittedPersistentLevel.GetAddress()
+    __slots__ = ("free", "in_use")
 
-    # If we are missing either a game replication or player replication object, we are a client in a
-    # new game session, and must defer a request for the current Giants state until we have both.
-    if world_info.GRI is None or GetEngine().GamePlayers[0].Actor.PlayerReplicationInfo is None:
-        _level_address = current_level_address
-        _defer_to_tick("RequestGiants", _request_giants)
-        return
+    free: List[UObject]
+    """The records ready to be handed out."""
+    in_use: Dict[int, UObject]
+    """The records currently marking a Giant, by their addresses."""
 
-    # If the address of the current level object matches our existing record, we're still in the
-    # same level, and do not need to perform setup.
-    if _level_address == current_level_address:
-        return
-    # With a new level, update our record of its address.
-    _level_address = current_level_address
+    def __init__(self) -> None:
+        self.free = []
+        self.in_use = {}
 
-    # If we are currently a client, request the current Giants from the host.
-    if GetEngine().GetCurrentWorldInfo().NetMode == 3:
-        _defer_to_tick("RequestGiants", _request_giants)
-        return
 
-    # Initialize our records of the vanilla name list's length and items.
-    global _vanilla_name_list_length, _vanilla_name_list_names
-    _vanilla_name_list_length = 0
-    _vanilla_name_list_names = ""
+    def acquire(self) -> UObject:
+        """Hand out a record to mark a new Giant with, constructing one if none are free."""
+        global _marker_count
 
-    # If the vanilla name list does in fact exist in this map, populate our records with its values.
-    if world_info.GRI.NameListDef is not None and world_info.GRI.NameListDef.Names is not None:
-        for name in world_info.GRI.NameListDef.Names:
-            _vanilla_name_list_length += 1
-            _vanilla_name_list_names += _array_string(name)
+        if self.free:
+            record = self.free.pop()
+            record.FlagIndex = 0
+            _marker_stats["hits"] += 1
+        else:
+            # Our records' names are never repeated, lest one from before we were last disabled
+            # still be marking a Giant.
+            _marker_count += 1
+            record = ConstructObject("KnowledgeRecord", _package, f"ReignOfGiants_{_marker_count}")
+            KeepAlive(record)
+            _marker_stats["misses"] += 1
 
-    # Send the new vanilla name list values to clients.
-    _mod_instance.ClientUpdateVanillaNameList(_vanilla_name_list_length, _vanilla_name_list_names)
+        self.in_use[record.GetAddress()] = record
+        return record
 
-    # Assign our name list to the GRIs, and schedule an update for the name list's contents.
-    world_info.GRI.NameListDef = _name_list
-    _defer_to_tick("UpdatePawns", _update_pawns)
 
+    def reclaim(self, pawn: UObject, record: UObject) -> None:
+        """Take back the record from a Giant that has died, unmarking its corpse."""
+        pawn.DebugPawnMarkerInst = None
+        if self.in_use.pop(record.GetAddress(), None) is not None:
+            self.keep(record)
 
-def _update_pawns() -> Optional[bool]:
-    """
-    Update our name list to contain the contents of the vanilla one, as well as the current name of
-    each Giant. This should be scheduled to be run on a game tick, so as to consolidate multiple
-    requests for updates that may occur in quick succession.
-    """
 
-    # Iterate over every current WillowAIPawn object. Record the ID for each pawn that has one, each
-    # pawn that does not yet have an ID, and each pawn that is a Giant.
-    IDs = set()
-    IDless_pawns = []
-    giant_pawns = []
+    def reclaim_all(self) -> None:
+        """Take back every record in use, as when the Giants they mark are gone with their level."""
+        for record in self.in_use.values():
+            self.keep(record)
+        self.in_use.clear()
 
-    for pawn in aipawn.all():
-        ID = pawn.ID
-        if ID > 0:
-            IDs.add(ID)
+
+    def keep(self, record: UObject) -> None:
+        """Hold a record taken back for reuse, or let it go should we already hold enough."""
+        _marker_stats["reclaimed"] += 1
+        if len(self.free) < _MARKER_POOL_SIZE:
+            self.free.append(record)
         else:
-            IDless_pawns.append(pawn)
+            record.ObjectFlags.A &= ~0x4000
+            _marker_stats["released"] += 1
 
-        if pawn.is_giant:
-            giant_pawns.append(pawn)
 
-    # Starting with 1, find IDs that are not currently in use, assigning them to the pawns that did
-    # not yet have an ID.
-    new_ID = 1
-    for IDless_pawn in IDless_pawns:
-        while new_ID in IDs:
-            new_ID += 1
-        IDless_pawn.encode_ID(new_ID)
-        new_ID += 1
+    def clear(self) -> None:
+        """Let go of every record, leaving those still in use to their Giants."""
+        for record in (*self.free, *self.in_use.values()):
+            record.ObjectFlags.A &= ~0x4000
+        self.free.clear()
+        self.in_use.clear()
 
-    # Initialize our list of Giants' IDs, and begin the "array" of new names with the vanilla ones.
-    global _giant_IDs
-    _giant_IDs = []
-    name_list_names = _vanilla_name_list_names
 
-    # For each Giant pawn that was found, add its ID to the list of Giants' IDs, add its name to the
-    # names "array," and set its NameListIndex to the index it will be found in the list.
-    for giant_index, giant_pawn in enumerate(giant_pawns):
-        _giant_IDs.append(giant_pawn.ID)
-        name_list_names += _array_string(giant_pawn.giant_name())
-        giant_pawn.uobject.NameListIndex = _vanilla_name_list_length + giant_index
+_MARKER_POOL_SIZE: int = 64
+"""The most records our marker pool holds for reuse at once."""
 
-    # Apple the new names to the name list, and send the new list of Giants' IDs to clients.
-    _set_command(_name_list, "Names", f"({name_list_names})")
-    _mod_instance.ClientUpdateGiants(_giant_IDs)
+_markers: markerpool = markerpool()
+"""The records we mark Giants with."""
 
+_marker_count: int = 0
+"""The number of records we have constructed, from which each is named."""
 
-def _gigantize_pawns() -> Optional[bool]:
+_marker_stats: Dict[str, int] = {"hits": 0, "misses": 0, "reclaimed": 0, "released": 0}
+"""
+The number of records handed out from the marker pool, of those that had to be constructed, of those
+taken back, and of those taken back but let go for the pool being full.
+"""
+
+
+class pawnwalk:
     """
-    From the current list of Giants' IDs, find each Giant pawn, Gigantize them, and update the names
-    list with their Gigantized names, in order.
+    A walk of the pawn list that may be spread over several ticks, visiting no more than WalkLimit
+    pawns on each. Iterating over the walk yields a snapshot of each pawn that has an AIClass, or
+    None once the tick's share of pawns has been visited, after which the walk must only be resumed
+    on a later tick. The walk always reads the next pawn in the list before yielding the current one,
+    so it never relies on a pawn it has yielded. Should the next pawn be destroyed, or the level
+    change, before the walk is resumed, it starts over from the beginning of the pawn list, so the
+    routines using it must be prepared to see pawns again. Pawns spawned during the walk are added to
+    the beginning of the list, and are not seen by it.
     """
 
-    # Get the current game replication info. If it has not yet been created, tick until it has.
-    GRI = GetEngine().GetCurrentWorldInfo().GRI
-    if GRI is None:
-        return True
+    __slots__ = ("cursor", "restart", "ticks", "visited")
+
+    cursor: Optional[UObject]
+    """The pawn to be visited next, if any."""
+    restart: bool
+    """Whether the walk must start over from the beginning of the pawn list."""
+    ticks: int
+    """The number of ticks the walk has spanned."""
+    visited: int
+    """The number of pawns the walk has visited."""
 
-    # Create a list of empty strings as long as the number of Giants.
-    giant_names = [""] * len(_giant_IDs)
+    def __init__(self) -> None:
+        self.cursor = None
+        self.restart = True
+        self.ticks = 0
+        self.visited = 0
 
-    # For each current pawn, attempt to locate the index of its ID in the list of Giants' IDs.
-    for pawn in aipawn.all():
+
+    def __iter__(self) -> Generator[Optional[pawnsnapshot], None, None]:
+        # Count the walk once it is taken, whether or not the routine taking it sees it to the end.
+        _snapshot_stats["walks"] += 1
+        _pawn_walks.append(self)
         try:
-            giant_index = _giant_IDs.index(pawn.ID)
-        # If the pawn's ID is not in the in the list of Giant IDs, skip it.
-        except ValueError:
-            continue
+            frame = None
+            while True:
+                # Begin each tick's share of pawns afresh.
+                if frame != _scheduler.frame:
+                    frame = _scheduler.frame
+                    remaining = WalkLimit.CurrentValue or -1
+                    self.ticks += 1
+                if remaining == 0:
+                    yield None
+                    continue
+
+                if self.restart:
+                    self.restart = False
+                    self.cursor = GetEngine().GetCurrentWorldInfo().PawnList
+
+                pawn = self.cursor
+                if pawn is None:
+                    break
+                remaining -= 1
+                self.visited += 1
+
+                # Move on to the next pawn before yielding this one, as this one may no longer exist
+                # by the time we resume.
+                ai_class = pawn.AIClass
+                self.cursor = pawn.NextPawn
+                if ai_class is not None:
+                    snapshot = pawnsnapshot(pawn)
+                    snapshot.fields["AIClass"] = ai_class
+                    yield snapshot
+        finally:
+            _pawn_walks.remove(self)
+            if _stats.enabled:
+                _stats.record("pawns visited per walk", self.visited)
+                _stats.record("ticks per walk", self.ticks)
+
+
+    def destroyed(self, pawn: UObject) -> None:
+        """Note that a pawn is being destroyed, starting over if it was the one to be visited next."""
+        if self.cursor is not None and self.cursor.GetAddress() == pawn.GetAddress():
+            self.restart = True
+
+
+_pawn_walks: List[pawnwalk] = []
+"""The walks of the pawn list currently underway."""
 
-        # If we encounter a Giant that is not yet had its, balance definition applied, stop here and
-        # try again on the next tick.
-        if pawn.balance is None:
-            return True
 
-        pawn.gigantize()
+"""
+A significant aspect of Reign Of Giants is the adjusting of individual WillowAIPawns to include
+"Giant" in the name displayed to the player. To determine what name is displayed, the game invokes
+GetTargetName on its WillowAIPawn. This function accepts an `out` parameter through which it passes
+the final name. The SDK cannot alter `out` parameters, so instead we must hijack the mechanisms
+accessed in GetTargetName.
 
-        # Generate the Giant's name and place it in the names list at the Giant's index.
-        giant_names[giant_index] = pawn.giant_name()
-        # The Giant's name's index in the names list will be its index relative to the end of
-        # the vanilla ones.
-        pawn.uobject.NameListIndex = _vanilla_name_list_length + giant_index
+GetTargetName checks a series of conditionals to determine the pawn's name, so we must use the first
+one to ensure our altered name is chosen. Each WillowAIPawn has a NameListIndex property, an integer
+that refers to an entry in the current GameReplicationInfo's NameListDefinition. We can add strings
+to this list, and individually set pawn's NameListIndex to point to those new strings.
+"""
+_name_list: Optional[UObject]
+"""A persistent NameListDefinition to which we copy vanilla fixup names, then append our custom
+giant names. This will be assigned as the GameReplicationInfo's NameListDef in every map."""
 
-    # Start the new names list with the vanilla ones, then append each Giant's name in order.
-    name_list_names = _vanilla_name_list_names
-    for name in giant_names:
-        name_list_names += _array_string(name)
+_vanilla_name_lists: Dict[str, Tuple[str, int, str]] = {}
+"""
+On clients, the vanilla name lists received from the server, by the name of their map. Each entry
+holds the name list's digest, length, and items.
+"""
 
-    # Make sure our name list is applied to the world info, and apply our names to it.
-    GRI.NameListDef = _name_list
-    _set_command(_name_list, "Names", f"({name_list_names})")
+_vanilla_name_lists_loaded: bool = False
+"""Whether the vanilla name lists stored on disk have been read into our cache."""
 
+_vanilla_name_lists_path: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "namelists.json")
+"""The file in which clients store the vanilla name lists they receive, if enabled."""
 
-# @Hook("WillowGame.WillowAIPawn.PostBeginPlay", "ReignOfGiants")
-def _aipawn_post_begin_play(caller: UObject, function: UFunction, params: FStruct) -> bool:
+
+class namelist:
     """
-    Every single WillowAIPawn, even ones without balances, have this method called after being
-    spawned.
+    The contents of our name list beyond the vanilla names: one slot for each Giant. A Giant keeps
+    the same slot for as long as it exists, meaning its NameListIndex only needs to be set once, and
+    slots vacated by Giants that no longer exist are reused by new ones.
     """
-    _prepare_lists()
 
-    # If we are currently a client, we do not need to do anything here.
-    if GetEngine().GetCurrentWorldInfo().NetMode == 3:
-        return True
+    __slots__ = ("IDs", "names", "slots", "free", "dirty", "operations")
+
+    IDs: List[int]
+    """The ID of the Giant occupying each slot, or 0 for vacant slots."""
+    names: List[str]
+    """The name in each slot, in the format returned by `_array_string`."""
+    slots: Dict[int, int]
+    """Maps the ID of each Giant with a slot to the slot's index."""
+    free: List[int]
+    """The indices of vacant slots, available for reuse."""
+    dirty: bool
+    """Whether any slots have changed since the name list was last committed."""
+    operations: List[int]
+    """
+    The changes made to slots since the operations were last sent to clients, as a flat list of
+    (operation, slot, ID) triplets.
+    """
 
-    # Temporarily remove our hook for this method before invoking injecting its call now.
-    RemoveHook("WillowGame.WillowAIPawn.PostBeginPlay", "ReignOfGiants")
-    DoInjectedCallNext()
-    caller.PostBeginPlay()
-    RunHook("WillowGame.WillowAIPawn.PostBeginPlay", "ReignOfGiants", _aipawn_post_begin_play)
+    def __init__(self) -> None:
+        self.reset()
 
-    # If a bogus name list index was applied to the pawn, sanitize it now to prevent it from kicking
-    # in with the names we add to the name list.
-    if caller.NameListIndex >= _vanilla_name_list_length:
-        caller.NameListIndex = -1
-    return False
 
+    def reset(self) -> None:
+        """Vacate every slot, such that the name list only contains the vanilla names."""
+        self.IDs = []
+        self.names = []
+        self.slots = {}
+        self.free = []
+        self.dirty = True
+        self.operations = []
 
-# @Hook("WillowGame.PopulationFactoryBalancedAIPawn.SetupBalancedPopulationActor", "ReignOfGiants")
-def _setup_balanced_population(caller: UObject, function: UFunction, params: FStruct) -> bool:
-    """
+
+    def occupy(self, slot: int, ID: int) -> None:
+        """
+        Place the Giant with the given ID in the given slot, as instructed by the server. The slot's
+        name is left blank until it is assigned one.
+        """
+        while len(self.IDs) <= slot:
+            self.IDs.append(0)
+            self.names.append(_array_string(""))
+
+        # Evict whichever Giant we believed to occupy the slot, and likewise the slot this Giant
+        # previously occupied.
+        if self.IDs[slot] != 0:
+            self.release(self.IDs[slot])
+        if ID in self.slots:
+            self.release(ID)
+
+        if slot in self.free:
+            self.free.remove(slot)
+        self.IDs[slot] = ID
+        self.slots[ID] = slot
+
+
+    def assign(self, ID: int, name: str) -> int:
+        """
+        Set the name, in the format of `_array_string`, for the Giant with the given ID, giving it a
+        slot if it does not yet have one. Returns the index in the name list at which the name will
+        be found.
+        """
+        slot = self.slots.get(ID)
+        added = slot is None
+        if added:
+            # Reuse the most recently vacated slot if there is one, otherwise add a new one.
+            if self.free:
+                slot = self.free.pop()
+            else:
+                slot = len(self.IDs)
+                self.IDs.append(0)
+                self.names.append("")
+            self.IDs[slot] = ID
+            self.slots[ID] = slot
+            self.dirty = True
+            self.operations += (_GIANT_ADDED, slot, ID)
+
+        if self.names[slot] != name:
+            # A change of name for a Giant that already held its slot must be relayed to clients.
+            if not added:
+                self.operations += (_GIANT_RENAMED, slot, ID)
+            self.names[slot] = name
+            self.dirty = True
+
+        return _level.vanilla_name_list_length + slot
+
+
+    def release(self, ID: int) -> None:
+        """Vacate the slot belonging to the Giant with the given ID."""
+        slot = self.slots.pop(ID)
+        self.IDs[slot] = 0
+        self.names[slot] = _array_string("")
+        self.free.append(slot)
+        self.dirty = True
+        self.operations += (_GIANT_REMOVED, slot, ID)
+
+
+    def commit(self) -> bool:
+        """
+        If any slots have changed, apply the vanilla names followed by each slot's name to our name
+        list. Returns whether the name list was updated.
+        """
+        if not self.dirty:
+            return False
+        names = f"({_level.vanilla_name_list_names}{''.join(self.names)})"
+        _set_command(_name_list, "Names", names)
+        self.dirty = False
+
+        if _stats.enabled:
+            _stats.record("name list rebuild slots", len(self.IDs))
+            _stats.record("name list rebuild bytes", len(names))
+        return True
+
+
+    def take_operations(self) -> List[int]:
+        """Return the operations recorded since this was last called, and begin a new record."""
+        operations = self.operations
+        self.operations = []
+        return operations
+
+
+
+"""
+In co-op play, WillowAIPawns are represented on clients as their own WillowAIPawn instances, that
+have various attributes replicated from the host's instance. In Reign Of Giants, we need clients'
+instances to be Gigantized when they are Gigantized on the server.
+
+Unfortunately there is no apparent way of easily identifying which WillowAIPawn instances on clients
+correspond to ones on host. We solve this by generating an ID number for each pawn, and encoding it
+into a property which the game replicates between host and client instances.
+"""
+
+
+"""
+When the server's Giants change, it sends clients only the operations that were performed on its
+name list's slots, rather than the whole list of Giants' IDs. Each batch of operations is numbered
+in sequence, and a client that finds a batch to be out of sequence discards it and asks for the
+complete list, picking up the sequence from there.
+"""
+_GIANT_ADDED: int = 0
+"""Operation in which a Giant has taken a slot."""
+_GIANT_REMOVED: int = 1
+"""Operation in which a Giant has vacated a slot."""
+_GIANT_RENAMED: int = 2
+"""Operation in which a Giant's name has changed, without it changing slots."""
+
+_giants_sequence: int = 0
+"""
+On the server, the sequence number of the last batch of operations sent to clients. On clients, the
+sequence number of the last batch of operations applied.
+"""
+_giants_resyncing: bool = False
+"""Whether a client has requested the complete list of Giants and is awaiting it."""
+
+_replication_bytes: Dict[str, int] = {
+    "delta": 0, "full": 0, "full_equivalent": 0, "vanilla_digest": 0, "vanilla_names": 0
+}
+"""
+The sizes of the payloads sent to each client by the server, in bytes of JSON: those of operations
+sent as deltas, those of complete lists of Giants, and those that complete lists would have been had
+they been sent in place of each delta; as well as those of vanilla name list digests, and of the
+vanilla name lists sent when clients did not recognize a digest.
+"""
+
+
+"""
+An ID occupies 16 bits of the pawn's grade index. The low 12 bits are an index, which the host
+hands out to pawns as they spawn and takes back as they die, and the next 3 bits are a generation
+counter for the index, which is advanced each time the index is taken back. This way, a pawn which
+is given a recycled index does not share its ID with the pawn that held the index before it, so
+clients will not confuse the two. The top bit is left unused, keeping grade indices positive.
+"""
+_ID_INDEX_BITS: int = 12
+_ID_INDEX_MASK: int = (1 << _ID_INDEX_BITS) - 1
+_ID_GENERATION_MASK: int = 0b111
+
+
+class idallocator:
+    """
+    Hands out IDs for pawns in constant time, from a queue of indices that have been released, or
+    failing that, by raising the high-water mark of indices handed out so far. Once all 4,095
+    indices are in use, no more IDs are handed out until some are released.
+
+    Released indices are handed out again in the order they were released, so that each comes back
+    as late as possible. With only eight generations to an index, handing the most recently released
+    one straight back out would soon reissue an ID still carried by a corpse or an operation in
+    flight to clients.
+    """
+
+    __slots__ = ("generations", "free", "high_water")
+
+    generations: List[int]
+    """The current generation of each index handed out so far (index 0 is never handed out)."""
+    free: deque
+    """Indices that have been released, available to be handed out again, oldest first."""
+    high_water: int
+    """The highest index handed out so far."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+
+    def reset(self) -> None:
+        """Forget all IDs handed out so far, e.g. upon entering a new map."""
+        self.generations = [0]
+        self.free = deque()
+        self.high_water = 0
+
+
+    def allocate(self) -> int:
+        """Return an unused ID, or 0 if every index is currently in use."""
+        if self.free:
+            index = self.free.popleft()
+        elif self.high_water < _ID_INDEX_MASK:
+            self.high_water += 1
+            index = self.high_water
+            self.generations.append(0)
+        else:
+            return 0
+        return (self.generations[index] << _ID_INDEX_BITS) | index
+
+
+    def is_live(self, ID: int) -> bool:
+        """Whether the given ID has been handed out and not yet released."""
+        index = ID & _ID_INDEX_MASK
+        # Released indices have already moved on to their next generation.
+        return 0 < index <= self.high_water and self.generations[index] == ID >> _ID_INDEX_BITS
+
+
+    def release(self, ID: int) -> None:
+        """
+        Make the given ID's index available to be handed out again, under a new generation. IDs that
+        have already been released are ignored.
+        """
+        index = ID & _ID_INDEX_MASK
+        if 0 < index <= self.high_water and self.generations[index] == ID >> _ID_INDEX_BITS:
+            self.generations[index] = (self.generations[index] + 1) & _ID_GENERATION_MASK
+            self.free.append(index)
+
+
+    def reclaim(self, live_IDs: Set[int]) -> None:
+        """
+        Release every handed out ID other than the given ones. This recovers the IDs of pawns that
+        were destroyed without our knowledge.
+        """
+        live_indices = {ID & _ID_INDEX_MASK for ID in live_IDs}
+        free = set(self.free)
+        for index in range(1, self.high_water + 1):
+            if index not in live_indices and index not in free:
+                self.release((self.generations[index] << _ID_INDEX_BITS) | index)
+
+
+def _assign_ID(pawn: aipawn) -> int:
+    """
+    Assign a new ID to a pawn that does not yet have one, returning it. Should every ID be in use,
+    we first try to reclaim any belonging to pawns which no longer exist; if none can be reclaimed,
+    the pawn is left without an ID, and 0 is returned. Pawns without IDs cannot be Giants.
+    """
+    ID = _level.IDs.allocate()
+    if ID == 0:
+        _level.IDs.reclaim({live_pawn.ID for live_pawn in pawnsnapshot.all()})
+        ID = _level.IDs.allocate()
+
+    if ID == 0:
+        if not _level.IDs_exhausted:
+            Log("Reign Of Giants: Out of pawn IDs, further pawns cannot be Giants until some die.")
+            _level.IDs_exhausted = True
+        return 0
+
+    _level.IDs_exhausted = False
+    pawn.encode_ID(ID)
+    return ID
+
+
+class level:
+    """
+    The state we keep for the current map. A new one is created each time a map is loaded, as
+    signalled by its GameReplicationInfo beginning play, so that hooks run for each pawn need only
+    refer to it rather than finding out for themselves whether the map has changed.
+    """
+
+    __slots__ = (
+        "GRI", "is_client", "prepared", "vanilla_name_list_length", "vanilla_name_list_names",
+        "vanilla_name_list_digest", "vanilla_name_list", "name_list_replaced", "names", "IDs", "IDs_exhausted", "stale_giant_IDs",
+        "pending_giant_IDs", "gigantized_IDs", "giant_ai_classes", "giant_ai_class_package",
+        "attribute_multipliers", "attribute_plans", "giant_names",
+    )
+
+    GRI: Optional[UObject]
+    """The map's GameReplicationInfo, if it has begun play."""
+    is_client: bool
+    """Whether we are a client in this map."""
+    prepared: bool
+    """
+    On the server, whether the vanilla name list has been read and our name list set up. On clients,
+    whether the current Giants have been requested from the server.
+    """
+
+    vanilla_name_list_length: int
+    """The original length of the GameReplicationInfo's NameListDefinition."""
+    vanilla_name_list_names: str
+    """
+    The items of the vanilla name list, in a format suitable for insertion into a set console
+    command.
+    """
+    vanilla_name_list_digest: str
+    """A hash of the vanilla name list's length and items, by which clients can recognize it."""
+    vanilla_name_list: Optional[UObject]
+    """On the server, the NameListDefinition the GameReplicationInfo had before we replaced it with ours."""
+    name_list_replaced: bool
+    """On the server, whether we have replaced the GameReplicationInfo's NameListDefinition with ours."""
+
+    names: namelist
+    """The Giants' slots in our name list."""
+    IDs: idallocator
+    """The host's allocator for the IDs of pawns."""
+    IDs_exhausted: bool
+    """Whether we have already reported running out of IDs."""
+    stale_giant_IDs: Set[int]
+    """The IDs of Giants whose names and NameListIndex need to be reapplied on the next update."""
+    pending_giant_IDs: Set[int]
+    """On clients, the IDs of Giants that still need to be Gigantized and named."""
+    gigantized_IDs: Set[int]
+    """On clients, the IDs of Giants that have already been Gigantized."""
+    giant_ai_classes: Dict[str, Tuple[UObject, UObject]]
+    """
+    The Giant versions of AI classes we have created in this map, each paired with the vanilla AI
+    class it was cloned from, by name.
+    """
+    giant_ai_class_package: Optional[UPackage]
+    """The package in which we create this map's Giant AI classes, once we have needed one."""
+    attribute_multipliers: Optional[Dict[int, float]]
+    """
+    The multipliers for Giants' attributes, by the address of each attribute's AttributeDefinition,
+    once we have found them.
+    """
+    attribute_plans: Dict[int, Tuple[Tuple[int, float], ...]]
+    """
+    For each vanilla AI class we have cloned for Giants, by address, the indices of the starting
+    values we modify on its clones, each paired with the multiplier to apply to it.
+    """
+    giant_names: Dict[Tuple[int, int, int, str, str], Tuple[str, str]]
+    """
+    The Giant names we have generated, along with their `_array_string` formats, by the vanilla name
+    list index, balance address, TransformType, master's name and prefix they were generated from.
+    """
+
+    def __init__(self, GRI: Optional[UObject], is_client: bool) -> None:
+        self.GRI = GRI
+        self.is_client = is_client
+        self.prepared = False
+        self.vanilla_name_list_length = 0
+        self.vanilla_name_list_names = ""
+        self.vanilla_name_list_digest = ""
+        self.vanilla_name_list = None
+        self.name_list_replaced = False
+        self.names = namelist()
+        self.IDs = idallocator()
+        self.IDs_exhausted = False
+        self.stale_giant_IDs = set()
+        self.pending_giant_IDs = set()
+        self.gigantized_IDs = set()
+        self.giant_ai_classes = {}
+        self.giant_ai_class_package = None
+        self.attribute_multipliers = None
+        self.attribute_plans = {}
+        self.giant_names = {}
+
+
+    def forget_giant_names(self, balance: Optional[UObject]) -> None:
+        """Forget the names we have generated for Giants of the given balance definition."""
+        if balance is None:
+            return
+        address = balance.GetAddress()
+        for key in [key for key in self.giant_names if key[1] == address]:
+            del self.giant_names[key]
+
+
+    def attribute_plan(self, ai_class: UObject) -> Tuple[Tuple[int, float], ...]:
+        """
+        Return the indices of the given AI class's starting values that we modify for its Giants,
+        along with their multipliers, working them out the first time the class is requested.
+        """
+        address = ai_class.GetAddress()
+        plan = self.attribute_plans.get(address)
+        if plan is not None:
+            return plan
+
+        multipliers = self.attribute_multipliers
+        if multipliers is None:
+            multipliers = self.attribute_multipliers = {}
+            for path, multiplier in GiantAttributes.CurrentValue.items():
+                attribute = FindObject("AttributeDefinition", path)
+                if attribute is not None:
+                    multipliers[attribute.GetAddress()] = multiplier
+
+        steps = []
+        for index, attribute_starting_value in enumerate(ai_class.AttributeStartingValues):
+            attribute = attribute_starting_value.Attribute
+            if attribute is not None:
+                multiplier = multipliers.get(attribute.GetAddress())
+                if multiplier is not None:
+                    steps.append((index, multiplier))
+
+        plan = self.attribute_plans[address] = tuple(steps)
+        return plan
+
+
+    def giant_ai_class(self, pawn: UObject) -> UObject:
+        """
+        Return the Giant version of the pawn's AI class, cloning it and modifying its starting values
+        the first time it is requested in this map, such that every Giant of the class may share it.
+        """
+        global _giant_ai_class_packages
+
+        ai_class = pawn.AIClass
+        name = ai_class.Name
+        cached = self.giant_ai_classes.get(name)
+        # The SDK need not return the same Python object each time for the same UObject, so we tell
+        # whether the pawn's class is the one we cloned by its address.
+        if cached is not None and cached[0].GetAddress() == ai_class.GetAddress():
+            _giant_ai_class_stats["shared"] += 1
+            return cached[1]
+
+        # The clone keeps the vanilla class's name, as that is what we identify classes by. Should
+        # another vanilla class of the same name already have a clone in this map, the pawn instead
+        # gets a clone of its own, which is destroyed along with the pawn.
+        if cached is None:
+            if self.giant_ai_class_package is None:
+                _giant_ai_class_packages += 1
+                self.giant_ai_class_package = ConstructObject(
+                    "Package", _package, f"GiantAIClasses_{_giant_ai_class_packages}"
+                )
+            outer = self.giant_ai_class_package
+        else:
+            outer = pawn
+
+        giant_ai_class = ConstructObject(ai_class.Class, outer, name, Template = ai_class)
+
+        # Multiply each of the starting values we modify on the AI class by its multiplier.
+        attribute_starting_values = giant_ai_class.AttributeStartingValues
+        for index, multiplier in self.attribute_plan(ai_class):
+            attribute_starting_values[index].BaseValue.BaseValueScaleConstant *= multiplier
+
+        if outer is pawn:
+            _giant_ai_class_stats["unshared"] += 1
+        else:
+            # Keep the shared clone alive for as long as we may hand it to new Giants, even once
+            # every Giant currently using it has been destroyed.
+            KeepAlive(giant_ai_class)
+            self.giant_ai_classes[name] = (ai_class, giant_ai_class)
+            _giant_ai_class_stats["built"] += 1
+
+        return giant_ai_class
+
+
+    def release_giant_ai_classes(self) -> None:
+        """
+        Allow this map's Giant AI classes to be garbage collected once no pawns are using them, and
+        forget them along with their attribute plans, so that the next Giants of each class are
+        given fresh clones.
+        """
+        for _, giant_ai_class in self.giant_ai_classes.values():
+            giant_ai_class.ObjectFlags.A &= ~0x4000
+        self.giant_ai_classes.clear()
+        self.giant_ai_class_package = None
+        self.attribute_multipliers = None
+        self.attribute_plans.clear()
+
+
+_level: level = level(None, False)
+"""The state we keep for the current map."""
+
+_giant_ai_class_packages: int = 0
+"""The number of packages we have created to hold maps' Giant AI classes, used to name the next."""
+
+_giant_ai_class_stats: Dict[str, int] = {"built": 0, "shared": 0, "unshared": 0}
+"""
+Counts of the Giant AI classes we have cloned to be shared by a class's Giants, of the Giants that
+reused an existing clone rather than receiving their own, and of the Giants that received their own
+due to a name clash. `shared` is thus the number of clones we avoided creating.
+"""
+
+
+_package: Optional[UPackage]
+"""A custom UPackage used to maintain a persistent namespace for our custom UObjects."""
+
+"""
+We must ensure we can drop loot for every single variation of enemy in the game, without in any way
+altering the enemy's vanilla loot mechanics. To do so, we use a Behavior_SpawnLootAroundPoint to
+generate loot from a list of pools at the location where the enemy dies.
+"""
+LootBehavior: Optional[UObject] = None
+"""
+The Behavior_SpawnLootAroundPoint object which spawns loot on Giants' death, once it and its item
+pools have been constructed.
+"""
+
+_loot_construction: Optional[Generator[None, None, None]] = None
+"""The steps remaining in the construction of our loot behavior, once it has begun."""
+
+_loot_objects: List[UObject] = []
+"""
+The objects we are keeping alive for our loot behavior: the behavior itself and its item pools,
+including those of a construction that has yet to complete.
+"""
+
+
+GiantPrefix: ModMenu.Options.Hidden = ModMenu.Options.Hidden(
+    Caption="GiantPrefix",
+    StartingValue="Giant"
+)
+"""The SDK Options object that stores the string which is prepended to each Giants' name."""
+
+GiantScale: ModMenu.Options.Hidden = ModMenu.Options.Hidden(
+    Caption="GiantScale",
+    StartingValue=2.25
+)
+"""The SDK Options object that stores the float used to scale Giants' meshes."""
+
+GiantAttributes: ModMenu.Options.Hidden = ModMenu.Options.Hidden(
+    Caption="GiantAttributes",
+    StartingValue={
+        "GD_Balance_HealthAndDamage.AIParameters.Attribute_HealthMultiplier": 4.0,
+        "GD_Balance_HealthAndDamage.AIParameters.Attribute_EnemyShieldMaxValueMultiplier": 4.0,
+        "GD_Balance_Experience.Attributes.Attribute_ExperienceMultiplier": 4.0,
+    }
+)
+"""
+The SDK Options object that stores the multiplier for each of the starting values we modify on
+Giants' AI classes, by the path name of the AttributeDefinition that keys the starting value.
+"""
+
+
+CheatMode: ModMenu.Options.Hidden = ModMenu.Options.Hidden(
+    Caption="CheatMode",
+    StartingValue=False
+)
+"""The SDK Options object that stores whether to use cheat mode."""
+
+TickBudget: ModMenu.Options.Hidden = ModMenu.Options.Hidden(
+    Caption="TickBudget",
+    StartingValue=2.0
+)
+"""
+The SDK Options object that stores the number of milliseconds per game tick that scheduled routines
+may take before the remainder of their work is deferred to the next tick.
+"""
+
+WalkLimit: ModMenu.Options.Hidden = ModMenu.Options.Hidden(
+    Caption="WalkLimit",
+    StartingValue=256
+)
+"""
+The SDK Options object that stores the number of pawns per game tick that scheduled routines may
+visit in walks of the pawn list, or 0 for no limit.
+"""
+
+RollSeed: ModMenu.Options.Hidden = ModMenu.Options.Hidden(
+    Caption="RollSeed",
+    StartingValue=None
+)
+"""
+The SDK Options object that stores the seed our rolls for Gigantism start from each time we are
+enabled, or None for a fresh seed each time.
+"""
+
+LootWarmUp: ModMenu.Options.Hidden = ModMenu.Options.Hidden(
+    Caption="LootWarmUp",
+    StartingValue=True
+)
+"""
+The SDK Options object that stores whether to construct our loot behavior in spare time after a map
+loads, rather than when the first Giant dies.
+"""
+
+NameListCache: ModMenu.Options.Hidden = ModMenu.Options.Hidden(
+    Caption="NameListCache",
+    StartingValue=False
+)
+"""
+The SDK Options object that stores whether clients should store the vanilla name lists they receive
+on disk, such that they need not be sent again in later sessions.
+"""
+
+CollectGarbage: ModMenu.Options.Hidden = ModMenu.Options.Hidden(
+    Caption="CollectGarbage",
+    StartingValue=False
+)
+"""
+The SDK Options object that stores whether to have the engine collect garbage once we have finished
+restoring pawns after being disabled, rather than leaving the objects we let go of to its next
+collection.
+"""
+
+
+"""
+The SDK has difficulties with certain things; namely, strings allocated by the SDK currently cause a
+crash when deallocated by Unreal Engine. Also, it rejects tuples being assigned to FStructs if we
+attempt to pass None when the field expects a UObject. Both of these issues can be worked around by
+using a `set` console command to apply these "problematic" values to properties.
+
+Parsing a `set` command is slow for large values such as our name list, which may be written several
+times over the course of a tick. We therefore queue each write, keeping only the latest value for a
+given property, and perform the commands for them once at the end of the tick.
+"""
+class commandqueue:
+    """The property writes waiting to be performed with `set` console commands."""
+
+    __slots__ = ("pending", "paths", "commands", "bytes", "coalesced")
+
+    pending: Dict[Tuple[int, str], Tuple[UObject, str]]
+    """The object and value for each pending write, by the object's address and property name."""
+    paths: Dict[int, str]
+    """The path names of the objects we have written to, by address."""
+    commands: int
+    """The number of `set` commands we have performed."""
+    bytes: int
+    """The total length of the `set` commands we have performed."""
+    coalesced: int
+    """The number of writes that were superseded by a later write before being performed."""
+
+    def __init__(self) -> None:
+        self.pending = {}
+        self.paths = {}
+        self.commands = 0
+        self.bytes = 0
+        self.coalesced = 0
+
+
+    def set(self, obj: UObject, property: str, value: str) -> None:
+        """Queue a write of the value to the object's property, replacing any already queued."""
+        key = (obj.GetAddress(), property)
+        if key in self.pending:
+            self.coalesced += 1
+        self.pending[key] = (obj, value)
+        _scheduler.schedule("SetCommands", self.flush, priority=-1)
+
+
+    def settle(self, obj: UObject, property: str) -> None:
+        """Perform the pending write to the object's property, if there is one, ahead of the rest."""
+        key = (obj.GetAddress(), property)
+        if key in self.pending:
+            self._perform(key, *self.pending.pop(key))
+
+
+    def flush(self) -> None:
+        """Perform every pending write."""
+        pending = self.pending
+        self.pending = {}
+        for key, (obj, value) in pending.items():
+            self._perform(key, obj, value)
+
+
+    def clear(self) -> None:
+        """Discard every pending write, and forget the path names of the objects we wrote to."""
+        self.pending.clear()
+        self.paths.clear()
+
+
+    def _perform(self, key: Tuple[int, str], obj: UObject, value: str) -> None:
+        path = self.paths.get(key[0])
+        if path is None:
+            path = self.paths[key[0]] = UObject.PathName(obj)
+
+        command = f"set {path} {key[1]} {value}"
+        self.commands += 1
+        self.bytes += len(command)
+        GetEngine().GamePlayers[0].Actor.ConsoleCommand(command, False)
+
+
+_commands: commandqueue = commandqueue()
+"""The queue of property writes to be performed with `set` console commands."""
+
+
+def _set_command(obj: UObject, property: str, value: Union[str, Iterable[str]]) -> None:
+    """Queue a console command to set the given object's property to the specified value(s)."""
+    _commands.set(obj, property, value if isinstance(value, str) else f"({','.join(value)})")
+
+
+def _array_string(string: str) -> str:
+    """
+    Return the string with its quotes escaped, enclosed in quotes, followed by a comma. This format
+    is suitable for concatenation into an array as the value for a `set` console command.
+    """
+    string = string.replace('"', '\\"')
+    return f"\"{string}\","
+
+
+class stat:
+    """A series of measurements of one kind, such as the durations of a hook's calls."""
+
+    __slots__ = ("timed", "count", "total", "maximum", "samples")
+
+    timed: bool
+    """Whether the measurements are durations in seconds, as opposed to counts."""
+    count: int
+    """The number of measurements taken."""
+    total: float
+    """The sum of every measurement taken."""
+    maximum: float
+    """The largest measurement taken."""
+    samples: deque
+    """The most recent measurements, from which percentiles are taken."""
+
+    def __init__(self, timed: bool) -> None:
+        self.timed = timed
+        self.count = 0
+        self.total = 0
+        self.maximum = 0
+        self.samples = deque(maxlen=_STAT_SAMPLES)
+
+
+    def percentile(self, fraction: float) -> float:
+        """Return the given percentile of the recent measurements, as a fraction between 0 and 1."""
+        if not self.samples:
+            return 0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+    def row(self, name: str) -> Dict[str, Union[str, float]]:
+        """Summarize the measurements, with durations in microseconds."""
+        scale = 1e6 if self.timed else 1
+        return {
+            "name": name,
+            "unit": "us" if self.timed else "count",
+            "count": self.count,
+            "total": self.total * scale,
+            "mean": self.total * scale / self.count if self.count else 0,
+            "p50": self.percentile(0.50) * scale,
+            "p95": self.percentile(0.95) * scale,
+            "p99": self.percentile(0.99) * scale,
+            "max": self.maximum * scale,
+        }
+
+
+class instrumentation:
+    """
+    Measurements of the work we do while the game runs: the latency of each of our hooks and
+    scheduled tasks, the number of pawns visited in each walk of the pawn list, and the size of each
+    rebuild of our name list. While disabled, our hooks are registered without the wrapping that
+    times them, and nothing else is measured.
+    """
+
+    __slots__ = ("enabled", "stats")
+
+    enabled: bool
+    """Whether measurements are currently being taken."""
+    stats: Dict[str, stat]
+    """The measurements taken, by name."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.stats = {}
+
+
+    def record(self, name: str, value: float, timed: bool = False) -> None:
+        """Add a measurement to the named series."""
+        series = self.stats.get(name)
+        if series is None:
+            series = self.stats[name] = stat(timed)
+        series.count += 1
+        series.total += value
+        if value > series.maximum:
+            series.maximum = value
+        series.samples.append(value)
+
+
+    def instrument(self, function: str, hook: Callable[[UObject, UFunction, FStruct], bool]) -> Callable[[UObject, UFunction, FStruct], bool]:
+        """
+        Return the hook wrapped so as to time its calls. For hooks that call the hooked function
+        themselves, this includes the time spent in the function.
+        """
+        name = "hook " + function
+        def instrumented(caller: UObject, ufunction: UFunction, params: FStruct) -> bool:
+            started = perf_counter()
+            try:
+                return hook(caller, ufunction, params)
+            finally:
+                self.record(name, perf_counter() - started, timed=True)
+        instrumented.__wrapped__ = hook
+        return instrumented
+
+
+    def rows(self) -> List[Dict[str, Union[str, float]]]:
+        """Summarize each series of measurements, in order of name."""
+        return [self.stats[name].row(name) for name in sorted(self.stats)]
+
+
+    def dump(self, path: str) -> str:
+        """
+        Write the summaries to a CSV file if the path ends in .csv, otherwise to a JSON file. Relative
+        paths are taken to be relative to the mod's folder. Returns the full path written to.
+        """
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        rows = self.rows()
+        with open(path, "w", newline="") as file:
+            if path.lower().endswith(".csv"):
+                writer = csv.DictWriter(file, ("name", "unit", "count", "total", "mean", "p50", "p95", "p99", "max"))
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                json.dump(rows, file, indent=1)
+        return path
+
+
+_STAT_SAMPLES: int = 4096
+"""The number of recent measurements each series keeps for the calculation of percentiles."""
+
+_stats: instrumentation = instrumentation()
+"""Our measurements of the work we do while the game runs."""
+
+
+class profiler:
+    """
+    A cProfile capture of our hooks and scheduled routines. The profile is only enabled while one of
+    them is running, so that the rest of the game's frame neither appears in it nor is slowed by it.
+    """
+
+    __slots__ = ("profile", "depth")
+
+    profile: Optional[cProfile.Profile]
+    """The profile being captured, if any."""
+    depth: int
+    """The number of our hooks and routines currently running, counting those that are nested."""
+
+    def __init__(self) -> None:
+        self.profile = None
+        self.depth = 0
+
+
+    @property
+    def active(self) -> bool:
+        """Whether a profile is being captured."""
+        return self.profile is not None
+
+
+    def begin(self) -> None:
+        """Note that one of our hooks or routines has begun, enabling the profile if need be."""
+        self.depth += 1
+        if self.depth == 1:
+            self.profile.enable()
+
+
+    def end(self) -> None:
+        """Note that one of our hooks or routines has ended, disabling the profile if need be."""
+        self.depth -= 1
+        if self.depth == 0:
+            self.profile.disable()
+
+
+    def instrument(self, hook: Callable[[UObject, UFunction, FStruct], bool]) -> Callable[[UObject, UFunction, FStruct], bool]:
+        """
+        Return the hook wrapped so as to be included in the profile. Once the profile is no longer
+        being captured, the wrapped hook simply runs the hook.
+        """
+        def profiled(caller: UObject, ufunction: UFunction, params: FStruct) -> bool:
+            if self.profile is None:
+                return hook(caller, ufunction, params)
+            self.begin()
+            try:
+                return hook(caller, ufunction, params)
+            finally:
+                self.end()
+        profiled.__wrapped__ = hook
+        return profiled
+
+
+    def start(self) -> None:
+        """Begin capturing a new profile."""
+        self.profile = cProfile.Profile()
+        self.depth = 0
+
+
+    def discard(self) -> None:
+        """Stop capturing the profile, if any, without writing it."""
+        if self.depth:
+            self.profile.disable()
+        self.profile = None
+        self.depth = 0
+
+
+    def stop(self, path: str) -> Optional[Tuple[str, str]]:
+        """
+        Stop capturing the profile, and write it to the given path with the extension .pstats, as
+        well as in collapsed stack format with the extension .txt. Returns the two paths written, or
+        None if none of our hooks or routines ran while capturing, leaving nothing to write.
+        """
+        try:
+            # Stats refuses to be created from a profile with nothing in it.
+            self.profile.create_stats()
+            if not self.profile.stats:
+                return None
+            stats = Stats(self.profile)
+        finally:
+            self.discard()
+
+        stats.dump_stats(path + ".pstats")
+        with open(path + ".txt", "w") as file:
+            file.writelines(f"{stack} {round(seconds * 1e6)}\n" for stack, seconds in _collapsed_stacks(stats.stats).items())
+        return path + ".pstats", path + ".txt"
+
+
+def _collapsed_stacks(stats: Dict[Tuple[str, int, str], tuple]) -> Dict[str, float]:
+    """
+    Convert profile statistics into the time spent in each call stack, as used by flame graph tools.
+    cProfile only records which functions called which, so the time a function spent on behalf of
+    each of its callers is apportioned by the share of its cumulative time attributed to each.
+    """
+    callees: Dict[tuple, Dict[tuple, float]] = defaultdict(dict)
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees[caller][function] = cumulative
+
+    stacks: Dict[str, float] = defaultdict(float)
+
+    def walk(function: tuple, path: Tuple[tuple, ...], stack: Tuple[str, ...], share: float) -> None:
+        filename, line, name = function
+        path = (*path, function)
+        stack = (*stack, name if filename == "~" else f"{name} ({os.path.basename(filename)}:{line})")
+        own_time = stats[function][2] * share
+        if own_time > 0:
+            stacks[";".join(stack)] += own_time
+
+        # Recursive calls are folded into the first appearance of the function in the stack, and
+        # stacks too deep or too brief to matter are not followed.
+        if len(path) >= _PROFILE_STACK_DEPTH:
+            return
+        for callee, callee_cumulative in callees[function].items():
+            total = stats[callee][3]
+            if callee not in path and share * callee_cumulative >= _PROFILE_STACK_MINIMUM and total > 0:
+                walk(callee, path, stack, share * callee_cumulative / total)
+
+    # Our hooks and routines are the functions called from outside of the profile.
+    for function, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            walk(function, (), (), 1.0)
+    return stacks
+
+
+_PROFILE_STACK_DEPTH: int = 48
+"""The depth beyond which call stacks are not followed when collapsing a profile."""
+
+_PROFILE_STACK_MINIMUM: float = 1e-6
+"""The time in seconds below which call stacks are not followed when collapsing a profile."""
+
+_profiler: profiler = profiler()
+"""The capture of our hooks and scheduled routines' profile, while one is in progress."""
+
+
+class recorder:
+    """
+    A recording of the hook events we see, appended to a file as they occur so that they may later
+    be replayed against the simulator in `bench.replay`. Each recording begins with a line holding a
+    JSON object that describes it, followed by a line for each event holding a JSON array of the
+    number of frames since the previous event, the event's code (see `_recorded_events`), and its
+    fields. Pawns are identified by numbers assigned on their first appearance, and each string is
+    written in full on its first appearance only, being referred to by its order of appearance
+    thereafter.
+    """
+
+    __slots__ = ("file", "frames", "pawns", "pawn_count", "strings")
+
+    file: Optional[TextIO]
+    """The file being recorded to, if any."""
+    frames: int
+    """The number of frames that have begun since the last event was recorded."""
+    pawns: Dict[int, int]
+    """Maps the addresses of the pawns in the recording to the numbers they were assigned."""
+    pawn_count: int
+    """The number of pawns that have been assigned numbers."""
+    strings: Dict[str, int]
+    """Maps the strings written in the recording to their order of appearance."""
+
+    def __init__(self) -> None:
+        self.file = None
+        self.frames = 0
+        self.pawns = {}
+        self.pawn_count = 0
+        self.strings = {}
+
+
+    @property
+    def active(self) -> bool:
+        """Whether we are recording."""
+        return self.file is not None
+
+
+    def start(self, path: str) -> str:
+        """
+        Begin recording to the given file, appending to it should it already exist. Relative paths
+        are taken to be relative to the mod's folder. Returns the full path recorded to.
+        """
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        self.file = open(path, "a")
+        self.frames = 0
+        self.pawns.clear()
+        self.pawn_count = 0
+        self.strings.clear()
+
+        world_info = GetEngine().GetCurrentWorldInfo()
+        self.file.write(json.dumps({
+            "recording": "ReignOfGiants", "version": _RECORDING_VERSION,
+            "map": world_info.GetMapName(), "net_mode": world_info.NetMode, "seed": _rolls.seed,
+        }) + "\n")
+
+        # Note the pawns already in the map, such that the events involving them can be replayed. As
+        # new pawns are added to the head of the pawn list, the oldest are noted first.
+        for pawn in reversed(list(aipawn.all())):
+            self.write("P", self.fields("P", pawn.uobject, None))
+            self.write("A", (*self.fields("A", pawn.uobject, None), int(pawn.is_giant)))
+
+        RunHook("WillowGame.WillowGameViewportClient.Tick", "ReignOfGiants.Recorder", self.tick)
+        return path
+
+
+    def stop(self) -> None:
+        """Finish the recording, noting how many frames passed after its final event."""
+        RemoveHook("WillowGame.WillowGameViewportClient.Tick", "ReignOfGiants.Recorder")
+        self.write("E", ())
+        self.file.close()
+        self.file = None
+        self.pawns.clear()
+        self.strings.clear()
+
+
+    def tick(self, caller: UObject, function: UFunction, params: FStruct) -> bool:
+        # Our events are only flushed to the file between frames, such that at most a frame's worth
+        # of them would be lost if the game were to crash.
+        self.file.flush()
+        self.frames += 1
+        return True
+
+
+    def pawn(self, pawn: Optional[UObject]) -> int:
+        """Return the number identifying the pawn in the recording, or 0 for None."""
+        if pawn is None:
+            return 0
+        address = pawn.GetAddress()
+        number = self.pawns.get(address)
+        if number is None:
+            self.pawn_count += 1
+            number = self.pawns[address] = self.pawn_count
+        return number
+
+
+    def fields(self, code: str, caller: UObject, params: FStruct) -> tuple:
+        """Return the fields to record for the event, as they stand before our hook has run."""
+        if code == "G":
+            world_info = GetEngine().GetCurrentWorldInfo()
+            return world_info.GetMapName(), world_info.NetMode
+        if code == "P":
+            return self.pawn(caller), None if caller.AIClass is None else UObject.PathName(caller.AIClass)
+        if code == "S":
+            spawn = params.SpawnLocationContextObject
+            return self.pawn(params.SpawnedPawn), self.pawn(None if spawn is None else spawn.Owner)
+        if code in ("A", "L"):
+            pawn = aipawn(caller)
+            balance = pawn.balance
+            return (
+                self.pawn(caller), None if balance is None else UObject.PathName(balance),
+                pawn.grade_index, caller.NameListIndex, caller.TransformType,
+            )
+        if code == "R":
+            return self.pawn(caller), params.VarName
+        if code == "T":
+            return self.pawn(params.ContextObject), caller.Transform
+        if code in ("D", "X"):
+            return self.pawn(caller),
+        return ()
+
+
+    def write(self, code: str, fields: Iterable[Union[int, str, None]]) -> None:
+        """Append an event to the recording, with the frames since the previous one."""
+        line = [self.frames, code]
+        for field in fields:
+            if type(field) is str:
+                index = self.strings.get(field)
+                if index is None:
+                    self.strings[field] = len(self.strings)
+                else:
+                    field = index
+            line.append(field)
+        self.file.write(json.dumps(line, separators=(",", ":")) + "\n")
+        self.frames = 0
+
+
+    def instrument(self, function: str, hook: Callable[[UObject, UFunction, FStruct], bool]) -> Callable[[UObject, UFunction, FStruct], bool]:
+        """
+        Return the hook wrapped so as to record its events. The events that may roll Gigantism are
+        written once our hook has run, with whether the pawn is a Giant as their final field; all
+        others are written before it runs, so as to precede any events nested within it. Once we
+        are no longer recording, the wrapped hook simply runs the hook.
+        """
+        code = _recorded_events[function]
+        def recorded(caller: UObject, ufunction: UFunction, params: FStruct) -> bool:
+            if self.file is None:
+                return hook(caller, ufunction, params)
+            fields = self.fields(code, caller, params)
+            if code not in ("A", "L"):
+                self.write(code, fields)
+            try:
+                return hook(caller, ufunction, params)
+            finally:
+                if code in ("A", "L"):
+                    self.write(code, (*fields, int(aipawn(caller).is_giant)))
+                # Once a pawn has been destroyed, its address may be reused by a new one.
+                elif code == "X":
+                    self.pawns.pop(caller.GetAddress(), None)
+        recorded.__wrapped__ = hook
+        return recorded
+
+
+_RECORDING_VERSION: int = 2
+"""The version of the format of our recordings, to be incremented whenever it changes."""
+
+_recorded_events: Dict[str, str] = {
+    "Engine.GameReplicationInfo.PostBeginPlay":                                "G",
+    "Engine.PlayerReplicationInfo.ClientInitialize":                           "I",
+    "WillowGame.WillowAIPawn.PostBeginPlay":                                   "P",
+    "WillowGame.PopulationFactoryBalancedAIPawn.SetupBalancedPopulationActor": "S",
+    "Engine.Pawn.ApplyBalanceDefinitionCustomizations":                        "A",
+    "WillowGame.WillowAIPawn.ReplicatedEvent":                                 "R",
+    "WillowGame.WillowAIPawn.AILevelUp":                                       "L",
+    "WillowGame.Behavior_Transform.ApplyBehaviorToContext":                    "T",
+    "WillowGame.WillowAIPawn.Died":                                            "D",
+    "Engine.Pawn.Destroyed":                                                   "X",
+}
+"""
+The code for each of our hooks' events in recordings. Their fields are, in order:
+    G: map name, net mode
+    I: (none)
+    P: pawn, AI class path
+    S: pawn, parent pawn (or 0 for none)
+    A, L: pawn, balance path, grade index, name list index, transform type, whether it is a Giant
+    R: pawn, replicated property name
+    T: pawn, transform type
+    D, X: pawn
+    E: (none, marks the end of a recording)
+"""
+
+_recorder: recorder = recorder()
+"""The recording of our hook events, while one is in progress."""
+
+
+class task:
+    """A routine scheduled to be run by the scheduler."""
+
+    __slots__ = ("name", "routine", "priority", "generator", "rerun")
+
+    name: str
+    routine: Callable[[], Union[Optional[bool], Generator[Optional[bool], None, Optional[bool]]]]
+    priority: int
+    generator: Optional[Generator[Optional[bool], None, Optional[bool]]]
+    """If the routine is a generator function, the generator for its current run."""
+    rerun: bool
+    """Whether the routine was requested again during its current run, and must be run afresh."""
+
+    def __init__(self, name: str, routine: Callable, priority: int):
+        self.name = name
+        self.routine = routine
+        self.priority = priority
+        self.generator = None
+        self.rerun = False
+
+
+class scheduler:
+    """
+    Runs routines on game ticks, using a single Tick hook for all of them. A routine is run each
+    tick until it returns something other than True. Requests to schedule a routine that is already
+    scheduled are merged into the existing one.
+
+    Routines with higher priorities are run first. Once the time spent on a tick exceeds the budget
+    in TickBudget, the remaining routines wait for the next tick, except for those with negative
+    priorities, which finish off each tick's work regardless of the budget. Routines that only use
+    time left over once everything else is done have a priority of 0. Routines that are generator
+    functions may yield to let the scheduler check the budget, and if it has been exceeded, they are
+    resumed from there on the next tick; they may also yield True to be resumed on the next tick
+    regardless. Such routines must take into account that pawns may have been destroyed by the time
+    they are resumed, and should not hold on to them across ticks. Requests to schedule a generator
+    function's routine in the middle of its run have it run again once the run completes, as the
+    run may have already passed over whatever prompted the request.
+    """
+
+    __slots__ = ("tasks", "frame", "deadline")
+
+    tasks: Dict[str, task]
+    """The scheduled tasks, by name."""
+    frame: int
+    """The number of ticks the scheduler has run on, with which routines can tell ticks apart."""
+    deadline: float
+    """The time by which the scheduler should stop running routines on the current tick."""
+
+    def __init__(self) -> None:
+        self.tasks = {}
+        self.frame = 0
+        self.deadline = 0.0
+
+
+    def schedule(self, name: str, routine: Callable, priority: int = 1) -> None:
+        """Schedule a routine to be invoked each game tick until it returns something other than True."""
+        scheduled_task = self.tasks.get(name)
+        if scheduled_task is not None:
+            if scheduled_task.generator is not None:
+                scheduled_task.rerun = True
+            return
+
+        # Hook the scheduler if it has nothing else scheduled.
+        if not self.tasks:
+            RunHook("WillowGame.WillowGameViewportClient.Tick", "ReignOfGiants.Scheduler", self.tick)
+        self.tasks[name] = task(name, routine, priority)
+
+
+    def clear(self) -> None:
+        """Unschedule every task, and unhook the scheduler."""
+        for scheduled_task in self.tasks.values():
+            if scheduled_task.generator is not None:
+                scheduled_task.generator.close()
+        self.tasks.clear()
+        RemoveHook("WillowGame.WillowGameViewportClient.Tick", "ReignOfGiants.Scheduler")
+
+
+    def tick(self, caller: UObject, function: UFunction, params: FStruct) -> bool:
+        # While we are profiling, include the routines we run in the profile.
+        if _profiler.active:
+            _profiler.begin()
+            try:
+                return self._tick()
+            finally:
+                _profiler.end()
+        return self._tick()
+
+
+    def _tick(self) -> bool:
+        started = perf_counter()
+        measure = _stats.enabled
+        self.frame += 1
+        self.deadline = started + TickBudget.CurrentValue / 1000
+
+        # Run the tasks in order of priority, until we run out of time. The first task is always
+        # run, so that some progress is made regardless of the budget.
+        scheduled_tasks = sorted(self.tasks.values(), key=lambda scheduled_task: -scheduled_task.priority)
+        out_of_time = False
+        for scheduled_task in scheduled_tasks:
+            if not out_of_time or scheduled_task.priority < 0:
+                out_of_time = self._run(scheduled_task, measure) or out_of_time
+
+        # Tasks with negative priorities that were scheduled by the routines we ran are also due.
+        for scheduled_task in [
+            scheduled_task for scheduled_task in self.tasks.values()
+            if scheduled_task.priority < 0 and scheduled_task not in scheduled_tasks
+        ]:
+            self._run(scheduled_task, measure)
+
+        # Unhook the scheduler if it has nothing left to do.
+        if not self.tasks:
+            RemoveHook("WillowGame.WillowGameViewportClient.Tick", "ReignOfGiants.Scheduler")
+
+        if measure:
+            _stats.record("scheduler tick", perf_counter() - started, timed=True)
+        return True
+
+
+    def _run(self, scheduled_task: task, measure: bool = False) -> bool:
+        """
+        Run a task until it completes, or until it yields after the deadline has passed. Tasks that
+        complete without returning True are unscheduled. Returns whether the deadline has passed.
+        """
+        if measure:
+            started = perf_counter()
+            try:
+                return self._run(scheduled_task)
+            finally:
+                _stats.record("task " + scheduled_task.name, perf_counter() - started, timed=True)
+
+        try:
+            # If the task is not in the middle of a run, start a new one. Routines that are not
+            # generator functions complete their run right away.
+            if scheduled_task.generator is None:
+                result = scheduled_task.routine()
+                if not isinstance(result, GeneratorType):
+                    if result is not True:
+                        del self.tasks[scheduled_task.name]
+                    return perf_counter() > self.deadline
+                scheduled_task.generator = result
+
+            # Advance the generator until it completes, until it asks to wait for the next tick, or
+            # until we run out of time.
+            while True:
+                if next(scheduled_task.generator):
+                    break
+                if perf_counter() > self.deadline:
+                    return True
+
+        except StopIteration as stop:
+            scheduled_task.generator = None
+            if stop.value is not True and not scheduled_task.rerun:
+                del self.tasks[scheduled_task.name]
+            scheduled_task.rerun = False
+
+        # Should the task fail, unschedule it rather than have it fail again every tick.
+        except Exception:
+            self.tasks.pop(scheduled_task.name, None)
+            raise
+
+        return perf_counter() > self.deadline
+
+
+_scheduler: scheduler = scheduler()
+"""The scheduler for routines that run on game ticks."""
+
+
+def _request_giants() -> Optional[bool]:
+    """Initialize our names list and request the current Giants from the server."""
+
+    # Should our PRI not yet be in place, we must keep ticking until it is.
+    if GetEngine().GamePlayers[0].Actor.PlayerReplicationInfo is None:
+        return True
+
+    # Set up our name list on the GRI, and initialize it with the vanilla names we have.
+    _level.GRI.NameListDef = _name_list
+    _set_command(_name_list, "Names", f"({_level.vanilla_name_list_names})")
+
+    # Send the Giants request to the server. Until the complete list of Giants arrives, any
+    # operations we receive would be out of sequence.
+    global _giants_resyncing
+    _giants_resyncing = True
+    _mod_instance.ServerRequestGiants()
+
+
+def _start_level(GRI: Optional[UObject]) -> None:
+    """
+    Begin a new level context for the map whose GameReplicationInfo has just begun play. Clients
+    request the current Giants from the server once they also have a PlayerReplicationInfo, while
+    the server prepares its name list.
+    """
+    global _level
+    _level.release_giant_ai_classes()
+    world_info = GetEngine().GetCurrentWorldInfo()
+    _level = level(GRI, world_info.NetMode == 3)
+
+    # Should our odds file have been modified, or the new map have odds of its own, compile our
+    # decisions for each AI class afresh, ahead of any pawns rolling.
+    if _odds.update(world_info.GetMapName()):
+        aiclass.compile()
+
+    # Walks of the old level's pawn list must start over with the new one's, drops of loot from the
+    # old level's Giants will not take place, and those Giants' records can go to the new level's.
+    for walk in _pawn_walks:
+        walk.restart = True
+    _loot_queue.clear()
+    _markers.reclaim_all()
+
+    if _level.is_client:
+        if GetEngine().GamePlayers[0].Actor.PlayerReplicationInfo is not None:
+            _level.prepared = True
+            _scheduler.schedule("RequestGiants", _request_giants, priority=2)
+    else:
+        _scheduler.schedule("PrepareLevel", _prepare_level, priority=3)
+
+    # Construct our loot behavior in whatever time is left over once the map is up and running.
+    if LootWarmUp.CurrentValue and LootBehavior is None:
+        _scheduler.schedule("WarmUpLoot", _warm_up_loot, priority=0)
+
+
+def _prepare_level() -> None:
+    """
+    If it has not yet been done in the current map, read the vanilla name list, and set up our own
+    name list with it. This is done on the server, either on the tick after the map's GRI begins
+    play, or as soon as a pawn needs it, whichever comes first.
+    """
+    if _level.prepared:
+        return
+
+    # Should we have missed the GRI beginning play, find it now. If there is none yet, there is
+    # nothing for us to prepare.
+    if _level.GRI is None:
+        _level.GRI = GetEngine().GetCurrentWorldInfo().GRI
+        if _level.GRI is None:
+            return
+    _level.prepared = True
+
+    # If the vanilla name list does in fact exist in this map, populate our records with its values.
+    name_list = _level.GRI.NameListDef
+    if name_list is not None and name_list.Names is not None:
+        for name in name_list.Names:
+            _level.vanilla_name_list_length += 1
+            _level.vanilla_name_list_names += _array_string(name)
+
+    # Send the digest of the new vanilla name list to clients, who will request the list itself
+    # should they not recognize it.
+    _level.vanilla_name_list_digest = _name_list_digest(_level.vanilla_name_list_length, _level.vanilla_name_list_names)
+    _send_vanilla_name_list_digest()
+
+    # Apply the vanilla names to our name list right away, so that they are available to Giants
+    # that use them for their names.
+    _level.names.commit()
+
+    # Assign our name list to the GRI, and schedule an update for the name list's contents.
+    _level.vanilla_name_list = name_list
+    _level.name_list_replaced = True
+    _level.GRI.NameListDef = _name_list
+    _scheduler.schedule("UpdatePawns", _update_pawns)
+
+
+def _name_list_digest(length: int, names: str) -> str:
+    """Hash a name list's length and items."""
+    return hashlib.sha1(f"{length}:{names}".encode("utf-8")).hexdigest()[:16]
+
+
+def _send_vanilla_name_list_digest(PC: Optional[UObject] = None) -> None:
+    """Send the current map's name and the digest of its vanilla name list to the client(s)."""
+    map_name = GetEngine().GetCurrentWorldInfo().GetMapName(True)
+    _mod_instance.ClientCheckVanillaNameList(map_name, _level.vanilla_name_list_digest, PC)
+    _replication_bytes["vanilla_digest"] += len(json.dumps([map_name, _level.vanilla_name_list_digest]))
+
+
+def _load_vanilla_name_lists() -> None:
+    """If enabled, read the vanilla name lists stored on disk into our cache, once per session."""
+    global _vanilla_name_lists_loaded
+    if _vanilla_name_lists_loaded or not NameListCache.CurrentValue:
+        return
+    _vanilla_name_lists_loaded = True
+
+    try:
+        with open(_vanilla_name_lists_path) as file:
+            stored = json.load(file)
+        if not isinstance(stored, dict):
+            raise ValueError(f"expected an object, not {stored!r}")
+    except (OSError, ValueError):
+        return
+
+    # Skip any entries not in the form we write them in, keeping the rest.
+    for map_name, entry in stored.items():
+        try:
+            digest, length, names = entry
+        except (TypeError, ValueError):
+            continue
+        if isinstance(digest, str) and type(length) is int and isinstance(names, str):
+            _vanilla_name_lists.setdefault(map_name, (digest, length, names))
+
+
+def _save_vanilla_name_lists() -> None:
+    """If enabled, write our cache of vanilla name lists to disk."""
+    if not NameListCache.CurrentValue:
+        return
+    try:
+        with open(_vanilla_name_lists_path, "w") as file:
+            json.dump(_vanilla_name_lists, file)
+    except OSError:
+        pass
+
+
+def _apply_vanilla_name_list(digest: str, length: int, names: str) -> None:
+    """Adopt the given vanilla name list as that of the current map, on a client."""
+    if digest == _level.vanilla_name_list_digest:
+        return
+
+    # Giants' names may be derived from the vanilla names, and their indices in the name list follow
+    # the vanilla ones, so every Giant we know of must be named anew.
+    _level.vanilla_name_list_digest = digest
+    _level.vanilla_name_list_length = length
+    _level.vanilla_name_list_names = names
+    _level.pending_giant_IDs.update(_level.names.slots)
+
+    # Apply the vanilla names to our name list right away, so that they are available to Giants
+    # that use them for their names.
+    _level.names.dirty = True
+    _level.names.commit()
+    if _level.pending_giant_IDs:
+        _scheduler.schedule("GigantizePawns", _gigantize_pawns)
+
+
+def _update_pawns() -> Generator[Optional[bool], None, None]:
+    """
+    Bring our name list up to date with the current Giants. Only Giants that are new or marked as
+    stale are named and have their NameListIndex set. This should be scheduled to be run on a game
+    tick, so as to consolidate multiple requests for updates that may occur in quick succession.
+    The pawn list is walked over as many ticks as WalkLimit requires, and should naming the Giants
+    run over the tick's budget, the remainder are named on the next tick. The name list is only
+    committed once the walk is complete.
+    """
+
+    # Vacate the slots of any Giants that have died since our last update. Those of Giants that no
+    # longer exist for other reasons are vacated once we have seen every Giant that does.
+    for ID in [ID for ID in _level.names.slots if not _level.IDs.is_live(ID)]:
+        _level.names.release(ID)
+
+    # For each Giant whose ID is still live that is new or stale, place its name in its slot, and set
+    # its NameListIndex to the slot's index in the name list. Giants that already point to their
+    # slot, and whose names have not gone stale, are left as they are. Giants without IDs cannot be
+    # named, and those whose IDs have been released have died.
+    giant_IDs: Set[int] = set()
+    for giant_pawn in pawnwalk():
+        if giant_pawn is None:
+            yield True
+            continue
+        if not giant_pawn.is_giant:
+            continue
+        ID = giant_pawn.ID
+        if not _level.IDs.is_live(ID):
+            continue
+        giant_IDs.add(ID)
+
+        slot = _level.names.slots.get(ID)
+        if (
+            slot is not None and ID not in _level.stale_giant_IDs
+            and giant_pawn.name_list_index == _level.vanilla_name_list_length + slot
+        ):
+            continue
+        giant_pawn.name_list_index = _level.names.assign(ID, giant_pawn.giant_name_string())
+        _level.stale_giant_IDs.discard(ID)
+        yield
+
+    # Vacate the slots of any Giants we did not see, and forget that they were stale. Giants we did
+    # see that have gone stale since we named them will be named again when we are rerun.
+    for ID in [ID for ID in _level.names.slots if ID not in giant_IDs]:
+        _level.names.release(ID)
+    _level.stale_giant_IDs.intersection_update(giant_IDs)
+
+    # If any slots changed, apply the new names to the name list, and send the operations performed
+    # on the slots to clients.
+    _level.names.commit()
+    operations = _level.names.take_operations()
+    if operations:
+        _send_giant_operations(operations)
+
+
+def _send_giant_operations(operations: List[int]) -> None:
+    """Send clients the next batch of operations performed on the Giants' slots."""
+    global _giants_sequence
+    _giants_sequence += 1
+    _mod_instance.ClientUpdateGiantsDelta(_giants_sequence, operations)
+
+    _replication_bytes["delta"] += len(json.dumps([_giants_sequence, operations]))
+    _replication_bytes["full_equivalent"] += len(json.dumps([_giants_sequence, _level.names.IDs]))
+
+
+def _gigantize_pawns() -> Generator[Optional[bool], None, Optional[bool]]:
+    """
+    Find each Giant pawn that is pending Gigantization, Gigantize it, and place its Gigantized name
+    in the slot the server has given it. The pawn list is walked over as many ticks as WalkLimit
+    requires, and should this run over the tick's budget, the remaining Giants are found on the next
+    tick. The name list is only committed once the walk is complete.
+    """
+
+    # Get the current game replication info. If it has not yet begun play, tick until it has.
+    GRI = _level.GRI
+    if GRI is None:
+        return True
+
+    # For each current pawn, check whether its ID is among those pending Gigantization. Pawns that
+    # have not yet been assigned an ID are never pending. Any Giants still pending once we have seen
+    # every pawn have not been replicated to us.
+    for pawn in pawnwalk():
+        if pawn is None:
+            yield True
+            continue
+        ID = pawn.ID
+        if ID not in _level.pending_giant_IDs:
+            continue
+
+        # Giants that have since been evicted from their slot are no longer ours to name.
+        slot = _level.names.slots.get(ID)
+        if slot is None:
+            _level.pending_giant_IDs.discard(ID)
+            continue
+
+        # If we encounter a Giant that is not yet had its, balance definition applied, stop here
+        # and try again on the next tick.
+        if pawn.balance is None:
+            return True
+
+        # Giants that have already been Gigantized only need renaming.
+        if ID not in _level.gigantized_IDs:
+            pawn.gigantize()
+            _level.gigantized_IDs.add(ID)
+
+        # Generate the Giant's name and place it in its slot, pointing the Giant at the slot's
+        # index in the name list.
+        pawn.name_list_index = _level.names.assign(ID, pawn.giant_name_string())
+        _level.pending_giant_IDs.discard(ID)
+
+        # Once every pending Giant has been found, there is no need to look at the remaining pawns.
+        if not _level.pending_giant_IDs:
+            break
+        yield
+
+    # Make sure our name list is applied to the world info, and apply our names to it. Clients have
+    # no use for the record of operations performed on the slots.
+    GRI.NameListDef = _name_list
+    _level.names.commit()
+    _level.names.take_operations()
+
+
+def _construct_persistent_object(uclass: str, outer: Optional[UObject], name: str, template: Optional[UObject] = None) -> UObject:
+    """
+    Find the object of ours with the given name, or construct it if there is none, optionally from a
+    template, and keep it alive. Objects we let go of when disabled may still be around to be found
+    when next enabled, and constructing another under the same name would clash with them.
+    """
+    path = name if outer is None else f"{UObject.PathName(outer)}.{name}"
+    uobject = FindObject(uclass, path)
+    if uobject is None:
+        if template is None:
+            uobject = ConstructObject(uclass, outer, name)
+        else:
+            uobject = ConstructObject(uclass, outer, name, Template=template)
+    KeepAlive(uobject)
+    return uobject
+
+
+def _loot_construction_steps() -> Generator[None, None, None]:
+    """
+    Construct our loot behavior and its item pools, yielding after each pool. LootBehavior is only
+    set once every pool is in place. Each object is noted in _loot_objects as it is kept alive, such
+    that they can be let go of however far construction got.
+    """
+    global LootBehavior
+
+    behavior = _construct_persistent_object("Behavior_SpawnLootAroundPoint", _package, "LootBehavior")
+    _loot_objects.append(behavior)
+
+    def _construct_item_pool(name: str, items: Iterable[Tuple[str, Union[str, float]]]) -> UObject:
+        """
+        Constructs an ItemPoolDefinition with the given object paths and weights. Weights can be
+        either a float representing Probability's BaseValueConstant, or a string representing
+        the object path to its InitializationDefinition.
+        """
+        item_pool = _construct_persistent_object("ItemPoolDefinition", behavior, name)
+        _loot_objects.append(item_pool)
+
+        balanced_items = []
+
+        for pool, weight in items:
+            if type(weight) is float:
+                probability = f"(BaseValueConstant={weight},BaseValueScaleConstant=1)"
+            elif type(weight) is str:
+                probability = f"(InitializationDefinition={weight},BaseValueScaleConstant=1)"
+
+            balanced_item = f"(ItmPoolDefinition={pool},Probability={probability},bDropOnDeath=True)"
+            balanced_items.append(balanced_item)
+
+        _set_command(item_pool, "BalancedItems", balanced_items)
+        _commands.settle(item_pool, "BalancedItems")
+
+        return item_pool
+
+    # Create a legendary weapon loot pool that mimics the vanilla legendary pool, except with no
+    # pearl drops (these will come from the Tubby pearl pool).
+    _legendary_pool = _construct_item_pool("LegendaryWeaponPool", (
+        ( "GD_Itempools.WeaponPools.Pool_Weapons_Pistols_06_Legendary",       100.0 ),
+        ( "GD_Itempools.WeaponPools.Pool_Weapons_AssaultRifles_06_Legendary",  80.0 ),
+        ( "GD_Itempools.WeaponPools.Pool_Weapons_SMG_06_Legendary",            80.0 ),
+        ( "GD_Itempools.WeaponPools.Pool_Weapons_Shotguns_06_Legendary",       80.0 ),
+        ( "GD_Itempools.WeaponPools.Pool_Weapons_SniperRifles_06_Legendary",   55.0 ),
+        ( "GD_Itempools.WeaponPools.Pool_Weapons_Launchers_06_Legendary",      20.0 ),
+    ))
+    yield
+
+    # Create a legendary shield loot pool identical to the vanilla one, except with the omission
+    # of the roid shield pool, since it only drops non-unique Bandit shields.
+    _shield_pool = _construct_item_pool("LegendaryShieldPool", (
+        ( "GD_Itempools.ShieldPools.Pool_Shields_Standard_06_Legendary",         1.0 ),
+        ( "GD_Itempools.ShieldPools.Pool_Shields_NovaShields_All_06_Legendary",  1.0 ),
+        ( "GD_Itempools.ShieldPools.Pool_Shields_SpikeShields_All_06_Legendary", 1.0 ),
+        ( "GD_Itempools.ShieldPools.Pool_Shields_Juggernaut_06_Legendary",       1.0 ),
+        ( "GD_Itempools.ShieldPools.Pool_Shields_Booster_06_Legendary",          1.0 ),
+        ( "GD_Itempools.ShieldPools.Pool_Shields_Absorption_06_Legendary",       1.0 ),
+        ( "GD_Itempools.ShieldPools.Pool_Shields_Impact_06_Legendary",           1.0 ),
+        ( "GD_Itempools.ShieldPools.Pool_Shields_Chimera_06_Legendary",          1.0 ),
+    ))
+    yield
+
+    # THe name of the initialization definition object which is used to scale Tubby pearl drop
+    # weight based on item level. This maxes out at 0.2 at level 80.
+    pearl_weight = "GD_Lobelia_Itempools.Weighting.Weight_Lobelia_Pearlescent_Tubbies"
+
+    # Create the standard item pool from which each Giant's item drop will be selected.
+    _item_pool = _construct_item_pool("ItemPool", (
+        ( "GD_Lobelia_Itempools.WeaponPools.Pool_Lobelia_Pearlescent_Weapons_All", pearl_weight ),
+        # The weights of the pools that aren't the Tubby loot pool should add up to 0.2, such
+        # that the odds of a Pearl max out at 50% at level 80.
+        ( UObject.PathName(_legendary_pool),                              0.080 ),
+        ( UObject.PathName(_shield_pool),                                 0.030 ),
+        ( "GD_Itempools.GrenadeModPools.Pool_GrenadeMods_06_Legendary",   0.030 ),
+        # The Tubby class mod pool should be 3x the weight of the main game class mod pool, such
+        # that every legendary class mod has an equal chance of dropping.
+        ( "GD_Lobelia_Itempools.ClassModPools.Pool_ClassMod_Lobelia_All", 0.045 ),
+        ( "GD_Itempools.ClassModPools.Pool_ClassMod_06_Legendary",        0.015 ),
+    ))
+    yield
+
+    # Retrieve the green items loot pool to serve as the base for our PreLegendaryPool object.
+    uncommon_pool = FindObject("ItemPoolDefinition", "GD_Itempools.EnemyDropPools.Pool_GunsAndGear_02_Uncommon")
+    _early_pool = _construct_persistent_object("ItemPoolDefinition", behavior, "PreLegendaryPool", template=uncommon_pool)
+    _loot_objects.append(_early_pool)
+
+    # Set the max level for the PreLegendaryPool to be able to drop items to 5.
+    _early_pool.MaxGameStageRequirement = FindObject("AttributeDefinition", "GD_Itempools.Scheduling.Gamestage_05")
+    yield
+
+    # Set our loot behavior to spawn one instance of the main item pool, or five instances of
+    # the pre-legendary loot pool.
+    _set_command(behavior, "ItemPools", (UObject.PathName(pool) for pool in (
+        _item_pool,
+        _early_pool, _early_pool, _early_pool, _early_pool, _early_pool,
+    )))
+    _commands.settle(behavior, "ItemPools")
+
+    # Only once it is complete do we make our loot behavior available for use.
+    LootBehavior = behavior
+
+
+def _construct_loot(steps: Optional[int] = None) -> bool:
+    """
+    Perform the given number of steps in constructing our loot behavior, or every remaining step if
+    unspecified. Returns whether the loot behavior is complete.
+    """
+    global _loot_construction
+
+    if LootBehavior is not None:
+        return True
+    if _loot_construction is None:
+        _loot_construction = _loot_construction_steps()
+
+    started = perf_counter()
+    for _ in islice(_loot_construction, steps):
+        pass
+    _timings["loot"] += perf_counter() - started
+
+    return LootBehavior is not None
+
+
+def _loot_behavior() -> UObject:
+    """Return our loot behavior, completing its construction first if need be."""
+    if LootBehavior is None:
+        _construct_loot()
+    return LootBehavior
+
+
+def _warm_up_loot() -> Generator[None, None, None]:
+    """Construct our loot behavior ahead of any Giants dying, using whatever time is left in ticks."""
+    while not _construct_loot(1):
+        yield
+
+
+class lootqueue:
+    """
+    The drops of loot due from Giants that have died, performed one per tick so that Giants killed
+    together do not spawn all of their loot on the same tick. Each drop spawns its loot around its
+    Giant, which is the context of the drop, so a drop is only put off while its Giant is around to
+    be that context; should the Giant be destroyed first, its drop is performed there and then.
+    """
+
+    __slots__ = "drops"
+
+    drops: deque
+    """The dead Giants whose drops are pending, in the order they died."""
+
+    def __init__(self) -> None:
+        self.drops = deque()
+
+
+    def add(self, pawn: UObject) -> None:
+        """Queue a drop for the pawn."""
+        self.drops.append(pawn)
+        _scheduler.schedule("DropLoot", self.drop)
+        if _stats.enabled:
+            _stats.record("loot queue length", len(self.drops))
+
+
+    def destroyed(self, pawn: UObject) -> None:
+        """Perform any drops for a pawn that is being destroyed, while it remains valid to do so."""
+        address = pawn.GetAddress()
+        remaining = deque()
+        for drop in self.drops:
+            if drop.GetAddress() == address:
+                self._perform(drop)
+            else:
+                remaining.append(drop)
+        self.drops = remaining
+
+
+    def drop(self) -> Generator[Optional[bool], None, None]:
+        """Perform each of the queued drops, on successive ticks."""
+        while self.drops:
+            self._perform(self.drops.popleft())
+            if self.drops:
+                yield True
+
+
+    def flush(self) -> None:
+        """Perform every queued drop immediately, as when we are about to stop running."""
+        while self.drops:
+            self._perform(self.drops.popleft())
+
+
+    def clear(self) -> None:
+        """Forget every queued drop, as when the pawns they refer to are no longer around."""
+        if self.drops:
+            Log(f"Reign Of Giants: Discarding {len(self.drops)} drops of loot from Giants no longer around.")
+            self.drops.clear()
+
+
+    def _perform(self, pawn: UObject) -> None:
+        # Invoke our loot spawning behavior with the dead Giant as the context, as would have been
+        # done had its loot been dropped when it died.
+        _loot_behavior().ApplyBehaviorToContext(pawn, (), None, None, None, ())
+
+
+_loot_queue: lootqueue = lootqueue()
+"""The drops of loot due from Giants that have died."""
+
+
+def _reentrancy_guarded(hook: Callable[[UObject, UFunction, FStruct], bool]) -> Callable[[UObject, UFunction, FStruct], bool]:
+    """
+    Wrap a hook that invokes its original method on the caller, such that calls made to the method
+    on the same caller while the hook is running are allowed through untouched. Calls on other
+    objects, such as pawns spawned in the meantime, are still passed to the hook.
+
+    This means the hook need not be removed and re-added around each invocation of the original
+    method, which is costly on such frequently called methods.
+    """
+
+    # The addresses of the objects on which the hook is currently running. The SDK need not return
+    # the same Python object each time for the same UObject, so we go by address.
+    callers: Set[int] = set()
+
+    def guarded(caller: UObject, function: UFunction, params: FStruct) -> bool:
+        address = caller.GetAddress()
+        if address in callers:
+            return True
+        callers.add(address)
+        try:
+            return hook(caller, function, params)
+        finally:
+            callers.discard(address)
+
+    guarded.__wrapped__ = hook
+    guarded.__doc__ = hook.__doc__
+    return guarded
+
+
+# @Hook("Engine.GameReplicationInfo.PostBeginPlay", "ReignOfGiants")
+def _game_replication_info_post_begin_play(caller: UObject, function: UFunction, params: FStruct) -> bool:
+    """
+    Each map has its own GameReplicationInfo, which begins play as the map is loaded on the server,
+    and as it is replicated to clients.
+    """
+    _start_level(caller)
+    return True
+
+
+# @Hook("Engine.PlayerReplicationInfo.ClientInitialize", "ReignOfGiants")
+def _player_replication_info_client_initialize(caller: UObject, function: UFunction, params: FStruct) -> bool:
+    """
+    A client's PlayerReplicationInfo is initialized once it has been replicated to them. Until then,
+    the client cannot make requests of the server.
+    """
+
+    # If our PRI has arrived after the map's GRI, we are now able to request the Giants.
+    if _level.is_client and _level.GRI is not None and not _level.prepared:
+        _level.prepared = True
+        _scheduler.schedule("RequestGiants", _request_giants, priority=2)
+
+    return True
+
+
+# @Hook("WillowGame.WillowAIPawn.PostBeginPlay", "ReignOfGiants")
+@_reentrancy_guarded
+def _aipawn_post_begin_play(caller: UObject, function: UFunction, params: FStruct) -> bool:
+    """
+    Every single WillowAIPawn, even ones without balances, have this method called after being
+    spawned.
+    """
+    # If we are currently a client, we do not need to do anything here.
+    if _level.is_client:
+        return True
+
+    if not _level.prepared:
+        _prepare_level()
+
+    # Invoke the original method now.
+    DoInjectedCallNext()
+    caller.PostBeginPlay()
+
+    # If a bogus name list index was applied to the pawn, sanitize it now to prevent it from kicking
+    # in with the names we add to the name list.
+    if caller.NameListIndex >= _level.vanilla_name_list_length:
+        caller.NameListIndex = -1
+    return False
+
+
+# @Hook("WillowGame.PopulationFactoryBalancedAIPawn.SetupBalancedPopulationActor", "ReignOfGiants")
+def _setup_balanced_population(caller: UObject, function: UFunction, params: FStruct) -> bool:
+    """
     All pawn entities that we are concerned with are passed through a routine that applies a number
     of properties to them, such as their balance definition and spawn point.
     """
@@ -742,6 +2962,7 @@ def _setup_balanced_population(caller: UObject, function: UFunction, params: FSt
 
 
 # @Hook("Engine.Pawn.ApplyBalanceDefinitionCustomizations", "ReignOfGiants")
+@_reentrancy_guarded
 def _apply_balance_customizations(caller: UObject, function: UFunction, params: FStruct) -> bool:
     """
     All WillowAIPawns that we are interested in will be configured with a balance definition. Once
@@ -749,7 +2970,8 @@ def _apply_balance_customizations(caller: UObject, function: UFunction, params:
     properties involving its target name, whether it's a badass, and other things. This must take
     place after any initializations of the pawn for its AI class.
     """
-    _prepare_lists()
+    if not _level.prepared and not _level.is_client:
+        _prepare_level()
 
     if caller.AIClass is None:
         return True
@@ -761,37 +2983,37 @@ def _apply_balance_customizations(caller: UObject, function: UFunction, params:
     is_giant = pawn.roll_gigantism()
 
     # Get the pawn's ID from its grade index. If it has one, revert its grade index to the vanilla
-    # value before proceeding. If it doesn't, schedule a pawn update to assign it one.
+    # value before proceeding.
     ID = pawn.ID
     if ID > 0:
         pawn.grade_index = pawn.vanilla_grade_index
-    elif GetEngine().GetCurrentWorldInfo().NetMode != 3:
-        _defer_to_tick("UpdatePawns", _update_pawns)
 
-    # Temporarily remove this hook before invoking the original method.
-    RemoveHook("Engine.Pawn.ApplyBalanceDefinitionCustomizations", "ReignOfGiants")
+    # Invoke the original method now.
     DoInjectedCallNext()
     caller.ApplyBalanceDefinitionCustomizations()
-    RunHook("Engine.Pawn.ApplyBalanceDefinitionCustomizations", "ReignOfGiants", _apply_balance_customizations)
 
     # If the pawn had an ID, re-encode it now.
     if ID > 0:
         pawn.encode_ID(ID)
 
     # If we are currently a client, we have nothing more to do.
-    if GetEngine().GetCurrentWorldInfo().NetMode == 3:
+    if _level.is_client:
         return False
 
+    # If the pawn did not have an ID, assign it one now that its grade index has been applied.
+    if ID <= 0:
+        _assign_ID(pawn)
+
     # Ensure the resulting name list index applied to the pawn isn't bogus, to prevent it from
     # kicking in with the names we added to the names list.
-    if caller.NameListIndex >= _vanilla_name_list_length:
+    if caller.NameListIndex >= _level.vanilla_name_list_length:
         caller.NameListIndex = -1
 
     # If we did roll a giant, update its balance-dependent properties, then update the name list.
     if is_giant:
         pawn.vanilla_name_list_index = caller.NameListIndex
         pawn.gigantize()
-        _defer_to_tick("UpdatePawns", _update_pawns)
+        _scheduler.schedule("UpdatePawns", _update_pawns)
 
     return False
 
@@ -805,9 +3027,13 @@ def _replicated_event(caller: UObject, function: UFunction, params: FStruct) ->
     """
 
     # If we are being notified of this pawn's balance definition state, this instance has just been
-    # freshly replicated to this client, so we should check whether it needs to be gigantized.
-    if params.VarName == "BalanceDefinitionState" and aipawn(caller).ID in _giant_IDs:
-        _defer_to_tick("GigantizePawns", _gigantize_pawns)
+    # freshly replicated to this client, so we should check whether it needs to be gigantized. Any
+    # other event is of no interest to us, and is dismissed before we so much as wrap the pawn.
+    if params.VarName == "BalanceDefinitionState":
+        ID = aipawn(caller).ID
+        if ID in _level.names.slots:
+            _level.pending_giant_IDs.add(ID)
+            _scheduler.schedule("GigantizePawns", _gigantize_pawns)
 
     return True
 
@@ -820,7 +3046,7 @@ def _ai_level_up(caller: UObject, function: UFunction, params: FStruct) -> bool:
     """
 
     # If we are a client, we have nothing to do.
-    if GetEngine().GetCurrentWorldInfo().NetMode == 3:
+    if _level.is_client:
         return True
 
     DoInjectedCallNext()
@@ -829,13 +3055,17 @@ def _ai_level_up(caller: UObject, function: UFunction, params: FStruct) -> bool:
     # If this pawn is already a Giant, update its name.
     pawn = aipawn(caller)
     if pawn.is_giant:
-        _defer_to_tick("UpdatePawns", _update_pawns)
+        _level.forget_giant_names(pawn.balance)
+        _level.stale_giant_IDs.add(pawn.ID)
+        _scheduler.schedule("UpdatePawns", _update_pawns)
 
     # If we are not a client player, give the pawn a new roll at being a Giant.
     elif pawn.roll_gigantism():
+        if pawn.ID <= 0:
+            _assign_ID(pawn)
         pawn.vanilla_name_list_index = caller.NameListIndex
         pawn.gigantize()
-        _defer_to_tick("UpdatePawns", _update_pawns)
+        _scheduler.schedule("UpdatePawns", _update_pawns)
 
     return False
 
@@ -849,14 +3079,16 @@ def _behavior_transform(caller: UObject, function: UFunction, params: FStruct) -
     """
 
     # If we are a client, we have nothing to do.
-    if GetEngine().GetCurrentWorldInfo().NetMode == 3:
+    if _level.is_client:
         return True
 
     # When one of our giants has a transform invoked on them, we update their name.
     pawn = aipawn(params.ContextObject)
     if pawn.is_giant:
         params.ContextObject.TransformType = caller.Transform
-        _defer_to_tick("UpdatePawns", _update_pawns)
+        _level.forget_giant_names(pawn.balance)
+        _level.stale_giant_IDs.add(pawn.ID)
+        _scheduler.schedule("UpdatePawns", _update_pawns)
 
     return True
 
@@ -865,10 +3097,256 @@ def _behavior_transform(caller: UObject, function: UFunction, params: FStruct) -
 def _died(caller: UObject, function: UFunction, params: FStruct) -> bool:
     """All WillowAIPawns die someday. Circle of WillowAILife."""
 
-    aipawn(caller).drop_loot()
+    # Nearly every pawn that dies is not a Giant, so check for that before anything else. Clients
+    # have nothing to do for them, and the server need only release their ID.
+    record = caller.DebugPawnMarkerInst
+    if record is None or not record.Name.startswith("ReignOfGiants"):
+        if not _level.is_client:
+            ID = aipawn(caller).ID
+            if ID > 0:
+                _level.IDs.release(ID)
+        return True
+
+    pawn = aipawn(caller)
+    pawn.drop_loot()
+
+    # If we are a client, we have nothing more to do.
+    if _level.is_client:
+        return True
+
+    # Release the Giant's ID for reuse, point its corpse back at its vanilla name, and update the
+    # name list to vacate its slot.
+    ID = pawn.ID
+    if ID > 0:
+        _level.IDs.release(ID)
+        caller.NameListIndex = pawn.vanilla_name_list_index
+        _scheduler.schedule("UpdatePawns", _update_pawns)
+
+    # With its loot queued and its name restored, the Giant's record can go to a future Giant.
+    _markers.reclaim(caller, record)
+    return True
+
+
+# @Hook("Engine.Pawn.Destroyed", "ReignOfGiants")
+def _pawn_destroyed(caller: UObject, function: UFunction, params: FStruct) -> bool:
+    """
+    Pawns are destroyed once the game is done with them, dead or otherwise, removing them from the
+    pawn list. Walks of the pawn list that were to visit the pawn next must start over, and drops of
+    loot still due from the pawn must be performed while it is valid. The server releases the pawn's
+    ID, should it not have died to have done so already.
+    """
+    if not _level.is_client and caller.AIClass is not None:
+        ID = aipawn(caller).ID
+        if ID > 0:
+            _level.IDs.release(ID)
+    for walk in _pawn_walks:
+        walk.destroyed(caller)
+    if _loot_queue.drops:
+        _loot_queue.destroyed(caller)
     return True
 
 
+def _restore_pawns() -> Generator[Optional[bool], None, None]:
+    """
+    Once we have been disabled, return the map's pawns to their vanilla state, walking the pawn
+    list over as many ticks as WalkLimit requires.
+    """
+    started = perf_counter()
+    for pawn in pawnwalk():
+        if pawn is None:
+            _timings["restore"] += perf_counter() - started
+            yield True
+            started = perf_counter()
+            continue
+        _restore_pawn(pawn)
+
+    _finish_restoring()
+    _timings["restore"] += perf_counter() - started
+
+
+def _restore_pawn(pawn: pawnsnapshot) -> None:
+    """
+    Return a pawn to its vanilla state. On the server, Giants are shrunk, given back their vanilla
+    names and AI classes, and unmarked, and every pawn's grade index has its ID removed. Clients only
+    shrink the Giants they Gigantized, as the server may still be naming them.
+    """
+
+    # Clients cannot go by their Giants' IDs alone, as the server may be removing them from grade
+    # indices as we go. Along with the pawns whose IDs they Gigantized, they shrink pawns whose IDs
+    # have gone but which are still at the size they Gigantize to, leaving any other sizes alone.
+    if _level.is_client:
+        if _level.gigantized_IDs and (pawn.ID in _level.gigantized_IDs or pawn.is_giant_sized):
+            pawn.ungigantize()
+        return
+
+    if pawn.is_giant:
+        uobject = pawn.uobject
+        pawn.name_list_index = pawn.vanilla_name_list_index
+        pawn.ungigantize()
+
+        # Giants with AI classes cloned only for themselves keep them, as they go with the pawn.
+        ai_class = _vanilla_ai_classes.get(pawn.read("AIClass", uobject, "AIClass").GetAddress())
+        if ai_class is not None:
+            uobject.AIClass = ai_class
+            mind = uobject.MyWillowMind
+            if mind is not None:
+                mind.AIClass = mind.CharacterClass = ai_class
+
+        uobject.DebugPawnMarkerInst = None
+
+    if pawn.ID > 0:
+        pawn.grade_index = pawn.vanilla_grade_index
+
+
+def _finish_restoring() -> None:
+    """
+    Once every pawn has been restored, have the server put the map's vanilla name list back, and
+    remove our remaining hook.
+    """
+    global _vanilla_ai_classes
+    _vanilla_ai_classes = None
+
+    # Should the map have changed since we were disabled, its GameReplicationInfo never had our name
+    # list.
+    GRI = GetEngine().GetCurrentWorldInfo().GRI
+    if _level.name_list_replaced and GRI is not None and GRI.GetAddress() == _level.GRI.GetAddress():
+        GRI.NameListDef = _level.vanilla_name_list
+
+    RemoveHook("Engine.Pawn.Destroyed", "ReignOfGiants")
+
+    # Only once asked to do we collect garbage, as a full collection causes a hitch.
+    if CollectGarbage.CurrentValue:
+        GetEngine().GamePlayers[0].Actor.ConsoleCommand("obj garbage", False)
+
+
+_vanilla_ai_classes: Optional[Dict[int, UObject]] = None
+"""
+While we are restoring pawns after being disabled, the vanilla AI classes that the map's shared
+Giant AI classes were cloned from, by the addresses of the clones.
+"""
+
+_hooks: Tuple[Tuple[str, Callable[[UObject, UFunction, FStruct], bool]], ...] = (
+    ( "Engine.GameReplicationInfo.PostBeginPlay",                                _game_replication_info_post_begin_play     ),
+    ( "Engine.PlayerReplicationInfo.ClientInitialize",                           _player_replication_info_client_initialize ),
+    ( "WillowGame.WillowAIPawn.PostBeginPlay",                                   _aipawn_post_begin_play                    ),
+    ( "WillowGame.PopulationFactoryBalancedAIPawn.SetupBalancedPopulationActor", _setup_balanced_population                 ),
+    ( "Engine.Pawn.ApplyBalanceDefinitionCustomizations",                        _apply_balance_customizations              ),
+    ( "WillowGame.WillowAIPawn.ReplicatedEvent",                                 _replicated_event                          ),
+    ( "WillowGame.WillowAIPawn.AILevelUp",                                       _ai_level_up                               ),
+    ( "WillowGame.Behavior_Transform.ApplyBehaviorToContext",                    _behavior_transform                        ),
+    ( "WillowGame.WillowAIPawn.Died",                                            _died                                      ),
+    ( "Engine.Pawn.Destroyed",                                                   _pawn_destroyed                            ),
+)
+"""The functions we hook, and our hook for each."""
+
+
+def _run_hooks() -> None:
+    """Register each of our hooks, instrumented if we are recording, taking measurements or profiling."""
+    for function, hook in _hooks:
+        if _recorder.active:
+            hook = _recorder.instrument(function, hook)
+        if _stats.enabled:
+            hook = _stats.instrument(function, hook)
+        if _profiler.active:
+            hook = _profiler.instrument(hook)
+        RunHook(function, "ReignOfGiants", hook)
+
+
+def _edit_stats(arguments: Sequence[Any]) -> None:
+    """Control our instrumentation, or log its measurements to console."""
+    try:
+        action, *rest = (arguments[0] if isinstance(arguments, list) else arguments.action).split(maxsplit=1)
+    except (IndexError, ValueError):
+        action, rest = "", []
+
+    if action in ("on", "off"):
+        # Register our hooks afresh, such that they are only wrapped in instrumentation while on.
+        _stats.enabled = action == "on"
+        _run_hooks()
+        Log("Reign Of Giants Stats: " + ("On" if _stats.enabled else "Off"))
+    elif action == "reset":
+        _stats.stats.clear()
+        _marker_stats.update(dict.fromkeys(_marker_stats, 0))
+        Log("Reign Of Giants Stats: Reset")
+    elif action == "dump":
+        try:
+            Log(f"Reign Of Giants Stats: Written to {_stats.dump(rest[0] if rest else 'giantsstats.json')}")
+        except OSError as error:
+            Log(f"Reign Of Giants Stats: Could not write file: {error}")
+    elif action == "":
+        Log("Reign Of Giants Stats: " + ("On" if _stats.enabled else "Off (enable with: giantsstats on)"))
+        for row in _stats.rows():
+            Log(
+                f"    {row['name']}: count={row['count']} total={row['total']:.0f} mean={row['mean']:.1f} "
+                f"p50={row['p50']:.1f} p95={row['p95']:.1f} p99={row['p99']:.1f} max={row['max']:.1f} ({row['unit']})"
+            )
+        Log(
+            f"    marker pool: hits={_marker_stats['hits']} misses={_marker_stats['misses']} "
+            f"reclaimed={_marker_stats['reclaimed']} released={_marker_stats['released']} "
+            f"free={len(_markers.free)} in use={len(_markers.in_use)}"
+        )
+        Log("    timings: " + " ".join(f"{key}={seconds * 1e3:.3f}ms" for key, seconds in _timings.items()))
+    else:
+        Log("Must specify on, off, reset, dump [file], or nothing, e.g.: giantsstats dump giantsstats.csv")
+
+
+def _edit_profile(arguments: Sequence[Any]) -> None:
+    """Start or stop capturing a profile of our hooks and scheduled routines."""
+    try:
+        action = (arguments[0] if isinstance(arguments, list) else arguments.action).strip()
+    except IndexError:
+        action = ""
+
+    if action == "start" and not _profiler.active:
+        # Register our hooks afresh, such that they are only wrapped for profiling while capturing.
+        _profiler.start()
+        _run_hooks()
+        Log("Reign Of Giants Profile: Started")
+    elif action == "stop" and _profiler.active:
+        name = f"giantsprofile-{strftime('%Y%m%d-%H%M%S')}"
+        try:
+            paths = _profiler.stop(os.path.join(os.path.dirname(os.path.abspath(__file__)), name))
+            if paths is None:
+                Log("Reign Of Giants Profile: Stopped, nothing captured")
+            else:
+                Log(f"Reign Of Giants Profile: Written to {paths[0]} and {paths[1]}")
+        except OSError as error:
+            Log(f"Reign Of Giants Profile: Could not write files: {error}")
+        finally:
+            # Register our hooks afresh without their profiling wrappers, however the stop went.
+            _run_hooks()
+    elif action in ("start", "stop"):
+        Log("Reign Of Giants Profile: " + ("Already started" if _profiler.active else "Not started"))
+    else:
+        Log("Must specify start or stop, e.g.: giantsprofile start")
+
+
+def _edit_recording(arguments: Sequence[Any]) -> None:
+    """Start or stop recording our hook events."""
+    try:
+        action, *rest = (arguments[0] if isinstance(arguments, list) else arguments.action).split(maxsplit=1)
+    except (IndexError, ValueError):
+        action, rest = "", []
+
+    if action == "start" and not _recorder.active:
+        try:
+            path = _recorder.start(rest[0] if rest else "giantsrecording.jsonl")
+        except OSError as error:
+            Log(f"Reign Of Giants Recording: Could not open file: {error}")
+            return
+        # Register our hooks afresh, such that they are only wrapped for recording while recording.
+        _run_hooks()
+        Log(f"Reign Of Giants Recording: Recording to {path}")
+    elif action == "stop" and _recorder.active:
+        _recorder.stop()
+        _run_hooks()
+        Log("Reign Of Giants Recording: Stopped")
+    elif action in ("start", "stop"):
+        Log("Reign Of Giants Recording: " + ("Already recording" if _recorder.active else "Not recording"))
+    else:
+        Log("Must specify start [file] or stop, e.g.: giantsrecord start giantsrecording.jsonl")
+
+
 def _toggle_cheat_mode() -> None:
     """Toggle cheat mode and log a message to console."""
     CheatMode.CurrentValue = not CheatMode.CurrentValue
@@ -876,6 +3354,28 @@ def _toggle_cheat_mode() -> None:
     Log("Reign Of Giants Cheat Mode: " + ("On" if CheatMode.CurrentValue else "Off"))
 
 
+def _toggle_loot_warm_up() -> None:
+    """Toggle constructing our loot behavior ahead of time and log a message to console."""
+    LootWarmUp.CurrentValue = not LootWarmUp.CurrentValue
+    ModMenu.SaveModSettings(_mod_instance)
+    Log("Reign Of Giants Loot Warm Up: " + ("On" if LootWarmUp.CurrentValue else "Off"))
+
+
+def _toggle_name_list_cache() -> None:
+    """Toggle storing vanilla name lists on disk and log a message to console."""
+    NameListCache.CurrentValue = not NameListCache.CurrentValue
+    ModMenu.SaveModSettings(_mod_instance)
+    _save_vanilla_name_lists()
+    Log("Reign Of Giants Name List Cache: " + ("On" if NameListCache.CurrentValue else "Off"))
+
+
+def _toggle_collect_garbage() -> None:
+    """Toggle collecting garbage after being disabled and log a message to console."""
+    CollectGarbage.CurrentValue = not CollectGarbage.CurrentValue
+    ModMenu.SaveModSettings(_mod_instance)
+    Log("Reign Of Giants Collect Garbage: " + ("On" if CollectGarbage.CurrentValue else "Off"))
+
+
 def _edit_giant_scale(arguments: Sequence[Any]) -> None:
     """Set the scale for Giants and log a message to console."""
     try:
@@ -886,6 +3386,93 @@ def _edit_giant_scale(arguments: Sequence[Any]) -> None:
         Log("Must specify a valid number, e.g.: giantssize 0.5")
 
 
+def _edit_giant_attribute(arguments: Sequence[Any]) -> None:
+    """Set the multiplier for one of Giants' attributes and log a message to console."""
+    try:
+        attribute, multiplier = (arguments[0] if isinstance(arguments, list) else arguments.attribute).split()
+        multiplier = float(multiplier)
+    except (IndexError, ValueError):
+        Log("Must specify an attribute and a valid multiplier, e.g.: giantsattribute "
+            "GD_Balance_HealthAndDamage.AIParameters.Attribute_HealthMultiplier 4")
+        for attribute, multiplier in GiantAttributes.CurrentValue.items():
+            Log(f"    {attribute} {multiplier}")
+        return
+
+    # A multiplier of 1 would have no effect, so we stop modifying the attribute altogether. We edit
+    # a copy, as the option's current value starts out as the very dict of its starting value.
+    attributes = dict(GiantAttributes.CurrentValue)
+    if multiplier == 1:
+        attributes.pop(attribute, None)
+    else:
+        attributes[attribute] = multiplier
+    GiantAttributes.CurrentValue = attributes
+    ModMenu.SaveModSettings(_mod_instance)
+
+    # Giants from here on out should be given clones of their AI classes using the new multiplier.
+    _level.release_giant_ai_classes()
+    Log(f"Reign Of Giants Giant Attribute: {attribute} {multiplier}")
+
+
+def _edit_tick_budget(arguments: Sequence[Any]) -> None:
+    """Set the per tick time budget for scheduled routines and log a message to console."""
+    try:
+        TickBudget.CurrentValue = float(arguments[0] if isinstance(arguments, list) else arguments.milliseconds)
+        ModMenu.SaveModSettings(_mod_instance)
+        Log(f"Reign Of Giants Tick Budget: {TickBudget.CurrentValue}ms")
+    except (IndexError, ValueError):
+        Log("Must specify a valid number of milliseconds, e.g.: giantsbudget 2")
+
+
+def _edit_walk_limit(arguments: Sequence[Any]) -> None:
+    """Set the per tick limit on pawns visited by scheduled routines and log a message to console."""
+    try:
+        limit = int(arguments[0] if isinstance(arguments, list) else arguments.pawns)
+        if limit < 0:
+            raise ValueError
+        WalkLimit.CurrentValue = limit
+        ModMenu.SaveModSettings(_mod_instance)
+        Log(f"Reign Of Giants Walk Limit: {limit or 'None'}")
+    except (IndexError, ValueError):
+        Log("Must specify a valid number of pawns, or 0 for no limit, e.g.: giantswalk 256")
+
+
+def _reload_odds() -> None:
+    """Read our odds file again should it have been modified, and log the odds for the current map to console."""
+    if _odds.update(GetEngine().GetCurrentWorldInfo().GetMapName()):
+        aiclass.compile()
+    threshold, badass_threshold = _odds.thresholds(None)
+    Log(
+        f"Reign Of Giants Odds: {threshold}/256, badasses {badass_threshold}/256, "
+        f"{len(set(_odds.names()))} AI classes with their own odds "
+        + (f"(from {_odds_path})" if _odds.modified is not None else f"(no file at {_odds_path})")
+    )
+
+
+def _edit_roll_seed(arguments: Sequence[Any]) -> None:
+    """Log the seed of our rolls, or set it and start our rolls over from it, logging a message to console."""
+    try:
+        seed = (arguments[0] if isinstance(arguments, list) else arguments.seed).strip()
+    except IndexError:
+        seed = ""
+
+    if seed == "":
+        Log(
+            f"Reign Of Giants Seed: {_rolls.seed}"
+            + ("" if RollSeed.CurrentValue is not None else " (fresh each time, fix with: giantsseed <seed>)")
+        )
+        return
+
+    try:
+        RollSeed.CurrentValue = None if seed == "random" else int(seed)
+    except ValueError:
+        Log("Must specify a whole number, random, or nothing, e.g.: giantsseed 1234")
+        return
+
+    ModMenu.SaveModSettings(_mod_instance)
+    _rolls.reseed(RollSeed.CurrentValue)
+    Log(f"Reign Of Giants Seed: {_rolls.seed}" + ("" if RollSeed.CurrentValue is not None else " (fresh each time)"))
+
+
 def _edit_giant_prefix(arguments: Sequence[Any]) -> None:
     """Set the name prefix for Giants and log a message to console."""
     try:
@@ -894,6 +3481,18 @@ def _edit_giant_prefix(arguments: Sequence[Any]) -> None:
         Log(f"Reign Of Giants Giant Name: {GiantPrefix.CurrentValue}")
     except IndexError:
         Log("Must specify a name, e.g.: giantsname Teensie Weensie")
+        return
+
+    # Rename the current Giants with the new prefix.
+    _level.giant_names.clear()
+    if not _level.names.slots:
+        return
+    if _level.is_client:
+        _level.pending_giant_IDs.update(_level.names.slots)
+        _scheduler.schedule("GigantizePawns", _gigantize_pawns)
+    else:
+        _level.stale_giant_IDs.update(_level.names.slots)
+        _scheduler.schedule("UpdatePawns", _update_pawns)
 
 
 if CommandExtensions is None:
@@ -904,9 +3503,42 @@ if CommandExtensions is None:
         if command == "giantscheat":
             _toggle_cheat_mode()
             return False
+        elif command == "giantsstats":
+            _edit_stats(arguments)
+            return False
+        elif command == "giantsprofile":
+            _edit_profile(arguments)
+            return False
+        elif command == "giantsrecord":
+            _edit_recording(arguments)
+            return False
+        elif command == "giantsnamecache":
+            _toggle_name_list_cache()
+            return False
+        elif command == "giantswarmup":
+            _toggle_loot_warm_up()
+            return False
+        elif command == "giantsgc":
+            _toggle_collect_garbage()
+            return False
         elif command == "giantssize":
             _edit_giant_scale(arguments)
             return False
+        elif command == "giantsattribute":
+            _edit_giant_attribute(arguments)
+            return False
+        elif command == "giantsbudget":
+            _edit_tick_budget(arguments)
+            return False
+        elif command == "giantswalk":
+            _edit_walk_limit(arguments)
+            return False
+        elif command == "giantsseed":
+            _edit_roll_seed(arguments)
+            return False
+        elif command == "giantsodds":
+            _reload_odds()
+            return False
         elif command == "giantsname":
             _edit_giant_prefix(arguments)
             return False
@@ -924,137 +3556,142 @@ class ReignOfGiants(ModMenu.SDKMod):
 
     SaveEnabledState: ModMenu.EnabledSaveType = ModMenu.EnabledSaveType.LoadOnMainMenu
 
-    Options: List[ModMenu.Options.Base] = [GiantPrefix, GiantScale, CheatMode]
+    Options: List[ModMenu.Options.Base] = [GiantPrefix, GiantScale, GiantAttributes, CheatMode, TickBudget, WalkLimit, RollSeed, LootWarmUp, NameListCache, CollectGarbage]
 
     @ServerMethod
     def ServerRequestGiants(self, PC: UObject = None) -> None:
         """Request the server send us, a client, the current Giants' ID numbers and name list."""
-        self.ClientUpdateVanillaNameList(_vanilla_name_list_length, _vanilla_name_list_names, PC)
-        self.ClientUpdateGiants(_giant_IDs, PC)
+        _send_vanilla_name_list_digest(PC)
+        self.ClientUpdateGiants(_giants_sequence, _level.names.IDs, PC)
+        _replication_bytes["full"] += len(json.dumps([_giants_sequence, _level.names.IDs]))
+
+
+    @ServerMethod
+    def ServerRequestVanillaNameList(self, PC: UObject = None) -> None:
+        """Request the server send us, a client, the vanilla name list for the current map."""
+        map_name = GetEngine().GetCurrentWorldInfo().GetMapName(True)
+        self.ClientUpdateVanillaNameList(
+            map_name, _level.vanilla_name_list_digest, _level.vanilla_name_list_length, _level.vanilla_name_list_names, PC
+        )
+        _replication_bytes["vanilla_names"] += len(json.dumps([
+            map_name, _level.vanilla_name_list_digest, _level.vanilla_name_list_length, _level.vanilla_name_list_names
+        ]))
+
+
+    @ClientMethod
+    def ClientCheckVanillaNameList(self, map_name: str, digest: str, PC: UObject = None) -> None:
+        """
+        Send the digest of the current map's vanilla name list to the client. If the client has the
+        list cached, it applies it, otherwise it requests the list from the server.
+        """
+        _load_vanilla_name_lists()
+        cached = _vanilla_name_lists.get(map_name)
+        if cached is not None and cached[0] == digest:
+            _apply_vanilla_name_list(*cached)
+        elif digest != _level.vanilla_name_list_digest:
+            self.ServerRequestVanillaNameList()
 
 
     @ClientMethod
-    def ClientUpdateVanillaNameList(self, length: int, names: str, PC: UObject = None) -> None:
+    def ClientUpdateVanillaNameList(self, map_name: str, digest: str, length: int, names: str, PC: UObject = None) -> None:
         """Send the current values for the vanilla names list to the client."""
-        global _vanilla_name_list_length, _vanilla_name_list_names
-        _vanilla_name_list_length = length
-        _vanilla_name_list_names = names
+        _vanilla_name_lists[map_name] = (digest, length, names)
+        _save_vanilla_name_lists()
+        _apply_vanilla_name_list(digest, length, names)
+
+
+    @ClientMethod
+    def ClientUpdateGiants(self, sequence: int, IDs: List[int], PC: UObject = None) -> None:
+        """
+        Replace clients' records of Giants' ID numbers with the complete list, in order of slot, and
+        resume the sequence of operations from the given number.
+        """
+        global _giants_sequence, _giants_resyncing
+        _giants_sequence = sequence
+        _giants_resyncing = False
+
+        _level.names.reset()
+        _level.pending_giant_IDs.clear()
+        for slot, ID in enumerate(IDs):
+            if ID != 0:
+                _level.names.occupy(slot, ID)
+                _level.pending_giant_IDs.add(ID)
+
+        _scheduler.schedule("GigantizePawns", _gigantize_pawns)
 
 
     @ClientMethod
-    def ClientUpdateGiants(self, IDs: List[int], PC: UObject = None) -> None:
-        """Update clients' records of Giants' ID numbers."""
-        global _giant_IDs
-        _giant_IDs = IDs
+    def ClientUpdateGiantsDelta(self, sequence: int, operations: List[int], PC: UObject = None) -> None:
+        """Apply a batch of operations performed on the server's Giants' slots to clients' records."""
+        global _giants_sequence, _giants_resyncing
+
+        # Batches that arrive while we await the complete list, or that precede it, are superseded
+        # by it.
+        if _giants_resyncing or sequence <= _giants_sequence:
+            return
 
-        _defer_to_tick("GigantizePawns", _gigantize_pawns)
+        # If we have missed a batch, our records can no longer be trusted, so request the complete
+        # list from the server.
+        if sequence != _giants_sequence + 1:
+            _giants_resyncing = True
+            self.ServerRequestGiants()
+            return
+        _giants_sequence = sequence
+
+        for index in range(0, len(operations), 3):
+            operation, slot, ID = operations[index:index + 3]
+            if operation == _GIANT_REMOVED:
+                if _level.names.slots.get(ID) == slot:
+                    _level.names.release(ID)
+                _level.pending_giant_IDs.discard(ID)
+                _level.gigantized_IDs.discard(ID)
+            else:
+                # Newly added Giants take their slot, and both they and renamed Giants need their
+                # names generated anew.
+                if _level.names.slots.get(ID) != slot:
+                    _level.names.occupy(slot, ID)
+                _level.pending_giant_IDs.add(ID)
+
+        _scheduler.schedule("GigantizePawns", _gigantize_pawns)
 
 
     def Enable(self) -> None:
+        started = perf_counter()
         super().Enable()
 
-        """Create our custom package and its subobjects."""
-        global _package, _name_list, LootBehavior
-
-        def construct_object(uclass: str, outer: Optional[UObject], name: str) -> UObject:
-            path = name if outer is None else f"{UObject.PathName(outer)}.{name}"
-            uobject = FindObject(uclass, path)
-            if uobject is None:
-                uobject = ConstructObject(uclass, outer, name)
-                KeepAlive(uobject)
-            return uobject
-
-        _package = construct_object("Package", None, "ReignOfGiants")
-        _name_list = construct_object("NameListDefinition", _package, "NameList")
-        LootBehavior = construct_object("Behavior_SpawnLootAroundPoint", _package, "LootBehavior")
-
-        def _construct_item_pool(name: str, items: Iterable[Tuple[str, Union[str, float]]]) -> UObject:
-            """
-            Constructs an ItemPoolDefinition with the given object paths and weights. Weights can be
-            either a float representing Probability's BaseValueConstant, or a string representing
-            the object path to its InitializationDefinition.
-            """
-            item_pool = ConstructObject("ItemPoolDefinition", LootBehavior, name)
-
-            balanced_items = []
-
-            for pool, weight in items:
-                if type(weight) is float:
-                    probability = f"(BaseValueConstant={weight},BaseValueScaleConstant=1)"
-                elif type(weight) is str:
-                    probability = f"(InitializationDefinition={weight},BaseValueScaleConstant=1)"
-
-                balanced_item = f"(ItmPoolDefinition={pool},Probability={probability},bDropOnDeath=True)"
-                balanced_items.append(balanced_item)
-
-            _set_command(item_pool, "BalancedItems", balanced_items)
-
-            return item_pool
-
-        # Create a legendary weapon loot pool that mimics the vanilla legendary pool, except with no
-        # pearl drops (these will come from the Tubby pearl pool).
-        _legendary_pool = _construct_item_pool("LegendaryWeaponPool", (
-            ( "GD_Itempools.WeaponPools.Pool_Weapons_Pistols_06_Legendary",       100.0 ),
-            ( "GD_Itempools.WeaponPools.Pool_Weapons_AssaultRifles_06_Legendary",  80.0 ),
-            ( "GD_Itempools.WeaponPools.Pool_Weapons_SMG_06_Legendary",            80.0 ),
-            ( "GD_Itempools.WeaponPools.Pool_Weapons_Shotguns_06_Legendary",       80.0 ),
-            ( "GD_Itempools.WeaponPools.Pool_Weapons_SniperRifles_06_Legendary",   55.0 ),
-            ( "GD_Itempools.WeaponPools.Pool_Weapons_Launchers_06_Legendary",      20.0 ),
-        ))
-
-        # Create a legendary shield loot pool identical to the vanilla one, except with the omission
-        # of the roid shield pool, since it only drops non-unique Bandit shields.
-        _shield_pool = _construct_item_pool("LegendaryShieldPool", (
-            ( "GD_Itempools.ShieldPools.Pool_Shields_Standard_06_Legendary",         1.0 ),
-            ( "GD_Itempools.ShieldPools.Pool_Shields_NovaShields_All_06_Legendary",  1.0 ),
-            ( "GD_Itempools.ShieldPools.Pool_Shields_SpikeShields_All_06_Legendary", 1.0 ),
-            ( "GD_Itempools.ShieldPools.Pool_Shields_Juggernaut_06_Legendary",       1.0 ),
-            ( "GD_Itempools.ShieldPools.Pool_Shields_Booster_06_Legendary",          1.0 ),
-            ( "GD_Itempools.ShieldPools.Pool_Shields_Absorption_06_Legendary",       1.0 ),
-            ( "GD_Itempools.ShieldPools.Pool_Shields_Impact_06_Legendary",           1.0 ),
-            ( "GD_Itempools.ShieldPools.Pool_Shields_Chimera_06_Legendary",          1.0 ),
-        ))
-
-        # THe name of the initialization definition object which is used to scale Tubby pearl drop
-        # weight based on item level. This maxes out at 0.2 at level 80.
-        pearl_weight = "GD_Lobelia_Itempools.Weighting.Weight_Lobelia_Pearlescent_Tubbies"
-
-        # Create the standard item pool from which each Giant's item drop will be selected.
-        _item_pool = _construct_item_pool("ItemPool", (
-            ( "GD_Lobelia_Itempools.WeaponPools.Pool_Lobelia_Pearlescent_Weapons_All", pearl_weight ),
-            # The weights of the pools that aren't the Tubby loot pool should add up to 0.2, such
-            # that the odds of a Pearl max out at 50% at level 80.
-            ( UObject.PathName(_legendary_pool),                              0.080 ),
-            ( UObject.PathName(_shield_pool),                                 0.030 ),
-            ( "GD_Itempools.GrenadeModPools.Pool_GrenadeMods_06_Legendary",   0.030 ),
-            # The Tubby class mod pool should be 3x the weight of the main game class mod pool, such
-            # that every legendary class mod has an equal chance of dropping.
-            ( "GD_Lobelia_Itempools.ClassModPools.Pool_ClassMod_Lobelia_All", 0.045 ),
-            ( "GD_Itempools.ClassModPools.Pool_ClassMod_06_Legendary",        0.015 ),
-        ))
-
-        # Retrieve the green items loot pool to serve as the base for our PreLegendaryPool object.
-        uncommon_pool = FindObject("ItemPoolDefinition", "GD_Itempools.EnemyDropPools.Pool_GunsAndGear_02_Uncommon")
-        _early_pool = ConstructObject("ItemPoolDefinition", LootBehavior, "PreLegendaryPool", Template=uncommon_pool)
-
-        # Set the max level for the PreLegendaryPool to be able to drop items to 5.
-        _early_pool.MaxGameStageRequirement = FindObject("AttributeDefinition", "GD_Itempools.Scheduling.Gamestage_05")
-
-        # Set our loot behavior to spawn one instance of the main item pool, or five instances of
-        # the pre-legendary loot pool.
-        _set_command(LootBehavior, "ItemPools", (UObject.PathName(pool) for pool in (
-            _item_pool,
-            _early_pool, _early_pool, _early_pool, _early_pool, _early_pool,
-        )))
+        # Should we still be restoring pawns from when we were last disabled, finish doing so at once,
+        # so that we begin from a vanilla map.
+        if _vanilla_ai_classes is not None:
+            _scheduler.clear()
+            pawn = GetEngine().GetCurrentWorldInfo().PawnList
+            while pawn is not None:
+                if pawn.AIClass is not None:
+                    _restore_pawn(pawnsnapshot(pawn))
+                pawn = pawn.NextPawn
+            _finish_restoring()
+
+        """
+        Create our custom package and name list. Our loot behavior is constructed once it is first
+        needed, or in spare time after a map loads if LootWarmUp is enabled.
+        """
+        global _package, _name_list
+
+        _package = _construct_persistent_object("Package", None, "ReignOfGiants")
+        _name_list = _construct_persistent_object("NameListDefinition", _package, "NameList")
+
+        # Read our odds, compile our decisions for each AI class we have entries for, and start our
+        # rolls over from their seed.
+        _odds.update(GetEngine().GetCurrentWorldInfo().GetMapName())
+        aiclass.compile()
+        _rolls.reseed(RollSeed.CurrentValue)
+
+        # If we are being enabled in the middle of a map, begin a level context for it now.
+        GRI = GetEngine().GetCurrentWorldInfo().GRI
+        if GRI is not None:
+            _start_level(GRI)
 
         # Register our hooks.
-        RunHook( "WillowGame.WillowAIPawn.PostBeginPlay",                                   "ReignOfGiants", _aipawn_post_begin_play       )
-        RunHook( "WillowGame.PopulationFactoryBalancedAIPawn.SetupBalancedPopulationActor", "ReignOfGiants", _setup_balanced_population    )
-        RunHook( "Engine.Pawn.ApplyBalanceDefinitionCustomizations",                        "ReignOfGiants", _apply_balance_customizations )
-        RunHook( "WillowGame.WillowAIPawn.ReplicatedEvent",                                 "ReignOfGiants", _replicated_event             )
-        RunHook( "WillowGame.WillowAIPawn.AILevelUp",                                       "ReignOfGiants", _ai_level_up                  )
-        RunHook( "WillowGame.Behavior_Transform.ApplyBehaviorToContext",                    "ReignOfGiants", _behavior_transform           )
-        RunHook( "WillowGame.WillowAIPawn.Died",                                            "ReignOfGiants", _died                         )
+        _run_hooks()
 
         if CommandExtensions is None:
             RunHook("Engine.PlayerController.ConsoleCommand", "ReignOfGiants", _console_command)
@@ -1065,54 +3702,160 @@ class ReignOfGiants(ModMenu.SDKMod):
                 splitter = lambda args: [args]
             ).add_argument("void")
 
+            CommandExtensions.RegisterConsoleCommand(
+                name = "giantsstats",
+                callback = lambda args: _edit_stats(args),
+                splitter = lambda args: [args]
+            ).add_argument("action")
+
+            CommandExtensions.RegisterConsoleCommand(
+                name = "giantsprofile",
+                callback = lambda args: _edit_profile(args),
+                splitter = lambda args: [args]
+            ).add_argument("action")
+
+            CommandExtensions.RegisterConsoleCommand(
+                name = "giantsrecord",
+                callback = lambda args: _edit_recording(args),
+                splitter = lambda args: [args]
+            ).add_argument("action")
+
+            CommandExtensions.RegisterConsoleCommand(
+                name = "giantsnamecache",
+                callback = lambda args: _toggle_name_list_cache(),
+                splitter = lambda args: [args]
+            ).add_argument("void")
+
+            CommandExtensions.RegisterConsoleCommand(
+                name = "giantswarmup",
+                callback = lambda args: _toggle_loot_warm_up(),
+                splitter = lambda args: [args]
+            ).add_argument("void")
+
+            CommandExtensions.RegisterConsoleCommand(
+                name = "giantsgc",
+                callback = lambda args: _toggle_collect_garbage(),
+                splitter = lambda args: [args]
+            ).add_argument("void")
+
             CommandExtensions.RegisterConsoleCommand(
                 name = "giantssize",
                 callback = lambda args: _edit_giant_scale(args),
                 splitter = lambda args: [args]
             ).add_argument("size")
 
+            CommandExtensions.RegisterConsoleCommand(
+                name = "giantsattribute",
+                callback = lambda args: _edit_giant_attribute(args),
+                splitter = lambda args: [args]
+            ).add_argument("attribute")
+
+            CommandExtensions.RegisterConsoleCommand(
+                name = "giantsbudget",
+                callback = lambda args: _edit_tick_budget(args),
+                splitter = lambda args: [args]
+            ).add_argument("milliseconds")
+
+            CommandExtensions.RegisterConsoleCommand(
+                name = "giantswalk",
+                callback = lambda args: _edit_walk_limit(args),
+                splitter = lambda args: [args]
+            ).add_argument("pawns")
+
+            CommandExtensions.RegisterConsoleCommand(
+                name = "giantsseed",
+                callback = lambda args: _edit_roll_seed(args),
+                splitter = lambda args: [args]
+            ).add_argument("seed")
+
+            CommandExtensions.RegisterConsoleCommand(
+                name = "giantsodds",
+                callback = lambda args: _reload_odds(),
+                splitter = lambda args: [args]
+            ).add_argument("void")
+
             CommandExtensions.RegisterConsoleCommand(
                 name = "giantsname",
                 callback = lambda args: _edit_giant_prefix(args),
                 splitter = lambda args: [args]
             ).add_argument("name")
 
+        _timings["Enable"] = perf_counter() - started
+
 
     def Disable(self) -> None:
+        started = perf_counter()
         super().Disable()
 
-        global _package, _name_list, LootBehavior
+        global _package, _name_list, LootBehavior, _loot_construction, _vanilla_ai_classes
 
-        def release_object(uclass: str, path: str) -> None:
-            uobject = FindObject(uclass, path)
-            if uobject is not None:
-                uobject.ObjectFlags.A &= ~0x4000
+        # Drop any loot still due from Giants, as their pawns remain valid contexts for now.
+        _loot_queue.flush()
 
-        _name_list = release_object("NameListDefinition", "ReignOfGiants.NameList")
-        LootBehavior = release_object("Behavior_SpawnLootAroundPoint", "ReignOfGiants.LootBehavior")
-        _package = release_object("Package", "ReignOfGiants")
+        # Stop our routines, along with anything we had queued up for them.
+        _scheduler.clear()
+        _commands.clear()
 
-        # Perform the garbage collection console command to force destruction of the objects.
-        GetEngine().GamePlayers[0].Actor.ConsoleCommand("obj garbage", False)
+        # Discard any profile still being captured, as our hooks are no longer running to add to it.
+        _profiler.discard()
+        if _recorder.active:
+            _recorder.stop()
 
-        RemoveHook( "WillowGame.WillowAIPawn.PostBeginPlay",                                   "ReignOfGiants" )
-        RemoveHook( "WillowGame.PopulationFactoryBalancedAIPawn.SetupBalancedPopulationActor", "ReignOfGiants" )
-        RemoveHook( "Engine.Pawn.ApplyBalanceDefinitionCustomizations",                        "ReignOfGiants" )
-        RemoveHook( "WillowGame.WillowAIPawn.ReplicatedEvent",                                 "ReignOfGiants" )
-        RemoveHook( "WillowGame.WillowAIPawn.AILevelUp",                                       "ReignOfGiants" )
-        RemoveHook( "WillowGame.Behavior_Transform.ApplyBehaviorToContext",                    "ReignOfGiants" )
-        RemoveHook( "WillowGame.WillowAIPawn.Died",                                            "ReignOfGiants" )
+        # Remove our hooks, apart from the one keeping walks of the pawn list safe from pawns being
+        # destroyed, which restoring the map's pawns relies upon until it is done. That one we
+        # register afresh, free of any instrumentation we have just stopped.
+        for function, _ in _hooks:
+            if function != "Engine.Pawn.Destroyed":
+                RemoveHook(function, "ReignOfGiants")
+        RunHook("Engine.Pawn.Destroyed", "ReignOfGiants", _pawn_destroyed)
 
         if CommandExtensions is None:
             RemoveHook("Engine.PlayerController.ConsoleCommand", "ReignOfGiants")
         else:
             CommandExtensions.UnregisterConsoleCommand("giantscheat")
+            CommandExtensions.UnregisterConsoleCommand("giantsstats")
+            CommandExtensions.UnregisterConsoleCommand("giantsprofile")
+            CommandExtensions.UnregisterConsoleCommand("giantsrecord")
+            CommandExtensions.UnregisterConsoleCommand("giantsnamecache")
+            CommandExtensions.UnregisterConsoleCommand("giantswarmup")
+            CommandExtensions.UnregisterConsoleCommand("giantsgc")
             CommandExtensions.UnregisterConsoleCommand("giantssize")
             CommandExtensions.UnregisterConsoleCommand("giantsname")
+            CommandExtensions.UnregisterConsoleCommand("giantsattribute")
+            CommandExtensions.UnregisterConsoleCommand("giantsbudget")
+            CommandExtensions.UnregisterConsoleCommand("giantswalk")
+            CommandExtensions.UnregisterConsoleCommand("giantsseed")
+            CommandExtensions.UnregisterConsoleCommand("giantsodds")
+
+        # Let go of only the objects we created: our name list, our loot behavior along with the item
+        # pools within it, the map's Giant AI classes, and our Giants' records. They are collected
+        # once nothing refers to them, the next time the engine collects garbage.
+        def release_object(uobject: Optional[UObject]) -> None:
+            if uobject is not None:
+                uobject.ObjectFlags.A &= ~0x4000
 
-        RemoveHook( "WillowGame.WillowGameViewportClient.Tick", "ReignOfGiants.RequestGiants"  )
-        RemoveHook( "WillowGame.WillowGameViewportClient.Tick", "ReignOfGiants.UpdatePawns"    )
-        RemoveHook( "WillowGame.WillowGameViewportClient.Tick", "ReignOfGiants.GigantizePawns" )
+        # Abandon any construction of our loot behavior still under way, letting go of however much
+        # of it was built.
+        if _loot_construction is not None:
+            _loot_construction.close()
+            _loot_construction = None
+        for uobject in _loot_objects:
+            release_object(uobject)
+        _loot_objects.clear()
+        release_object(_name_list)
+        release_object(_package)
+        _name_list = LootBehavior = _package = None
+
+        _vanilla_ai_classes = {
+            giant_ai_class.GetAddress(): ai_class for ai_class, giant_ai_class in _level.giant_ai_classes.values()
+        }
+        _level.release_giant_ai_classes()
+        _markers.clear()
+
+        # Return the map's pawns to their vanilla state over the next few ticks.
+        _scheduler.schedule("RestorePawns", _restore_pawns)
+
+        _timings["Disable"] = perf_counter() - started
 
 
 _mod_instance = ReignOfGiants()
@@ -1127,3 +3870,5 @@ if __name__ == "__main__":
             break
 
 ModMenu.RegisterMod(_mod_instance)
+
+_timings["import"] = perf_counter() - _import_started
@@ -0,0 +1,7 @@
+"""
+An offline harness for Reign Of Giants. `bench.simulator` runs the mod against stand-ins for the
+PythonSDK's `unrealsdk` and `Mods.ModMenu` (found in `bench/stubs`), and `bench.benchmarks` replays
+workloads against it, reporting the latency of each hook and each frame. See `python -m bench -h`.
+`bench.replay` feeds recordings of real games, made with the mod's `giantsrecord` command, through
+the same harness.
+"""
@@ -0,0 +1,39 @@
+"""
+Run the benchmark suite:
+
+    python -m bench [--scenario NAME ...] [--pawns N ...] [--clients N] [--json PATH]
+"""
+
+import argparse
+
+from . import benchmarks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Benchmark Reign Of Giants' hooks against a simulated game.")
+    parser.add_argument("--scenario", nargs="+", choices=sorted(benchmarks.SCENARIOS), default=list(benchmarks.SCENARIOS), help="scenarios to run (default: all)")
+    parser.add_argument("--pawns", nargs="+", type=int, default=[50, 200, 1000], help="pawn counts to run each scenario at")
+    parser.add_argument("--clients", type=int, default=1, help="number of co-op clients connected from the start")
+    parser.add_argument("--giant-ratio", type=float, default=0.05, help="fraction of spawns forced to be Giants")
+    parser.add_argument("--noise", type=float, default=0.0, help="per-frame chance of each client pawn receiving an irrelevant replicated event")
+    parser.add_argument("--loss", type=float, default=0.0, help="chance of each networked call from the host to a client being lost")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="also write the full results to a JSON file")
+    arguments = parser.parse_args()
+
+    results = []
+    for name in arguments.scenario:
+        for pawns in arguments.pawns:
+            result = benchmarks.run(
+                benchmarks.SCENARIOS[name], pawns, arguments.clients, arguments.seed,
+                arguments.giant_ratio, arguments.noise, arguments.loss,
+            )
+            print(benchmarks.format_results(result), flush=True)
+            results.append(result)
+
+    if arguments.json:
+        benchmarks.dump(results, arguments.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from .engine import Game, activate
+from .simulator import CLASS_SPECS, Session
+
+
+"""
+Benchmark scenarios for the mod's hook pipeline. Each scenario sets up a session, discards the
+timings collected during setup, then performs the workload being measured. Results report, for the
+host and each client, the latency of every hook the mod handled and of every frame as a whole.
+"""
+
+
+class Scenario(NamedTuple):
+    name: str
+    description: str
+    setup: Callable[[Session, int], Any]
+    measure: Callable[[Session, int, Any], None]
+
+
+def _setup_spawned(session: Session, pawns: int) -> Any:
+    spawned = session.spawn(pawns)
+    session.tick(10)
+    return spawned
+
+
+def _setup_none(session: Session, pawns: int) -> Any:
+    session.tick(10)
+    return None
+
+
+def _spawn_storm(session: Session, pawns: int, _: Any) -> None:
+    # Spawn all of the pawns over the course of four frames, then let things settle.
+    for batch in range(4):
+        session.spawn(pawns // 4 + (batch < pawns % 4))
+        session.tick()
+    session.tick(20)
+
+
+def _deaths(session: Session, pawns: int, spawned: List[Any]) -> None:
+    # Kill every pawn over the course of four frames, as in a grenade-heavy fight.
+    for batch in range(4):
+        session.kill(spawned[batch::4])
+        session.tick()
+    session.tick(20)
+
+
+def _setup_transforms(session: Session, pawns: int) -> Any:
+    transformers = [spec.name for spec in CLASS_SPECS if spec.transforms]
+    spawned = session.spawn(pawns, transformers)
+    session.tick(10)
+    return spawned
+
+
+def _transforms(session: Session, pawns: int, spawned: List[Any]) -> None:
+    # Transform half of the pawns, and have the other half morph into child pawns.
+    half = len(spawned) // 2
+    for batch in range(4):
+        session.transform(spawned[batch:half:4])
+        session.morph(spawned[half + batch::4])
+        session.tick()
+    session.tick(20)
+
+
+def _coop_join(session: Session, pawns: int, spawned: List[Any]) -> None:
+    session.join_client()
+    session.tick(30)
+
+
+def _level_change(session: Session, pawns: int, spawned: List[Any]) -> None:
+    session.load_map("Sim2_P")
+    session.tick(5)
+    _spawn_storm(session, pawns, None)
+
+
+def _disable(session: Session, pawns: int, spawned: List[Any]) -> None:
+    session.disable()
+    session.tick(30)
+
+
+def _disable_instrumented(session: Session, pawns: int, spawned: List[Any]) -> None:
+    # Disable the host while it is profiling and recording, then kill pawns as its Giants are being
+    # restored, such that the Destroyed hook it keeps through the restore outlives the instruments.
+    # The restore is spread over enough ticks for the deaths to fall within it.
+    walk_limit = 20
+    with tempfile.TemporaryDirectory() as directory, activate(session.server):
+        session.server.mod.WalkLimit.CurrentValue = walk_limit
+        session.server.mod._edit_profile(["start"])
+        session.server.mod._edit_recording([f"start {os.path.join(directory, 'recording.jsonl')}"])
+        session.disable()
+    session.tick()
+    session.kill(spawned[::2])
+    session.tick(pawns // walk_limit + 30)
+
+
+def _client_ticks(session: Session, pawns: int, spawned: List[Any]) -> None:
+    # Keep a populated map running for a second, with clients receiving irrelevant replicated events
+    # about their pawns, and a new pawn spawning every few frames.
+    session.noise = session.noise or 0.5
+    for frame in range(60):
+        if frame % 5 == 0:
+            session.spawn(1)
+        session.tick()
+
+
+SCENARIOS: Dict[str, Scenario] = {scenario.name: scenario for scenario in (
+    Scenario("spawn_storm", "Pawns spawn over four frames", _setup_none, _spawn_storm),
+    Scenario("deaths", "Every pawn dies over four frames", _setup_spawned, _deaths),
+    Scenario("transforms", "Pawns transform, level up, and morph into children", _setup_transforms, _transforms),
+    Scenario("coop_join", "A client joins a populated map", _setup_spawned, _coop_join),
+    Scenario("client_ticks", "Clients idle in a populated map, receiving replicated events", _setup_spawned, _client_ticks),
+    Scenario("disable", "The mod is disabled in a populated map, restoring its Giants", _setup_spawned, _disable),
+    Scenario("disable_instrumented", "The mod is disabled while profiling and recording, as pawns die", _setup_spawned, _disable_instrumented),
+    Scenario("level_change", "The session travels to a new map, followed by a spawn storm", _setup_spawned, _level_change),
+)}
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """Summarize timing samples (in seconds) as microsecond statistics."""
+    return {
+        "count": len(samples),
+        "total_ms": sum(samples) * 1e3,
+        "mean_us": sum(samples) / len(samples) * 1e6 if samples else 0.0,
+        "p50_us": percentile(samples, 0.50) * 1e6,
+        "p95_us": percentile(samples, 0.95) * 1e6,
+        "max_us": max(samples, default=0.0) * 1e6,
+    }
+
+
+def game_results(game: Game) -> Dict[str, Any]:
+    return {
+        "hooks": {label: summarize(stats.samples) for label, stats in game.hook_stats.items()},
+        "ticks": summarize(game.tick_samples),
+        "counters": game.counters.as_dict(),
+        "errors": list(game.errors),
+    }
+
+
+def run(scenario: Scenario, pawns: int, clients: int = 1, seed: int = 0, giant_ratio: Optional[float] = 0.05, noise: float = 0.0, loss: float = 0.0) -> Dict[str, Any]:
+    session = Session(seed=seed, giant_ratio=giant_ratio, noise=noise, loss=loss)
+    for _ in range(clients):
+        session.join_client()
+    session.tick(5)
+
+    state = scenario.setup(session, pawns)
+    session.reset_stats()
+    scenario.measure(session, pawns, state)
+    return session_results(session, scenario.name, pawns)
+
+
+def session_results(session: Session, name: str, pawns: int) -> Dict[str, Any]:
+    return {
+        "scenario": name,
+        "pawns": pawns,
+        "clients": len(session.clients),
+        "games": {game.name: game_results(game) for game in session.games},
+        "replicated_properties": dict(session.replicated_properties),
+        "replication_bytes": dict(session.server.mod._replication_bytes),
+        "giant_ai_classes": dict(session.server.mod._giant_ai_class_stats),
+        "set_commands": {
+            game.name: {key: getattr(game.mod._commands, key) for key in ("commands", "bytes", "coalesced")}
+            for game in session.games
+        },
+        "snapshots": {game.name: dict(game.mod._snapshot_stats) for game in session.games},
+        "markers": {
+            game.name: {**game.mod._marker_stats, "free": len(game.mod._markers.free), "in_use": len(game.mod._markers.in_use)}
+            for game in session.games
+        },
+        "messages_lost": session.messages_lost,
+        "timings": {name: summarize(samples) for name, samples in session.timings.items()},
+        "mod_timings": {game.name: dict(game.mod._timings) for game in session.games},
+        "verify": session.verify(),
+    }
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    lines = [f"== {results['scenario']}: {results['pawns']} pawns, {results['clients']} client(s) =="]
+    for name, game in results["games"].items():
+        ticks = game["ticks"]
+        lines.append(
+            f"  [{name}] frames={ticks['count']} tick mean={ticks['mean_us'] / 1e3:.3f}ms "
+            f"p95={ticks['p95_us'] / 1e3:.3f}ms max={ticks['max_us'] / 1e3:.3f}ms"
+        )
+        hooks = sorted(game["hooks"].items(), key=lambda item: -item[1]["total_ms"])
+        for label, stats in hooks:
+            lines.append(
+                f"    {label:<72} calls={stats['count']:>6} total={stats['total_ms']:>9.3f}ms "
+                f"mean={stats['mean_us']:>8.1f}us p95={stats['p95_us']:>8.1f}us max={stats['max_us']:>9.1f}us"
+            )
+        counters = game["counters"]
+        lines.append("    " + " ".join(f"{key}={value}" for key, value in counters.items() if value))
+        if game["errors"]:
+            lines.append(f"    errors={len(game['errors'])}, first:")
+            lines.extend("      " + line for line in game["errors"][0].rstrip().splitlines()[-3:])
+    if results["replicated_properties"]:
+        lines.append("  replicated: " + " ".join(f"{key}={value}" for key, value in results["replicated_properties"].items()))
+    lines.append(
+        "  giants payloads: " + " ".join(f"{key}={value}B" for key, value in results["replication_bytes"].items())
+        + f" lost={results['messages_lost']}"
+    )
+    lines.append("  set commands: " + " ".join(
+        f"[{name}] commands={stats['commands']} bytes={stats['bytes']} coalesced={stats['coalesced']}"
+        for name, stats in results["set_commands"].items()
+    ))
+    lines.append("  pawn snapshots: " + " ".join(
+        f"[{name}] walks={stats['walks']} reads_saved={stats['reads_saved']} per_walk={stats['reads_saved'] / max(stats['walks'], 1):.1f}"
+        for name, stats in results["snapshots"].items()
+    ))
+    lines.append("  marker pool: " + " ".join(
+        f"[{name}] " + " ".join(f"{key}={value}" for key, value in stats.items())
+        for name, stats in results["markers"].items()
+    ))
+    lines.append("  giant AI classes: " + " ".join(f"{key}={value}" for key, value in results["giant_ai_classes"].items()))
+    lines.append("  timings: " + " ".join(
+        f"[{name}] " + " ".join(f"{key}={seconds * 1e3:.3f}ms" for key, seconds in timings.items())
+        for name, timings in results["mod_timings"].items()
+    ))
+    lines.append("  verify: " + " ".join(f"{key}={value}" for key, value in results["verify"].items()))
+    return "\n".join(lines)
+
+
+def dump(results: List[Dict[str, Any]], path: str) -> None:
+    with open(path, "w") as file:
+        json.dump(results, file, indent=1)
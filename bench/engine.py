@@ -0,0 +1,481 @@
+from __future__ import annotations
+
+import re
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+"""
+A minimal, pure-Python model of the Unreal Engine objects Reign Of Giants interacts with. Each
+`Game` represents one running copy of Borderlands 2 (a host or a client), holding its own world,
+object registry and hook table. The `unrealsdk` stub forwards every call to whichever game is
+currently active, which allows several copies of the mod to run side by side in one process.
+
+Property access on engine objects is routed through `__getattr__`/`__setattr__` so that each read
+and write can be counted, standing in for the cost of crossing from Python into the engine.
+"""
+
+
+class Counters:
+    """Per-game tallies of the engine work the mod has caused."""
+
+    __slots__ = (
+        "property_reads", "property_writes", "objects_constructed", "console_commands",
+        "console_bytes", "garbage_collections", "hooks_added", "hooks_removed",
+        "messages_sent", "bytes_sent",
+    )
+
+    def __init__(self) -> None:
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class UObject:
+    """
+    A stand-in for an SDK UObject. Engine properties are kept in a dictionary so that reads and
+    writes to them can be counted; anything that is a method lives on the class as usual.
+    """
+
+    __slots__ = ("_props", "_game", "__weakref__")
+
+    def __init__(self, game: Game, Class: Any, Name: str, Outer: Optional[UObject] = None, **props: Any):
+        object.__setattr__(self, "_game", game)
+        object.__setattr__(self, "_props", {
+            "Class": Class, "Name": Name, "Outer": Outer, "ObjectFlags": FStruct(game, A=0), **props
+        })
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            value = self._props[name]
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__} has no property {name}") from None
+        self._game.counters.property_reads += 1
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._game.counters.property_writes += 1
+        # As in the SDK, a tuple assigned to a struct property fills in the struct's fields in order.
+        current = self._props.get(name)
+        if isinstance(current, FStruct) and isinstance(value, tuple):
+            value = FStruct(self._game, **dict(zip(current._props, value)))
+        self._props[name] = value
+
+    def __repr__(self) -> str:
+        return f"{self._props['Class'].Name}'{UObject.PathName(self)}'"
+
+    @staticmethod
+    def PathName(obj: Optional[UObject]) -> str:
+        if obj is None:
+            return "None"
+        props = obj._props
+        outer = props["Outer"]
+        return props["Name"] if outer is None else f"{UObject.PathName(outer)}.{props['Name']}"
+
+    def GetAddress(self) -> int:
+        return id(self)
+
+
+class UClass(UObject):
+    """A class object; `ConstructObject` accepts these in place of a class name."""
+
+
+class UFunction:
+    """Passed to hooks in place of the hooked UFunction."""
+
+    __slots__ = "PathName"
+
+    def __init__(self, path: str):
+        self.PathName = path
+
+
+class FStruct:
+    """A stand-in for an SDK FStruct. Like UObject, reads and writes of its fields are counted."""
+
+    __slots__ = ("_props", "_game")
+
+    def __init__(self, game: Game, **fields: Any):
+        object.__setattr__(self, "_game", game)
+        object.__setattr__(self, "_props", fields)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            value = self._props[name]
+        except KeyError:
+            raise AttributeError(f"struct has no field {name}") from None
+        self._game.counters.property_reads += 1
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._game.counters.property_writes += 1
+        self._props[name] = value
+
+
+def clone_value(game: Game, value: Any) -> Any:
+    """Copy a property value as the engine would when templating an object from another."""
+    if isinstance(value, dict):
+        return {key: clone_value(game, field) for key, field in value.items()}
+    if isinstance(value, FStruct):
+        return FStruct(game, **{key: clone_value(game, field) for key, field in value._props.items()})
+    if isinstance(value, list):
+        return [clone_value(game, item) for item in value]
+    return value
+
+
+class HookStats:
+    """Timing samples, in seconds, for each invocation of one hook."""
+
+    __slots__ = ("samples",)
+
+    def __init__(self) -> None:
+        self.samples: List[float] = []
+
+
+class Game:
+    """One running copy of the game: a host, a client, or a standalone session."""
+
+    def __init__(self, name: str, net_mode: int):
+        self.name = name
+        self.net_mode = net_mode
+        self.hooks: Dict[str, Dict[str, Callable]] = {}
+        self.objects: Dict[str, UObject] = {}
+        self.counters = Counters()
+        self.hook_stats: Dict[str, HookStats] = {}
+        self.tick_samples: List[float] = []
+        self.log: List[str] = []
+        self.errors: List[str] = []
+        self.inject_next = False
+
+        self._depth = 0
+        self._frame_time = 0.0
+        self._next_pawn = 0
+
+        self.engine = Engine(self)
+        self.world_info: Optional[WorldInfo] = None
+
+    # Object registry ------------------------------------------------------------------------------
+
+    def register(self, obj: UObject) -> UObject:
+        self.objects[UObject.PathName(obj)] = obj
+        return obj
+
+    def find_object(self, uclass: str, path: str) -> Optional[UObject]:
+        obj = self.objects.get(path)
+        # Anything outside of the mod's own package is game content, which always exists.
+        if obj is None and path.split(".", 1)[0] != "ReignOfGiants":
+            outer, _, name = path.rpartition(".")
+            obj = self.register(UObject(self, UClass(self, None, uclass), name, self.find_object("Package", outer) if outer else None))
+        return obj
+
+    def construct_object(self, Class: Any, Outer: Optional[UObject] = None, Name: str = "None", Template: Optional[UObject] = None) -> UObject:
+        self.counters.objects_constructed += 1
+        if isinstance(Class, str):
+            Class = UClass(self, None, Class)
+        cls = OBJECT_TYPES.get(Class._props["Name"], UObject)
+        obj = cls(self, Class, Name, Outer, **clone_value(self, OBJECT_DEFAULTS.get(Class._props["Name"], {})))
+        if Template is not None:
+            for key, value in Template._props.items():
+                if key not in ("Class", "Name", "Outer", "ObjectFlags"):
+                    obj._props[key] = clone_value(self, value)
+        return self.register(obj)
+
+    def new_name(self, prefix: str) -> str:
+        self._next_pawn += 1
+        return f"{prefix}_{self._next_pawn}"
+
+    # Hooks ----------------------------------------------------------------------------------------
+
+    def run_hook(self, function: str, key: str, callback: Callable) -> None:
+        self.counters.hooks_added += 1
+        self.hooks.setdefault(function, {})[key] = callback
+
+    def remove_hook(self, function: str, key: str) -> None:
+        self.counters.hooks_removed += 1
+        hooks = self.hooks.get(function)
+        if hooks is not None:
+            hooks.pop(key, None)
+
+    def invoke(self, caller: UObject, function: str, native: Optional[Callable[[], Any]] = None, **params: Any) -> Any:
+        """
+        Call an UnrealScript function on the caller, passing through any hooks registered for it.
+        As with the SDK, a hook returning a falsy value blocks the original function.
+        """
+        if self.inject_next:
+            self.inject_next = False
+            return None if native is None else native()
+
+        allow = True
+        hooks = self.hooks.get(function)
+        if hooks:
+            fparams = FStruct(self, **params)
+            ufunction = UFunction(function)
+            for key, callback in list(hooks.items()):
+                if hooks.get(key) is not callback:
+                    continue
+                try:
+                    if not self.timed(self.hook_label(function, key), callback, caller, ufunction, fparams):
+                        allow = False
+                # Like the SDK, log exceptions raised by hooks and carry on as though they had
+                # returned True.
+                except Exception:
+                    self.errors.append(traceback.format_exc())
+
+        if allow and native is not None:
+            return native()
+        return None
+
+    @staticmethod
+    def hook_label(function: str, key: str) -> str:
+        label = function.split(".", 1)[-1]
+        return label if key == "ReignOfGiants" else f"{label} ({key})"
+
+    def timed(self, label: str, callback: Callable, *args: Any) -> Any:
+        """Invoke a callback into the mod, recording how long it took under the given label."""
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return callback(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._depth -= 1
+            self.hook_stats.setdefault(label, HookStats()).samples.append(elapsed)
+            # Only count outermost calls towards the frame, since nested ones are included in them.
+            if self._depth == 0:
+                self._frame_time += elapsed
+
+    def end_frame(self) -> None:
+        self.tick_samples.append(self._frame_time)
+        self._frame_time = 0.0
+
+    # Console --------------------------------------------------------------------------------------
+
+    _set_pattern = re.compile(r"set (\S+) (\S+) (.*)", re.DOTALL)
+    _string_pattern = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+    def execute_console_command(self, command: str) -> None:
+        self.counters.console_commands += 1
+        self.counters.console_bytes += len(command)
+
+        if command == "obj garbage":
+            self.counters.garbage_collections += 1
+            return
+
+        match = self._set_pattern.match(command)
+        if match is None:
+            return
+        path, prop, value = match.groups()
+        obj = self.objects.get(path)
+        if obj is None:
+            return
+        # Parse string arrays into lists of strings, as the engine would; anything else we store
+        # as its raw text, since the mod never reads those values back.
+        if prop == "Names":
+            value = [string.replace('\\"', '"') for string in self._string_pattern.findall(value)]
+        obj._props[prop] = value
+
+
+OBJECT_TYPES: Dict[str, type] = {}
+"""Maps class names to the Python types used when the mod constructs objects of that class."""
+
+OBJECT_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "NameListDefinition": {"Names": []},
+    "KnowledgeRecord": {"FlagIndex": 0, "Active": False},
+    "ItemPoolDefinition": {"BalancedItems": [], "MaxGameStageRequirement": None},
+    "Behavior_SpawnLootAroundPoint": {"ItemPools": []},
+}
+"""Default property values for objects the mod constructs."""
+
+
+@contextmanager
+def activate(game: Game) -> Iterator[Game]:
+    """Make the given game the target of `unrealsdk` calls for the duration of the block."""
+    global active
+    previous = active
+    active = game
+    try:
+        yield game
+    finally:
+        active = previous
+
+
+active: Optional[Game] = None
+"""The game that `unrealsdk` calls are currently directed to."""
+
+
+# World objects ------------------------------------------------------------------------------------
+
+class Engine(UObject):
+    def __init__(self, game: Game):
+        super().__init__(game, UClass(game, None, "WillowGameEngine"), "WillowGameEngine_0")
+        controller = PlayerController(game, UClass(game, None, "WillowPlayerController"), "WillowPlayerController_0")
+        player = UObject(game, UClass(game, None, "LocalPlayer"), "LocalPlayer_0", Actor=controller)
+        self._props["GamePlayers"] = [player]
+        self._props["GameViewport"] = GameViewportClient(game, UClass(game, None, "WillowGameViewportClient"), "WillowGameViewportClient_0")
+
+    def GetCurrentWorldInfo(self) -> WorldInfo:
+        return self._game.world_info
+
+
+class PlayerController(UObject):
+    def ConsoleCommand(self, Command: str, bWriteToLog: bool = True) -> None:
+        game = self._game
+        game.invoke(self, "Engine.PlayerController.ConsoleCommand", lambda: game.execute_console_command(Command), Command=Command, bWriteToLog=bWriteToLog)
+
+
+class Level(UObject):
+    pass
+
+
+class WorldInfo(UObject):
+    def GetMapName(self, bIncludePrefix: bool = False) -> str:
+        return self._props["_map_name"]
+
+    def add_pawn(self, pawn: UObject) -> None:
+        """Insert the pawn at the head of the pawn list, as Pawn.PostBeginPlay does natively."""
+        pawn._props["NextPawn"] = self._props["PawnList"]
+        self._props["PawnList"] = pawn
+
+    def remove_pawn(self, pawn: UObject) -> None:
+        previous = None
+        current = self._props["PawnList"]
+        while current is not None:
+            if current is pawn:
+                if previous is None:
+                    self._props["PawnList"] = current._props["NextPawn"]
+                else:
+                    previous._props["NextPawn"] = current._props["NextPawn"]
+                current._props["NextPawn"] = None
+                return
+            previous = current
+            current = current._props["NextPawn"]
+
+
+class NameListDefinition(UObject):
+    pass
+
+
+class AIClassDefinition(UObject):
+    pass
+
+
+class BalanceDefinition(UObject):
+    def GetDisplayNameAtGrade(self, Grade: int) -> Optional[str]:
+        return self._props["_display_name"]
+
+
+class WillowMind(UObject):
+    def InitializeCharacterClass(self) -> None:
+        # Natively, this reads every starting value of the character class.
+        for starting_value in self._props["CharacterClass"]._props["AttributeStartingValues"]:
+            starting_value._props["BaseValue"]._props["BaseValueScaleConstant"]
+        self._props["bCharacterClassInitialized"] = True
+
+
+class KnowledgeRecord(UObject):
+    pass
+
+
+class WillowAIPawn(UObject):
+    def PostBeginPlay(self) -> None:
+        self._game.invoke(self, "WillowGame.WillowAIPawn.PostBeginPlay", lambda: None)
+
+    def ApplyBalanceDefinitionCustomizations(self) -> None:
+        def native() -> None:
+            balance = self._props["BalanceDefinitionState"]._props["BalanceDefinition"]
+            if balance is not None:
+                self._props["NameListIndex"] = balance._props["_name_list_index"]
+        self._game.invoke(self, "Engine.Pawn.ApplyBalanceDefinitionCustomizations", native)
+
+    def ReplicatedEvent(self, VarName: str) -> None:
+        def native() -> None:
+            if VarName == "BalanceDefinitionState":
+                self.ApplyBalanceDefinitionCustomizations()
+        self._game.invoke(self, "WillowGame.WillowAIPawn.ReplicatedEvent", native, VarName=VarName)
+
+    def AILevelUp(self) -> None:
+        self._game.invoke(self, "WillowGame.WillowAIPawn.AILevelUp", lambda: None)
+
+    def Died(self, Killer: Optional[UObject] = None, DamageType: Optional[UObject] = None, HitLocation: tuple = (0, 0, 0)) -> None:
+        def native() -> None:
+            self._props["_dead"] = True
+        self._game.invoke(self, "WillowGame.WillowAIPawn.Died", native, Killer=Killer, DamageType=DamageType, HitLocation=HitLocation)
+
+    def Destroyed(self) -> None:
+        self._game.invoke(self, "Engine.Pawn.Destroyed", lambda: None)
+
+    def DisplayParentInfo(self) -> bool:
+        return False
+
+    def GetParent(self) -> Optional[UObject]:
+        return None
+
+    def GetTransformedName(self) -> Optional[str]:
+        return self._props["_transformed_name"]
+
+    def GetTargetName(self) -> Optional[str]:
+        """Port of the native name resolution, used to check what name players would see."""
+        props = self._props
+        names = None
+        GRI = self._game.world_info._props["GRI"]
+        if GRI is not None and GRI._props["NameListDef"] is not None:
+            names = GRI._props["NameListDef"]._props["Names"]
+        index = props["NameListIndex"]
+        if names is not None and -1 < index < len(names):
+            return names[index]
+        if props["TransformType"] != 0:
+            return props["_transformed_name"]
+        balance = props["BalanceDefinitionState"]._props["BalanceDefinition"]
+        return None if balance is None else balance._props["_display_name"]
+
+
+class PopulationFactory(UObject):
+    def SetupBalancedPopulationActor(self, SpawnedPawn: UObject, SpawnLocationContextObject: UObject, balance: UObject) -> None:
+        def native() -> None:
+            SpawnedPawn._props["BalanceDefinitionState"]._props["BalanceDefinition"] = balance
+            SpawnedPawn.ApplyBalanceDefinitionCustomizations()
+        self._game.invoke(
+            self, "WillowGame.PopulationFactoryBalancedAIPawn.SetupBalancedPopulationActor", native,
+            SpawnedPawn=SpawnedPawn, SpawnLocationContextObject=SpawnLocationContextObject
+        )
+
+
+class BehaviorTransform(UObject):
+    def ApplyBehaviorToContext(self, ContextObject: UObject) -> None:
+        def native() -> None:
+            ContextObject._props["TransformType"] = self._props["Transform"]
+        self._game.invoke(self, "WillowGame.Behavior_Transform.ApplyBehaviorToContext", native, ContextObject=ContextObject)
+
+
+class BehaviorSpawnLoot(UObject):
+    def ApplyBehaviorToContext(self, ContextObject: UObject, KismetInfo: tuple, SelfObject: Any, MyInstigatorObject: Any, OtherEventParticipantObject: Any, LoadedBehaviorInfo: tuple) -> None:
+        self._props["_drops"] = self._props.get("_drops", 0) + 1
+
+
+class GameReplicationInfo(UObject):
+    def PostBeginPlay(self) -> None:
+        self._game.invoke(self, "Engine.GameReplicationInfo.PostBeginPlay", lambda: None)
+
+
+class PlayerReplicationInfo(UObject):
+    def GetHumanReadableName(self) -> str:
+        return self._props["PlayerName"]
+
+    def ClientInitialize(self, C: UObject) -> None:
+        self._game.invoke(self, "Engine.PlayerReplicationInfo.ClientInitialize", lambda: None, C=C)
+
+
+class GameViewportClient(UObject):
+    def Tick(self, DeltaTime: float) -> None:
+        self._game.invoke(self, "WillowGame.WillowGameViewportClient.Tick", lambda: None, DeltaTime=DeltaTime)
+
+
+OBJECT_TYPES.update({
+    "NameListDefinition": NameListDefinition,
+    "AIClassDefinition": AIClassDefinition,
+    "KnowledgeRecord": KnowledgeRecord,
+    "Behavior_SpawnLootAroundPoint": BehaviorSpawnLoot,
+})
@@ -0,0 +1,98 @@
+"""
+Microbenchmark comparing the mod's reentrancy-guarded PostBeginPlay and
+ApplyBalanceDefinitionCustomizations hooks against the former approach, in which each hook removed
+itself before invoking the original method and added itself back afterwards:
+
+    python -m bench.reentrancy [--pawns N ...] [--repeat N]
+
+Note that the stand-in `RunHook` and `RemoveHook` are plain dictionary operations, so the timings
+understate the cost of the former approach in the SDK itself; the counts of hook table changes are
+the more telling figure.
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List
+
+from . import engine
+from .benchmarks import summarize
+from .engine import activate
+from .simulator import Session
+
+
+HOOKS = ("WillowGame.WillowAIPawn.PostBeginPlay", "Engine.Pawn.ApplyBalanceDefinitionCustomizations")
+
+
+def _legacy_hook(function: str, key: str, hook: Callable) -> Callable:
+    """Reproduce the hook table churn of the former approach around the unguarded hook."""
+    from unrealsdk import RemoveHook, RunHook
+
+    def legacy(caller: Any, ufunction: Any, params: Any) -> bool:
+        RemoveHook(function, key)
+        try:
+            return hook(caller, ufunction, params)
+        finally:
+            RunHook(function, key, legacy)
+
+    return legacy
+
+
+def _use_legacy_hooks(game: engine.Game) -> None:
+    for function in HOOKS:
+        hooks = game.hooks[function]
+        hooks["ReignOfGiants"] = _legacy_hook(function, "ReignOfGiants", hooks["ReignOfGiants"].__wrapped__)
+
+
+def measure(pawns: int, legacy: bool, seed: int = 0) -> Dict[str, Any]:
+    session = Session(seed=seed, giant_ratio=0.05)
+    if legacy:
+        with activate(session.server):
+            _use_legacy_hooks(session.server)
+    session.tick(5)
+    session.reset_stats()
+
+    # Spawn the pawns over the course of four frames, timing only the spawns themselves.
+    samples: List[float] = []
+    for batch in range(4):
+        start = time.perf_counter()
+        session.spawn(pawns // 4 + (batch < pawns % 4))
+        samples.append(time.perf_counter() - start)
+        session.tick()
+    session.tick(20)
+
+    game = session.server
+    return {
+        "spawn_frames": summarize(samples),
+        "hooks": {
+            label: summarize(game.hook_stats[label].samples)
+            for label in (engine.Game.hook_label(function, "ReignOfGiants") for function in HOOKS)
+            if label in game.hook_stats
+        },
+        "hooks_added": game.counters.hooks_added,
+        "hooks_removed": game.counters.hooks_removed,
+        "verify": session.verify(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.reentrancy", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pawns", nargs="+", type=int, default=[200, 1000])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per approach, keeping the fastest")
+    arguments = parser.parse_args()
+
+    for pawns in arguments.pawns:
+        print(f"== spawn storm: {pawns} pawns ==")
+        for name, legacy in (("guarded", False), ("remove/run", True)):
+            runs = [measure(pawns, legacy, seed) for seed in range(arguments.repeat)]
+            best = min(runs, key=lambda run: run["spawn_frames"]["total_ms"])
+            print(
+                f"  {name:<10} spawn frames total={best['spawn_frames']['total_ms']:.3f}ms "
+                f"hooks added={best['hooks_added']} removed={best['hooks_removed']}"
+            )
+            for label, stats in best["hooks"].items():
+                print(f"    {label:<60} calls={stats['count']:>6} mean={stats['mean_us']:>7.2f}us p95={stats['p95_us']:>7.2f}us")
+            print("    verify: " + " ".join(f"{key}={value}" for key, value in best["verify"].items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+Replay a recording of the hook events seen by the mod in a real game, made with its `giantsrecord`
+console command, against the simulator:
+
+    python -m bench.replay RECORDING [--clients N] [--repeat N] [--json PATH]
+
+Each of the recorded spawns, level ups, transformations, deaths and destructions is performed on
+the simulated host on the frame it occurred, with pawns rolling as Giants exactly when they did in
+the recording.
+Only what the host sees can be replayed, as the events a client sees follow from the host's; the
+replicated events in recordings made by clients are skipped, and the simulated clients instead
+receive their own. Recordings can also be made from the benchmark scenarios, to be replayed after a
+change to the mod:
+
+    python -m bench.replay RECORDING --record SCENARIO [--pawns N]
+
+With --reroll, pawns instead roll for Gigantism with the mod's own rolls, seeded with --seed, so that
+replaying the same spawns with the same seed can be checked to produce the same Giants.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from . import benchmarks
+from .engine import BehaviorTransform, UClass, UObject, WillowAIPawn, activate
+from .simulator import ClassSpec, Session
+
+
+VERSION = 2
+"""The version of the mod's recording format that can be replayed."""
+
+STRING_FIELDS: Dict[str, Sequence[int]] = {"G": (0,), "P": (1,), "A": (1,), "L": (1,), "R": (1,)}
+"""The positions of each kind of event's fields which hold strings, written once then referred to by index."""
+
+
+class Event(NamedTuple):
+    frames: int
+    code: str
+    fields: List[Any]
+
+
+class Recording(NamedTuple):
+    header: Dict[str, Any]
+    events: List[Event]
+
+
+def read(path: str) -> List[Recording]:
+    """Read each of the recordings appended to a file, resolving the strings they refer to by index."""
+    recordings: List[Recording] = []
+    strings: List[str] = []
+    with open(path) as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            value = json.loads(line)
+            if isinstance(value, dict):
+                if value.get("version") != VERSION:
+                    raise ValueError(f"{path} holds a recording of version {value.get('version')}, only version {VERSION} can be replayed")
+                recordings.append(Recording(value, []))
+                strings = []
+                continue
+            frames, code, *fields = value
+            for position in STRING_FIELDS.get(code, ()):
+                field = fields[position]
+                if isinstance(field, str):
+                    strings.append(field)
+                elif field is not None:
+                    fields[position] = strings[field]
+            recordings[-1].events.append(Event(frames, code, fields))
+    return recordings
+
+
+class NeverGiant:
+    """Stands in for the mod's rolls, rolling the highest byte every time so that no pawn is a Giant by chance."""
+
+    seed = None
+
+    @staticmethod
+    def roll() -> int:
+        return 255
+
+
+class Replay:
+    """
+    The replay of one recording against a session's host. Unless `reroll` is set, pawns are Giants
+    exactly when they were in the recording.
+    """
+
+    def __init__(self, session: Session, recording: Recording, reroll: bool = False):
+        self.session = session
+        self.recording = recording
+        self.reroll = reroll
+        self.giants: set = set()
+        """The numbers of the recording's pawns that were Giants after their balance was applied."""
+        self.pawns: Dict[int, WillowAIPawn] = {}
+        """Maps the numbers pawns were assigned in the recording to their simulated counterparts."""
+        self.consumed: set = set()
+        """The indices of events already replayed as part of an earlier one."""
+        self.counts: Dict[str, int] = {}
+        self.skipped: Dict[str, int] = {}
+        self.spawned = 0
+
+    def spec(self, class_path: str) -> ClassSpec:
+        """Find the kind of enemy for an AI class, adding it to the session if it is not one of ours."""
+        name = class_path.rsplit(".", 1)[-1]
+        for spec in self.session.class_specs:
+            if spec.name == name:
+                return spec
+        spec = ClassSpec(name, name)
+        self.session.add_class(spec)
+        return spec
+
+    def run(self) -> None:
+        events = self.recording.events
+        game = self.session.server
+        cheat_mode = game.mod.CheatMode.CurrentValue
+        rolls = game.mod._rolls
+        # Pawns roll as Giants by way of cheat mode when they did in the recording, and never by
+        # chance otherwise.
+        if not self.reroll:
+            game.mod._rolls = NeverGiant
+        try:
+            for index, event in enumerate(events):
+                if event.frames:
+                    self.session.tick(event.frames)
+                if index in self.consumed:
+                    continue
+                with activate(game):
+                    replayed = self.replay(index, event)
+                counts = self.counts if replayed else self.skipped
+                counts[event.code] = counts.get(event.code, 0) + 1
+        finally:
+            game.mod.CheatMode.CurrentValue = cheat_mode
+            game.mod._rolls = rolls
+
+    def replay(self, index: int, event: Event) -> bool:
+        """Perform an event on the host, returning whether it could be."""
+        session = self.session
+        game = session.server
+        code, fields = event.code, event.fields
+
+        if code == "G":
+            session.load_map(fields[0])
+            self.pawns.clear()
+            return True
+        if code in ("I", "E"):
+            return True
+        if code == "P":
+            if fields[1] is None:
+                return False
+            spec = self.spec(fields[1])
+            level = game.world_info._props["CommittedPersistentLevel"]
+            pawn = self.pawns[fields[0]] = session._new_pawn(game, spec, game.catalog.classes[spec.name], level)
+            game.world_info.add_pawn(pawn)
+            pawn.PostBeginPlay()
+            self.spawned += 1
+            return True
+
+        pawn = self.pawns.get(fields[0])
+        if pawn is None:
+            return False
+        spec = pawn._props["_spec"]
+
+        if code == "S":
+            # The pawn's balance is applied within its setup, so take the Gigantism it rolled then.
+            applied = self.find(index, "A", fields[0])
+            if applied is not None:
+                self.consumed.add(applied)
+                self.set_outcome(self.recording.events[applied].fields[5])
+            spawn_point = UObject(game, UClass(game, None, "PopulationPoint"), game.new_name("PopulationPoint"), None, Owner=self.pawns.get(fields[1]))
+            session.factory.SetupBalancedPopulationActor(pawn, spawn_point, game.catalog.balances[spec.name])
+            self.note_giant(fields[0], pawn)
+            return True
+        if code == "A":
+            state = pawn._props["BalanceDefinitionState"]._props
+            if state["BalanceDefinition"] is None and fields[1] is not None:
+                state["BalanceDefinition"] = game.catalog.balances[spec.name]
+            self.set_outcome(fields[5])
+            pawn.ApplyBalanceDefinitionCustomizations()
+            self.note_giant(fields[0], pawn)
+            return True
+        if code == "L":
+            self.set_outcome(fields[5])
+            pawn.AILevelUp()
+            self.note_giant(fields[0], pawn)
+            return True
+        if code == "T":
+            behavior = BehaviorTransform(game, UClass(game, None, "Behavior_Transform"), "Behavior_Transform_0", None, Transform=fields[1])
+            behavior.ApplyBehaviorToContext(pawn)
+            return True
+        if code == "D":
+            pawn.Died()
+            return True
+        if code == "X":
+            del self.pawns[fields[0]]
+            game.world_info.remove_pawn(pawn)
+            pawn.Destroyed()
+            return True
+        return False
+
+    def set_outcome(self, is_giant: Any) -> None:
+        """Have the next roll come out as it did in the recording, unless rerolling."""
+        if not self.reroll:
+            self.session.server.mod.CheatMode.CurrentValue = bool(is_giant)
+
+    def note_giant(self, number: int, pawn: WillowAIPawn) -> None:
+        """Note whether one of the recording's pawns is a Giant."""
+        record = pawn._props["DebugPawnMarkerInst"]
+        if record is not None and record._props["Name"].startswith("ReignOfGiants"):
+            self.giants.add(number)
+
+    def find(self, index: int, code: str, pawn: int) -> Optional[int]:
+        """Find the next event of the given kind for a pawn, before the pawn's next setup."""
+        for later in range(index + 1, len(self.recording.events)):
+            event = self.recording.events[later]
+            if event.fields and event.fields[0] == pawn:
+                if event.code == code:
+                    return later
+                if event.code == "S":
+                    return None
+        return None
+
+
+def replay(recording: Recording, clients: int = 1, seed: int = 0, settle: int = 20, reroll: bool = False) -> Dict[str, Any]:
+    header = recording.header
+    session = Session(seed=seed, map_name=header.get("map") or "Sim_P")
+    for _ in range(clients):
+        session.join_client()
+    session.tick(5)
+    session.reset_stats()
+
+    if reroll:
+        session.server.mod.CheatMode.CurrentValue = False
+    replayer = Replay(session, recording, reroll)
+    start = time.perf_counter()
+    replayer.run()
+    elapsed = time.perf_counter() - start
+    session.tick(settle)
+
+    results = benchmarks.session_results(session, f"replay of {header.get('map')}", replayer.spawned)
+    results["replay"] = {
+        "events": sum(replayer.counts.values()),
+        "seconds": elapsed,
+        "frames": sum(event.frames for event in recording.events),
+        "replayed": replayer.counts,
+        "skipped": replayer.skipped,
+        "giants": len(replayer.giants),
+        "giants_digest": hashlib.sha1(json.dumps(sorted(replayer.giants)).encode()).hexdigest()[:16],
+    }
+    return results
+
+
+def record(path: str, scenario: benchmarks.Scenario, pawns: int, seed: int = 0, giant_ratio: float = 0.05) -> None:
+    """Record the host's hook events during one of the benchmark scenarios."""
+    session = Session(seed=seed, giant_ratio=giant_ratio)
+    session.tick(5)
+    state = scenario.setup(session, pawns)
+    with activate(session.server):
+        session.server.mod._edit_recording([f"start {os.path.abspath(path)}"])
+    scenario.measure(session, pawns, state)
+    with activate(session.server):
+        session.server.mod._edit_recording(["stop"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.replay", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("recording", help="file of recordings made with the giantsrecord command")
+    parser.add_argument("--clients", type=int, default=1, help="number of co-op clients connected from the start")
+    parser.add_argument("--repeat", type=int, default=3, help="replays of each recording, keeping the fastest")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the simulation, and of the mod's rolls")
+    parser.add_argument("--reroll", action="store_true", help="have pawns roll for Gigantism anew rather than as recorded")
+    parser.add_argument("--json", metavar="PATH", help="also write the full results to a JSON file")
+    parser.add_argument("--record", metavar="SCENARIO", choices=sorted(benchmarks.SCENARIOS), help="append a recording of a scenario to the file instead")
+    parser.add_argument("--pawns", type=int, default=200, help="pawn count for --record")
+    arguments = parser.parse_args()
+
+    if arguments.record:
+        record(arguments.recording, benchmarks.SCENARIOS[arguments.record], arguments.pawns, arguments.seed)
+        return
+
+    results = []
+    for recording in read(arguments.recording):
+        runs = [replay(recording, arguments.clients, arguments.seed, reroll=arguments.reroll) for _ in range(arguments.repeat)]
+        best = min(runs, key=lambda run: run["replay"]["seconds"])
+        stats = best["replay"]
+        print(benchmarks.format_results(best))
+        print(
+            f"  replay: events={stats['events']} frames={stats['frames']} time={stats['seconds'] * 1e3:.3f}ms "
+            f"throughput={stats['events'] / stats['seconds'] if stats['seconds'] else 0:.0f} events/s "
+            f"giants={stats['giants']} digest={stats['giants_digest']}"
+            + (" skipped: " + " ".join(f"{code}={count}" for code, count in stats["skipped"].items()) if stats["skipped"] else ""),
+            flush=True,
+        )
+        results.append(best)
+
+    if arguments.json:
+        benchmarks.dump(results, arguments.json)
+
+
+if __name__ == "__main__":
+    main()
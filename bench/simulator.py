@@ -0,0 +1,569 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import random
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from . import engine
+from .engine import (
+    AIClassDefinition, BalanceDefinition, BehaviorTransform, FStruct, Game, GameReplicationInfo,
+    Level, NameListDefinition, PlayerController, PlayerReplicationInfo, PopulationFactory, UClass,
+    UObject, WillowAIPawn, WillowMind, WorldInfo, activate
+)
+
+
+"""
+A headless session of Reign Of Giants. The simulator owns a host game and any number of client
+games, each running its own copy of the mod against the engine model in `bench.engine`. Scenario
+code drives the session through spawns, deaths, transformations, co-op joins and level changes, then
+advances it frame by frame; hook and tick timings are collected by each game as it goes.
+"""
+
+
+REPOSITORY = Path(__file__).resolve().parent.parent
+MOD_PATH = REPOSITORY / "ReignOfGiants"
+STUBS_PATH = Path(__file__).resolve().parent / "stubs"
+
+
+def install_stubs() -> None:
+    """Make the `unrealsdk` and `Mods` stand-ins importable."""
+    for path in (str(STUBS_PATH), str(REPOSITORY)):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+install_stubs()
+from Mods import ModMenu  # noqa: E402
+
+
+class ClassSpec(NamedTuple):
+    """The properties of one kind of enemy that the simulator can spawn."""
+    name: str
+    display_name: str
+    champion: bool = False
+    transforms: bool = False
+    name_list_index: int = -1
+
+
+CLASS_SPECS: Sequence[ClassSpec] = (
+    ClassSpec("CharClass_Psycho", "Psycho"),
+    ClassSpec("CharClass_Marauder", "Marauder"),
+    ClassSpec("CharClass_Nomad", "Nomad"),
+    ClassSpec("CharClass_Goliath", "Goliath", transforms=True),
+    ClassSpec("CharClass_Loader_WAR", "WAR Loader"),
+    ClassSpec("CharClass_Rakk", "Rakk"),
+    ClassSpec("CharClass_Skag", "Skag"),
+    ClassSpec("CharClass_Stalker", "Stalker"),
+    ClassSpec("CharClass_Spiderant", "Spiderant"),
+    ClassSpec("CharClass_Threshers", "Thresher"),
+    ClassSpec("CharClass_BugMorph", "Larval Varkid", transforms=True),
+    ClassSpec("CharClass_BugMorph_Adult", "Adult Varkid", transforms=True),
+    ClassSpec("CharClass_Bugmorph_Badass", "Badass Varkid", champion=True, transforms=True),
+    ClassSpec("CharClass_BadassPsycho", "Badass Psycho", champion=True),
+    ClassSpec("CharClass_Juggernaut", "Juggernaut"),
+    ClassSpec("CharClass_RakkBadass", "Badass Rakk"),
+    ClassSpec("CharClass_Skeleton_King", "Skeleton King", champion=True),
+    ClassSpec("CharClass_TargetDummy", "Target Dummy"),
+    ClassSpec("CharClass_Bloodwing", "Bloodwing", champion=True),
+    ClassSpec("CharClass_Sim_BossFixup", "Boss", champion=True, name_list_index=2),
+    ClassSpec("CharClass_Sim_NamedFixup", "Named", name_list_index=5),
+)
+
+VANILLA_NAMES: Sequence[str] = (
+    "Bonehead", "Boom", "Bewm", "Flynt's \"Crew\"", "Knuckle Dragger", "Midgemong", "Madame Von Bartlesby",
+    "Mick Zaford",
+)
+"""The contents of each simulated map's vanilla NameListDefinition."""
+
+GIANT_ATTRIBUTES: Sequence[str] = (
+    "GD_Balance_HealthAndDamage.AIParameters.Attribute_HealthMultiplier",
+    "GD_Balance_HealthAndDamage.AIParameters.Attribute_EnemyShieldMaxValueMultiplier",
+    "GD_Balance_Experience.Attributes.Attribute_ExperienceMultiplier",
+)
+
+OTHER_ATTRIBUTES: Sequence[str] = tuple(
+    f"GD_Balance_HealthAndDamage.AIParameters.Attribute_Sim_{index}" for index in range(9)
+)
+
+NOISE_EVENTS: Sequence[str] = ("ReplicatedBehaviorEvent", "Health", "bIsDead", "ReplicatedAnimInfo", "LastTakeHitInfo")
+"""Replicated property names that are irrelevant to the mod, but which clients receive constantly."""
+
+
+class Catalog:
+    """The AI classes and balances of one game, created to match the session's class specs."""
+
+    def __init__(self, game: Game, specs: Sequence[ClassSpec]):
+        self.game = game
+        self.classes: Dict[str, UObject] = {}
+        self.balances: Dict[str, UObject] = {}
+        for spec in specs:
+            self.add(spec)
+
+    def add(self, spec: ClassSpec) -> None:
+        game = self.game
+        package = game.find_object("Package", "GD_Sim")
+        starting_values = [
+            FStruct(game,
+                Attribute=game.find_object("AttributeDefinition", path),
+                BaseValue=FStruct(game, BaseValueConstant=1.0, BaseValueAttribute=None, InitializationDefinition=None, BaseValueScaleConstant=1.0),
+            )
+            for path in (*OTHER_ATTRIBUTES[:5], *GIANT_ATTRIBUTES, *OTHER_ATTRIBUTES[5:])
+        ]
+        self.classes[spec.name] = game.register(AIClassDefinition(
+            game, UClass(game, None, "AIClassDefinition"), spec.name, package,
+            AttributeStartingValues=starting_values, DefaultDisplayName=spec.display_name,
+        ))
+        self.balances[spec.name] = game.register(BalanceDefinition(
+            game, UClass(game, None, "AIPawnBalanceDefinition"), f"Balance_{spec.name}", package,
+            Champion=spec.champion, _display_name=spec.display_name, _name_list_index=spec.name_list_index,
+        ))
+
+
+class Client:
+    """A client game connected to the session's host."""
+
+    def __init__(self, game: Game, server_controller: UObject):
+        self.game = game
+        self.server_controller = server_controller
+        self.pawns: Dict[int, WillowAIPawn] = {}
+        """Maps the id() of host pawns to this client's instance of them."""
+        self.replicated: Dict[int, tuple] = {}
+        """The last values of replicated properties sent for each host pawn."""
+        self.frames_until_gri = 0
+        self.frames_until_pri = 0
+
+
+class Message(NamedTuple):
+    receiver: Game
+    method: str
+    payload: str
+    PC: Optional[UObject]
+
+
+class Session:
+    """
+    A host, its clients, and a copy of the mod loaded into each of them. `giant_ratio`, if given,
+    is the fraction of spawns that will be forced to roll as Giants via the mod's cheat mode.
+    """
+
+    def __init__(self, seed: int = 0, giant_ratio: Optional[float] = None, noise: float = 0.0, map_name: str = "Sim_P", loss: float = 0.0):
+        random.seed(seed)
+        self.seed = seed
+        """The seed of the session's own randomness, and of each copy of the mod's rolls."""
+        self.rng = random.Random(seed)
+        self.giant_ratio = giant_ratio
+        self.noise = noise
+        """The chance per frame that each replicated pawn receives an irrelevant replicated event."""
+        self.loss = loss
+        """
+        The chance that each batch of Giant operations sent by the host to a client is lost, as
+        though the client had missed it.
+        """
+        self.messages_lost = 0
+
+        self.messages: List[Message] = []
+        self.timings: Dict[str, List[float]] = {}
+        self.replicated_properties: Dict[str, int] = {}
+        self.frame = 0
+        self.map_name = map_name
+        self.class_specs: List[ClassSpec] = list(CLASS_SPECS)
+
+        ModMenu.network = self
+
+        self.server = self._start_game("host", 0)
+        self.clients: List[Client] = []
+        self.load_map(map_name)
+
+    @property
+    def games(self) -> List[Game]:
+        return [self.server, *(client.game for client in self.clients)]
+
+    # Setup ----------------------------------------------------------------------------------------
+
+    def _start_game(self, name: str, net_mode: int) -> Game:
+        game = Game(name, net_mode)
+        with activate(game):
+            game.catalog = Catalog(game, self.class_specs)
+            game.world_info = self._new_world(game, "MenuMap")
+            game.world_info._props["GRI"] = self._new_gri(game)
+            game.engine._props["GamePlayers"][0]._props["Actor"]._props["PlayerReplicationInfo"] = self._new_pri(game, name)
+
+            module_name = "ReignOfGiants" if name == "host" else f"ReignOfGiants_{name}"
+            spec = importlib.util.spec_from_file_location(
+                module_name, MOD_PATH / "__init__.py", submodule_search_locations=[str(MOD_PATH)]
+            )
+            game.mod = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = game.mod
+            start = time.perf_counter()
+            spec.loader.exec_module(game.mod)
+            self._record_timing("import", time.perf_counter() - start)
+
+            game.mod_instance = game.mod._mod_instance
+            game.mod.RollSeed.CurrentValue = self.seed
+            start = time.perf_counter()
+            game.mod_instance.Enable()
+            self._record_timing("Enable", time.perf_counter() - start)
+        return game
+
+    def _record_timing(self, name: str, seconds: float) -> None:
+        self.timings.setdefault(name, []).append(seconds)
+
+    def _new_world(self, game: Game, map_name: str) -> WorldInfo:
+        level = Level(game, UClass(game, None, "Level"), "PersistentLevel", game.find_object("Package", map_name))
+        world_info = WorldInfo(
+            game, UClass(game, None, "WorldInfo"), "WorldInfo_0", level,
+            PawnList=None, NetMode=game.net_mode, GRI=None, CommittedPersistentLevel=level, _map_name=map_name,
+        )
+        # Every map has the local player's own pawn in its pawn list, which has no AI class.
+        player_pawn = WillowAIPawn(
+            game, UClass(game, None, "WillowPlayerPawn"), game.new_name("WillowPlayerPawn"), level,
+            AIClass=None, NextPawn=None, Location=FStruct(game, X=0.0, Y=0.0, Z=0.0),
+        )
+        world_info.add_pawn(player_pawn)
+        game.engine._props["GamePlayers"][0]._props["Actor"]._props["Pawn"] = player_pawn
+        return world_info
+
+    def _new_gri(self, game: Game) -> GameReplicationInfo:
+        name_list = NameListDefinition(game, UClass(game, None, "NameListDefinition"), "NameList_Sim", game.find_object("Package", "GD_Sim"), Names=list(VANILLA_NAMES))
+        return GameReplicationInfo(game, UClass(game, None, "WillowGameReplicationInfo"), "WillowGameReplicationInfo_0", NameListDef=name_list, PRIArray=[])
+
+    def _new_pri(self, game: Game, player_name: str) -> PlayerReplicationInfo:
+        return PlayerReplicationInfo(game, UClass(game, None, "WillowPlayerReplicationInfo"), game.new_name("WillowPlayerReplicationInfo"), PlayerName=player_name)
+
+    def load_map(self, map_name: str, gri_delay: int = 2, pri_delay: int = 3) -> None:
+        """Travel the host, and every client along with it, to a new map."""
+        self.map_name = map_name
+        game = self.server
+        with activate(game):
+            game.world_info = self._new_world(game, map_name)
+            GRI = game.world_info._props["GRI"] = self._new_gri(game)
+            GRI.PostBeginPlay()
+            controller = game.engine._props["GamePlayers"][0]._props["Actor"]
+            PRI = controller._props["PlayerReplicationInfo"]
+            GRI._props["PRIArray"].append(PRI)
+            PRI.ClientInitialize(controller)
+            self.factory = PopulationFactory(game, UClass(game, None, "PopulationFactoryBalancedAIPawn"), "PopulationFactoryBalancedAIPawn_0", game.world_info._props["CommittedPersistentLevel"])
+
+        for client in self.clients:
+            self._load_client_map(client, gri_delay, pri_delay)
+
+    def _load_client_map(self, client: Client, gri_delay: int, pri_delay: int) -> None:
+        game = client.game
+        with activate(game):
+            game.world_info = self._new_world(game, self.map_name)
+            game.engine._props["GamePlayers"][0]._props["Actor"]._props["PlayerReplicationInfo"] = None
+        client.pawns.clear()
+        client.replicated.clear()
+        client.frames_until_gri = gri_delay
+        client.frames_until_pri = pri_delay
+        self.server.world_info._props["GRI"]._props["PRIArray"].append(client.server_controller._props["PlayerReplicationInfo"])
+
+    def join_client(self, gri_delay: int = 2, pri_delay: int = 3) -> Client:
+        """Connect a new client to the host. It will arrive in the host's current map."""
+        self.server.net_mode = 2
+        self.server.world_info._props["NetMode"] = 2
+
+        name = f"client{len(self.clients) + 1}"
+        game = self._start_game(name, 3)
+        server_controller = PlayerController(
+            self.server, UClass(self.server, None, "WillowPlayerController"), self.server.new_name("WillowPlayerController"),
+            PlayerReplicationInfo=self._new_pri(self.server, name),
+        )
+        client = Client(game, server_controller)
+        self.clients.append(client)
+        self._load_client_map(client, gri_delay, pri_delay)
+        return client
+
+    def add_class(self, spec: ClassSpec) -> None:
+        """Add a kind of enemy to every game's catalog, beyond those in `CLASS_SPECS`."""
+        self.class_specs.append(spec)
+        for game in self.games:
+            with activate(game):
+                game.catalog.add(spec)
+
+    # Host actions ---------------------------------------------------------------------------------
+
+    def spawn(self, count: int, classes: Optional[Sequence[str]] = None, parent: Optional[WillowAIPawn] = None) -> List[WillowAIPawn]:
+        """Spawn pawns on the host, as a population factory would."""
+        game = self.server
+        mod = game.mod
+        names = classes or [spec.name for spec in CLASS_SPECS]
+        specs = {spec.name: spec for spec in self.class_specs}
+        cheat_mode = mod.CheatMode.CurrentValue
+        spawned = []
+
+        with activate(game):
+            world_info = game.world_info
+            level = world_info._props["CommittedPersistentLevel"]
+            for _ in range(count):
+                spec = specs[self.rng.choice(names)]
+                ai_class = game.catalog.classes[spec.name]
+                if self.giant_ratio is not None:
+                    mod.CheatMode.CurrentValue = self.rng.random() < self.giant_ratio
+
+                pawn = self._new_pawn(game, spec, ai_class, level)
+                world_info.add_pawn(pawn)
+                pawn.PostBeginPlay()
+
+                spawn_point = UObject(game, UClass(game, None, "PopulationPoint"), game.new_name("PopulationPoint"), level, Owner=parent)
+                self.factory.SetupBalancedPopulationActor(pawn, spawn_point, game.catalog.balances[spec.name])
+                spawned.append(pawn)
+
+        mod.CheatMode.CurrentValue = cheat_mode
+        return spawned
+
+    @staticmethod
+    def _new_pawn(game: Game, spec: ClassSpec, ai_class: UObject, outer: UObject) -> WillowAIPawn:
+        mind = WillowMind(
+            game, UClass(game, None, "WillowMind"), game.new_name("WillowMind"), outer,
+            AIClass=ai_class, CharacterClass=ai_class, bCharacterClassInitialized=True,
+        )
+        return WillowAIPawn(
+            game, UClass(game, None, "WillowAIPawn"), game.new_name("WillowAIPawn"), outer,
+            AIClass=ai_class, MyWillowMind=mind, NextPawn=None,
+            BalanceDefinitionState=FStruct(game, BalanceDefinition=None, GradeIndex=-1),
+            DebugPawnMarkerInst=None, NameListIndex=-1, TransformType=0,
+            Mesh=UObject(game, UClass(game, None, "SkeletalMeshComponent"), "SkeletalMeshComponent_0", None, Scale3D=FStruct(game, X=1.0, Y=1.0, Z=1.0)),
+            MovementSpeedModifier=1.0, PlayerMasterPRI=None, MasteredDisplayName="%s's %n",
+            Location=FStruct(game, X=float(game._next_pawn), Y=0.0, Z=0.0),
+            _spec=spec, _transformed_name=f"Mutated {spec.display_name}", _dead=False,
+        )
+
+    def pawns(self, game: Optional[Game] = None) -> List[WillowAIPawn]:
+        """All AI pawns currently in the given game's pawn list (the host's by default)."""
+        game = game or self.server
+        pawns = []
+        pawn = game.world_info._props["PawnList"]
+        while pawn is not None:
+            if pawn._props["AIClass"] is not None:
+                pawns.append(pawn)
+            pawn = pawn._props["NextPawn"]
+        return pawns
+
+    def disable(self) -> None:
+        """Disable the mod on the host and every client, as from the mod menu."""
+        for game in self.games:
+            with activate(game):
+                start = time.perf_counter()
+                game.mod_instance.Disable()
+                self._record_timing("Disable", time.perf_counter() - start)
+
+    def kill(self, pawns: Sequence[WillowAIPawn]) -> None:
+        """Kill pawns on the host, removing them from the map."""
+        game = self.server
+        with activate(game):
+            for pawn in pawns:
+                pawn.Died()
+                game.world_info.remove_pawn(pawn)
+                pawn.Destroyed()
+
+    def transform(self, pawns: Sequence[WillowAIPawn], transform_type: int = 1) -> None:
+        """Invoke a Behavior_Transform on each of the pawns, followed by their leveling up."""
+        game = self.server
+        with activate(game):
+            behavior = BehaviorTransform(game, UClass(game, None, "Behavior_Transform"), "Behavior_Transform_0", None, Transform=transform_type)
+            for pawn in pawns:
+                behavior.ApplyBehaviorToContext(pawn)
+                pawn.AILevelUp()
+
+    def morph(self, parents: Sequence[WillowAIPawn]) -> List[WillowAIPawn]:
+        """Have each of the pawns spawn a child of its own class, then die, like Varkids do."""
+        children = []
+        for parent in parents:
+            children += self.spawn(1, [parent._props["_spec"].name], parent)
+        self.kill(parents)
+        return children
+
+    # Frames ---------------------------------------------------------------------------------------
+
+    def tick(self, frames: int = 1, delta: float = 1 / 60) -> None:
+        """Advance the session, ticking each game, delivering messages and replicating pawns."""
+        for _ in range(frames):
+            self.frame += 1
+            self._tick_game(self.server, delta)
+            self._replicate()
+            self._deliver()
+            for client in self.clients:
+                self._arrive(client)
+                self._tick_game(client.game, delta)
+            self._deliver()
+            for game in self.games:
+                game.end_frame()
+
+    @staticmethod
+    def _tick_game(game: Game, delta: float) -> None:
+        with activate(game):
+            game.engine._props["GameViewport"].Tick(delta)
+
+    def _arrive(self, client: Client) -> None:
+        """Count down to the client's GRI and PRI being replicated to it."""
+        game = client.game
+        with activate(game):
+            if client.frames_until_gri > 0:
+                client.frames_until_gri -= 1
+                if client.frames_until_gri == 0:
+                    GRI = game.world_info._props["GRI"] = self._new_gri(game)
+                    GRI.PostBeginPlay()
+            if client.frames_until_pri > 0:
+                client.frames_until_pri -= 1
+                if client.frames_until_pri == 0:
+                    controller = game.engine._props["GamePlayers"][0]._props["Actor"]
+                    PRI = controller._props["PlayerReplicationInfo"] = self._new_pri(game, game.name)
+                    PRI.ClientInitialize(controller)
+
+    def _replicate(self) -> None:
+        """Bring each client's instances of the host's pawns up to date."""
+        host_pawns = self.pawns()
+        for client in self.clients:
+            game = client.game
+            with activate(game):
+                world_info = game.world_info
+                live = set()
+                for host_pawn in host_pawns:
+                    key = id(host_pawn)
+                    live.add(key)
+                    props = host_pawn._props
+                    state = props["BalanceDefinitionState"]._props
+                    balance = state["BalanceDefinition"]
+                    values = (state["GradeIndex"], None if balance is None else balance.Name, props["NameListIndex"], props["TransformType"])
+
+                    pawn = client.pawns.get(key)
+                    if pawn is None:
+                        spec = props["_spec"]
+                        pawn = client.pawns[key] = self._new_pawn(game, spec, game.catalog.classes[spec.name], world_info._props["CommittedPersistentLevel"])
+                        world_info.add_pawn(pawn)
+                        pawn.PostBeginPlay()
+                        previous = (None, None, -1, 0)
+                    else:
+                        previous = client.replicated[key]
+                    client.replicated[key] = values
+                    if values == previous:
+                        if self.noise and self.rng.random() < self.noise:
+                            pawn.ReplicatedEvent(self.rng.choice(NOISE_EVENTS))
+                        continue
+
+                    client_props = pawn._props
+                    if values[2] != previous[2]:
+                        client_props["NameListIndex"] = values[2]
+                        self._count_replication("NameListIndex")
+                    if values[3] != previous[3]:
+                        client_props["TransformType"] = values[3]
+                        self._count_replication("TransformType")
+                        pawn.ReplicatedEvent("TransformType")
+                    if values[:2] != previous[:2]:
+                        client_state = client_props["BalanceDefinitionState"]._props
+                        client_state["GradeIndex"] = values[0]
+                        client_state["BalanceDefinition"] = None if balance is None else game.catalog.balances[props["_spec"].name]
+                        self._count_replication("BalanceDefinitionState")
+                        pawn.ReplicatedEvent("BalanceDefinitionState")
+
+                for key in [key for key in client.pawns if key not in live]:
+                    pawn = client.pawns.pop(key)
+                    del client.replicated[key]
+                    world_info.remove_pawn(pawn)
+                    pawn.Destroyed()
+
+    def _count_replication(self, name: str) -> None:
+        self.replicated_properties[name] = self.replicated_properties.get(name, 0) + 1
+
+    # Networking -----------------------------------------------------------------------------------
+
+    def send(self, mod: Any, method: str, arguments: List[Any], PC: Optional[UObject], to_server: bool) -> None:
+        """Queue a networked method call from the active game, as ModMenu would."""
+        sender = engine.active
+        if to_server:
+            if sender is self.server:
+                return
+            client = next(client for client in self.clients if client.game is sender)
+            targets = [(self.server, client.server_controller)]
+        else:
+            if sender is not self.server:
+                return
+            targets = [(client.game, None) for client in self.clients if PC is None or client.server_controller is PC]
+
+        payload = json.dumps(arguments)
+        for receiver, controller in targets:
+            if method == "ClientUpdateGiantsDelta" and self.loss and self.rng.random() < self.loss:
+                self.messages_lost += 1
+                continue
+            sender.counters.messages_sent += 1
+            sender.counters.bytes_sent += len(payload)
+            self.messages.append(Message(receiver, method, payload, controller))
+
+    def _deliver(self) -> None:
+        while self.messages:
+            messages, self.messages = self.messages, []
+            for message in messages:
+                game = message.receiver
+                instance = game.mod_instance
+                receive = getattr(type(instance), message.method).receive
+                arguments = json.loads(message.payload)
+                if message.PC is not None:
+                    arguments.append(message.PC)
+                with activate(game):
+                    try:
+                        game.timed(f"ModMenu.{message.method}", receive, instance, *arguments)
+                    except Exception:
+                        game.errors.append(traceback.format_exc())
+
+    # Results --------------------------------------------------------------------------------------
+
+    def reset_stats(self) -> None:
+        """Discard all timings and counters collected so far, e.g. after a scenario's setup."""
+        for game in self.games:
+            game.hook_stats.clear()
+            game.tick_samples.clear()
+            game.errors.clear()
+            game.counters = engine.Counters()
+            game.mod._commands.commands = game.mod._commands.bytes = game.mod._commands.coalesced = 0
+            game.mod._snapshot_stats.update(dict.fromkeys(game.mod._snapshot_stats, 0))
+            game.mod._marker_stats.update(dict.fromkeys(game.mod._marker_stats, 0))
+        self.replicated_properties.clear()
+        self.messages_lost = 0
+        self.server.mod._replication_bytes.update(dict.fromkeys(self.server.mod._replication_bytes, 0))
+        self.server.mod._giant_ai_class_stats.update(dict.fromkeys(self.server.mod._giant_ai_class_stats, 0))
+
+    def verify(self) -> Dict[str, int]:
+        """
+        Check that every Giant on the host displays a Giant name, that each client's instances of
+        those Giants are both named and scaled as Giants, and that no other pawn anywhere is scaled.
+        """
+        prefix = self.server.mod.GiantPrefix.CurrentValue
+        results = {"giants": 0, "host_misnamed": 0, "client_misnamed": 0, "client_unscaled": 0, "stray_scaled": 0}
+
+        giants = []
+        for pawn in self.pawns():
+            record = pawn._props["DebugPawnMarkerInst"]
+            if record is not None and record._props["Name"].startswith("ReignOfGiants"):
+                giants.append(pawn)
+
+        results["giants"] = len(giants)
+        giant_keys = {id(giant) for giant in giants}
+        for pawn in self.pawns():
+            if id(pawn) not in giant_keys and pawn._props["Mesh"]._props["Scale3D"]._props["X"] != 1.0:
+                results["stray_scaled"] += 1
+        for client in self.clients:
+            for key, pawn in client.pawns.items():
+                if key not in giant_keys and pawn._props["Mesh"]._props["Scale3D"]._props["X"] != 1.0:
+                    results["stray_scaled"] += 1
+        with activate(self.server):
+            for giant in giants:
+                if not (giant.GetTargetName() or "").startswith(prefix):
+                    results["host_misnamed"] += 1
+
+        for client in self.clients:
+            with activate(client.game):
+                for giant in giants:
+                    pawn = client.pawns.get(id(giant))
+                    if pawn is None:
+                        continue
+                    if not (pawn.GetTargetName() or "").startswith(prefix):
+                        results["client_misnamed"] += 1
+                    if pawn._props["Mesh"]._props["Scale3D"]._props["X"] == 1.0:
+                        results["client_unscaled"] += 1
+        return results
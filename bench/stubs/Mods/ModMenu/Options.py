@@ -0,0 +1,14 @@
+from typing import Any
+
+
+class Base:
+    def __init__(self, Caption: str, Description: str = "", StartingValue: Any = None, IsHidden: bool = True):
+        self.Caption = Caption
+        self.Description = Description
+        self.StartingValue = StartingValue
+        self.CurrentValue = StartingValue
+        self.IsHidden = IsHidden
+
+
+class Hidden(Base):
+    pass
@@ -0,0 +1,85 @@
+"""
+Stand-in for ModMenu. Mods are registered into a plain list, settings are never written to disk,
+and networked methods are handed to whatever `network` the simulator has installed.
+"""
+
+from __future__ import annotations
+
+import enum
+import functools
+import inspect
+from typing import Any, Callable, List, Optional
+
+from . import Options
+
+
+__all__ = [
+    "ClientMethod", "EnabledSaveType", "Game", "Options", "RegisterMod", "SaveModSettings",
+    "SDKMod", "ServerMethod",
+]
+
+
+network: Optional[Any] = None
+"""
+The object that delivers networked method calls, provided by the simulator. It must implement
+`send(mod, method_name, arguments, PC, to_server)`.
+"""
+
+registered_mods: List[Any] = []
+
+
+class Game(enum.Flag):
+    BL2 = 1
+    TPS = 2
+    AoDK = 4
+
+
+class EnabledSaveType(enum.Enum):
+    NotSaved = enum.auto()
+    LoadWithSettings = enum.auto()
+    LoadOnMainMenu = enum.auto()
+
+
+class SDKMod:
+    Name: str = "Unknown"
+    Options: List[Options.Base] = []
+    IsEnabled: bool = False
+
+    def Enable(self) -> None:
+        self.IsEnabled = True
+
+    def Disable(self) -> None:
+        self.IsEnabled = False
+
+
+def RegisterMod(mod: SDKMod) -> None:
+    registered_mods.append(mod)
+
+
+def SaveModSettings(mod: SDKMod) -> None:
+    pass
+
+
+def _networked(function: Callable, to_server: bool) -> Callable:
+    signature = inspect.signature(function)
+
+    @functools.wraps(function)
+    def send(self: SDKMod, *args: Any, **kwargs: Any) -> None:
+        bound = signature.bind(self, *args, **kwargs)
+        PC = bound.arguments.pop("PC", None)
+        bound.arguments.pop("self")
+        if network is not None:
+            network.send(self, function.__name__, list(bound.arguments.values()), PC, to_server)
+
+    send.receive = function
+    return send
+
+
+def ServerMethod(function: Callable) -> Callable:
+    """Calls made on a client are sent to the host; calls made on the host are dropped."""
+    return _networked(function, True)
+
+
+def ClientMethod(function: Callable) -> Callable:
+    """Calls made on the host are sent to the given client, or all clients if none is given."""
+    return _networked(function, False)
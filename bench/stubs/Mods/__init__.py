@@ -0,0 +1,4 @@
+"""
+Stand-in for the PythonSDK's `Mods` package. Only ModMenu is provided; CommandExtensions is absent,
+so the mod falls back to hooking console commands itself.
+"""
@@ -0,0 +1,61 @@
+"""
+Stand-in for the PythonSDK's `unrealsdk` module. Every function forwards to the currently active
+`bench.engine.Game`, so that a host and its clients can each run their own copy of the mod.
+"""
+
+import enum
+from typing import Any, Callable, List, Optional
+
+from bench import engine
+from bench.engine import FStruct, UClass, UFunction, UObject
+
+
+__all__ = [
+    "ConstructObject", "DoInjectedCallNext", "FindObject", "FStruct", "GetEngine", "KeepAlive",
+    "Log", "Mods", "ModTypes", "RemoveHook", "RunHook", "UClass", "UFunction", "UObject", "UPackage",
+]
+
+
+UPackage = UObject
+
+Mods: List[Any] = []
+
+
+class ModTypes(enum.Flag):
+    NONE = 0
+    Utility = 1
+    Content = 2
+    Gameplay = 4
+    Library = 8
+
+
+def GetEngine() -> engine.Engine:
+    return engine.active.engine
+
+
+def FindObject(uclass: str, path: str) -> Optional[UObject]:
+    return engine.active.find_object(uclass, path)
+
+
+def ConstructObject(Class: Any, Outer: Optional[UObject] = None, Name: str = "None", SetFlags: int = 1, InternalSetFlags: int = 0, Template: Optional[UObject] = None, Error: Any = None, InstanceGraph: Any = None, bAssumeTemplateIsArchetype: bool = False) -> UObject:
+    return engine.active.construct_object(Class, Outer, Name, Template)
+
+
+def KeepAlive(obj: UObject) -> None:
+    obj.ObjectFlags.A |= 0x4000
+
+
+def RunHook(function: str, key: str, callback: Callable) -> None:
+    engine.active.run_hook(function, key, callback)
+
+
+def RemoveHook(function: str, key: str) -> None:
+    engine.active.remove_hook(function, key)
+
+
+def DoInjectedCallNext() -> None:
+    engine.active.inject_next = True
+
+
+def Log(*args: Any) -> None:
+    engine.active.log.append(" ".join(str(arg) for arg in args))